@@ -3,12 +3,15 @@
 
 from obs.ilog import LogConf
 from obs.client import ObsClient
+from obs.retry import RetryPolicy, RetryBudget
 from obs.model import *
 
 
 __all__ = [
     'LogConf',
     'ObsClient',
+    'RetryPolicy',
+    'RetryBudget',
     'CompletePart',
     'Permission',
     'StorageClass', 
@@ -7,6 +7,16 @@ import binascii
 from obs import util
 from obs import const
 
+_IGNORED_HEADER = 0
+_CONTENT_HEADER = 1
+_PREFIX_HEADER = 2
+_META_HEADER = 3
+
+_DATE = const.DATE_HEADER.lower()
+_CONTENT_TYPE = const.CONTENT_TYPE_HEADER.lower()
+_CONTENT_MD5 = const.CONTENT_MD5_HEADER.lower()
+_ALLOWED_RESOURCE_PARAMTER_NAMES = frozenset(const.ALLOWED_RESOURCE_PARAMTER_NAMES)
+
 class Authentication(object):
 
     def __init__(self, ak, sk, path_style, ha):
@@ -14,7 +24,11 @@ class Authentication(object):
         self.sk = sk
         self.path_style = path_style
         self.ha = ha
-
+        self._hmac = None
+        self._headerPrefix = ha._get_header_prefix()
+        self._metaHeaderPrefix = ha._get_meta_header_prefix()
+        self._dateHeader = ha.date_header()
+        self._headerKinds = {}
 
     def doAuth(self, method, bucket, key, path_args, headers, expires=None):
         ret = self.getSignature(method, bucket, key, path_args, headers, expires)
@@ -31,49 +45,62 @@ class Authentication(object):
         }
 
     def hmacSha128(self, canonical_string):
+        if self._hmac is None:
+            self._hmac = hmac.new(self.sk if const.IS_PYTHON2 else self.sk.encode('UTF-8'), digestmod=hashlib.sha1)
+        hashed = self._hmac.copy()
         if const.IS_PYTHON2:
-            hashed = hmac.new(self.sk, canonical_string, hashlib.sha1)
+            hashed.update(canonical_string)
             encode_canonical = binascii.b2a_base64(hashed.digest())[:-1]
         else:
-            hashed = hmac.new(self.sk.encode('UTF-8'), canonical_string.encode('UTF-8'), hashlib.sha1)
+            hashed.update(canonical_string.encode('UTF-8'))
             encode_canonical = binascii.b2a_base64(hashed.digest())[:-1].decode('UTF-8')
 
         return encode_canonical
 
+    def __get_header_kind(self, hash_key):
+        kind = self._headerKinds.get(hash_key)
+        if kind is None:
+            lk = hash_key.lower()
+            if lk.startswith(self._metaHeaderPrefix):
+                kind = (lk, _META_HEADER)
+            elif lk.startswith(self._headerPrefix):
+                kind = (lk, _PREFIX_HEADER)
+            elif lk in const.CONTENT_LIST:
+                kind = (lk, _CONTENT_HEADER)
+            else:
+                kind = (lk, _IGNORED_HEADER)
+            if len(self._headerKinds) >= 1024:
+                self._headerKinds.clear()
+            self._headerKinds[hash_key] = kind
+        return kind
+
     def __make_canonicalstring(self, method, bucket_name, key, path_args, headers, expires=None):
-        str_list = []
-        str_list.append(method + '\n')
+        str_list = [method, '\n']
         interesting_headers = {}
         if isinstance(headers, dict):
-            for hash_key in headers.keys():
-                lk = hash_key.lower()
-                if lk in const.CONTENT_LIST or lk.startswith(self.ha._get_header_prefix()):
-                    s = headers.get(hash_key)
-                    interesting_headers[lk] = ''.join(s)
-
-        keylist = interesting_headers.keys()
+            for hash_key, s in headers.items():
+                lk, kind = self.__get_header_kind(hash_key)
+                if kind != _IGNORED_HEADER:
+                    interesting_headers[lk] = (''.join(s), kind)
 
-        if self.ha.date_header() in keylist:
-            interesting_headers[const.DATE_HEADER.lower()] = ''
+        if self._dateHeader in interesting_headers:
+            interesting_headers[_DATE] = ('', _CONTENT_HEADER)
 
         if expires:
-            interesting_headers[const.DATE_HEADER.lower()] = expires
+            interesting_headers[_DATE] = (expires, _CONTENT_HEADER)
 
-        if const.CONTENT_TYPE_HEADER.lower() not in keylist:
-            interesting_headers[const.CONTENT_TYPE_HEADER.lower()] = ''
+        if _CONTENT_TYPE not in interesting_headers:
+            interesting_headers[_CONTENT_TYPE] = ('', _CONTENT_HEADER)
 
-        if const.CONTENT_MD5_HEADER.lower() not in keylist:
-            interesting_headers[const.CONTENT_MD5_HEADER.lower()] = ''
+        if _CONTENT_MD5 not in interesting_headers:
+            interesting_headers[_CONTENT_MD5] = ('', _CONTENT_HEADER)
 
-        keylist = sorted(interesting_headers.keys())
-
-
-        for k in keylist:
-            header_key = util.to_string(k)
-            val = '' if interesting_headers[header_key] is None else interesting_headers[header_key]
-            if header_key.startswith(self.ha._get_meta_header_prefix()):
+        for header_key in sorted(interesting_headers.keys()):
+            val, kind = interesting_headers[header_key]
+            val = '' if val is None else val
+            if kind == _META_HEADER:
                 str_list.append(header_key + ':' + util.to_string(val).strip())
-            elif header_key.startswith(self.ha._get_header_prefix()):
+            elif kind == _PREFIX_HEADER:
                 str_list.append(header_key + ':' + val)
             else:
                 str_list.append(val)
@@ -81,8 +108,7 @@ class Authentication(object):
 
         URI = ''
         if bucket_name is not None and bucket_name != '':
-            URI += '/'
-            URI += bucket_name
+            URI = '/' + bucket_name
             if not self.path_style:
                 URI += '/'
 
@@ -91,30 +117,26 @@ class Authentication(object):
                 URI += '/'
             URI += util.encode_object_key(key)
 
-        if URI:
-            str_list.append(URI)
-        else:
-            str_list.append('/')
+        str_list.append(URI if URI else '/')
 
         if path_args:
-            e1 = '?'
-            e2 = '&'
-            cannoList = sorted(path_args.items(), key=lambda d: d[0])
-            for path_key, path_value in cannoList:
-                if path_key.lower() in const.ALLOWED_RESOURCE_PARAMTER_NAMES or path_key.lower().startswith(self.ha._get_header_prefix()):
+            noneValues = []
+            values = []
+            for path_key, path_value in sorted(path_args.items(), key=lambda d: d[0]):
+                lk = path_key.lower()
+                if lk in _ALLOWED_RESOURCE_PARAMTER_NAMES or lk.startswith(self._headerPrefix):
                     path_key = util.encode_item(path_key, '/')
                     if path_value is None:
-                        e1 += path_key + '&'
-                        continue
-                    e2 += path_key + '=' + util.to_string(path_value) + '&'
-
-            e = (e1 + e2).replace('&&', '&').replace('?&', '?')[:-1]
-            str_list.append(e)
+                        noneValues.append(path_key)
+                    else:
+                        values.append(path_key + '=' + util.to_string(path_value))
+            if noneValues or values:
+                str_list.append('?' + '&'.join(noneValues + values))
         return ''.join(str_list)
 
 class V4Authentication(object):
     CONTENT_SHA256 = 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
-    def __init__(self, ak, sk, region, shortDate, longDate, path_style, ha):
+    def __init__(self, ak, sk, region, shortDate, longDate, path_style, ha, signingKeyCache=None):
         self.ak = ak
         self.sk = sk
         self.region = region
@@ -122,6 +144,7 @@ class V4Authentication(object):
         self.longDate = longDate
         self.path_style = path_style
         self.ha = ha
+        self.signingKeyCache = signingKeyCache
 
     def doAuth(self, method, bucket, key, args_path, headers):
         args_path = args_path if isinstance(args_path, dict) else {}
@@ -145,15 +168,7 @@ class V4Authentication(object):
         return '%s/%s/s3/aws4_request' % (self.shortDate, self.region)
 
     def getSignedHeaders(self, headMap):
-        headList = sorted(headMap.items(), key=lambda d: d[0])
-        signedHeaders = ''
-        i = 0
-        for val in headList:
-            if i != 0:
-                signedHeaders += ';'
-            signedHeaders += val[0]
-            i = 1
-        return signedHeaders
+        return ';'.join(sorted(headMap.keys()))
 
     def getSignature(self, method, bucket, key, args_path, headMap, signedHeaders, payload=None):
         outPut = 'AWS4-HMAC-SHA256' + '\n'
@@ -163,11 +178,10 @@ class V4Authentication(object):
 
         if const.IS_PYTHON2:
             stringToSign = outPut + self.__shaCannonicalRequest_python2(cannonicalRequest)
-            signingKey = self.getSigningKey_python2()
         else:
             stringToSign = outPut + self.__shaCannonicalRequest_python3(cannonicalRequest)
             stringToSign = stringToSign.encode('UTF-8')
-            signingKey = self.getSigningKey_python3()
+        signingKey = self.getSigningKey()
         return {
             'Signature' : self.hmacSha256(signingKey, stringToSign),
             const.CANONICAL_REQUEST : cannonicalRequest
@@ -176,6 +190,22 @@ class V4Authentication(object):
     def hmacSha256(self, signingKey, stringToSign):
         return hmac.new(signingKey, stringToSign, hashlib.sha256).hexdigest()
 
+    def getSigningKey(self):
+        cache = self.signingKeyCache
+        if cache is None:
+            return self.deriveSigningKey()
+        cacheKey = (self.shortDate, self.region)
+        signingKey = cache.get(cacheKey)
+        if signingKey is None:
+            signingKey = self.deriveSigningKey()
+            if len(cache) >= 8:
+                cache.clear()
+            cache[cacheKey] = signingKey
+        return signingKey
+
+    def deriveSigningKey(self):
+        return self.getSigningKey_python2() if const.IS_PYTHON2 else self.getSigningKey_python3()
+
     def getSigningKey_python2(self):
         key = 'AWS4' + self.sk
         dateKey = hmac.new(key, self.shortDate, hashlib.sha256).digest()
@@ -219,33 +249,36 @@ class V4Authentication(object):
         return util.encode_object_key(URI)
 
     def getCanonicalQueryString(self, args_path):
-        canonMap = {}
-        for key, value in args_path.items():
-            canonMap[key] = value
-        cannoList = sorted(canonMap.items(), key=lambda d: d[0])
-        queryStr = ''
-        i = 0
-        for val in cannoList:
-            if i != 0:
-                queryStr += '&'
-            queryStr += '%s=%s'%(util.encode_item(val[0], '/'), util.encode_item(val[1], '')) #v4签名value必须转义'/'
-            i = 1
-        return queryStr
+        cannoList = sorted(args_path.items(), key=lambda d: d[0])
+        return '&'.join(['%s=%s' % (util.encode_item(k, '/'), util.encode_item(v, '')) for k, v in cannoList]) #v4签名value必须转义'/'
 
     def getCanonicalHeaders(self, headMap):
         headList = sorted(headMap.items(), key=lambda d: d[0])
-        canonicalHeaderStr = ''
-        for val in headList:
-            if isinstance(val[1], list):
-                tlist = sorted(val[1])
-                for v in tlist:
-                    canonicalHeaderStr += val[0] + ':' + v + '\n'
+        canonicalHeaders = []
+        for k, v in headList:
+            if isinstance(v, list):
+                for item in sorted(v):
+                    canonicalHeaders.append(k + ':' + item + '\n')
             else:
-                canonicalHeaderStr += val[0] + ':' + str(val[1]) + '\n'
-        return canonicalHeaderStr
+                canonicalHeaders.append(k + ':' + str(v) + '\n')
+        return ''.join(canonicalHeaders)
 
     def setMapKeyLower(self, inputMap):
-        outputMap = {}
-        for key in inputMap.keys():
-            outputMap[key.lower()] = inputMap[key]
-        return outputMap
+        return dict((key.lower(), value) for key, value in inputMap.items())
+
+
+class Signer(object):
+    '''
+    Long-lived signer of one client. The V2 authentication (with its prepared hmac) is reused
+    across requests and V4 signing keys are derived once per (date, region).
+    '''
+    def __init__(self, ak, sk, path_style, ha):
+        self.ak = ak
+        self.sk = sk
+        self.path_style = path_style
+        self.ha = ha
+        self.v2Auth = Authentication(ak, sk, path_style, ha)
+        self.signingKeyCache = {}
+
+    def getV4Authentication(self, region, shortDate, longDate):
+        return V4Authentication(self.ak, self.sk, region, shortDate, longDate, self.path_style, self.ha, self.signingKeyCache)
@@ -41,6 +41,7 @@ class BucketClient(object):
         'getBucketNotification',
         'getObjectMetadata',
         'getObject',
+        'getObjectIntoBuffer',
         'putContent',
         'putObject',
         'appendObject',
@@ -10,11 +10,13 @@ import sys
 import re
 import traceback
 import math
+import select
 
 from obs import const
 from obs import convertor, util, auth
 from obs.ilog import NoneLogClient, INFO, WARNING, ERROR, DEBUG, LogClient
 from obs.transfer import _resumer_upload, _resumer_download
+from obs.retry import RetryPolicy
 from obs.model import Logging
 from obs.model import AppendObjectHeader
 from obs.model import AppendObjectContent
@@ -23,6 +25,7 @@ from obs.model import ListMultipartUploadsRequest
 from obs.model import PutObjectHeader
 from obs.model import BaseModel
 from obs.model import GetResult
+from obs.model import FastGetResult
 from obs.model import ObjectStream
 from obs.model import ResponseWrapper
 from obs.model import CreateBucketHeader
@@ -41,9 +44,10 @@ else:
     from urllib.parse import urlparse
 
 class _RedirectException(Exception):
-    def __init__(self, msg, location):
+    def __init__(self, msg, location, status=None):
         self.msg = msg
         self.location = location
+        self.status = status
     
     def __str__(self):
         return self.msg
@@ -87,9 +91,11 @@ def count_time(func):
 class _BasicClient(object):
     def __init__(self, access_key_id, secret_access_key, is_secure=True, server=None, 
                  signature='v2', region='region', path_style=False, ssl_verify=False,
-                 port=None, max_retry_count=3, timeout=60, chunk_size=65536, 
+                 port=None, max_retry_count=3, timeout=60, chunk_size=None, 
                  long_conn_mode=False, proxy_host=None, proxy_port=None, 
-                 proxy_username=None, proxy_password=None, security_token=None, custom_ciphers=None):
+                 proxy_username=None, proxy_password=None, security_token=None, custom_ciphers=None,
+                 retry_policy=None, socket_buffer_size=None, bandwidth=None, rtt=None,
+                 expect_continue_threshold=None, expect_continue_timeout=1):
         self.securityProvider = _SecurityProvider(access_key_id, secret_access_key, security_token)
         
         server = server if server is not None else ''
@@ -124,8 +130,17 @@ class _BasicClient(object):
         self.calling_format = util.RequestFormat.get_pathformat() if self.path_style else util.RequestFormat.get_subdomainformat()
         self.port = port if port is not None else const.DEFAULT_SECURE_PORT if is_secure else const.DEFAULT_INSECURE_PORT
         self.max_retry_count = max_retry_count
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy(max_retry_count=max_retry_count)
         self.timeout = timeout
-        self.chunk_size = chunk_size
+        self.bandwidth = bandwidth
+        self.rtt = rtt
+        self._measure_rtt = rtt is None
+        self._rtt_lock = threading.Lock()
+        self.socket_buffer_size = socket_buffer_size
+        self.expect_continue_threshold = expect_continue_threshold
+        self.expect_continue_timeout = expect_continue_timeout
+        self._auto_chunk_size = chunk_size is None
+        self.chunk_size = chunk_size if chunk_size is not None else util.get_chunk_size_by_bdp(util.get_bdp(bandwidth, rtt))
         self.log_client = NoneLogClient()
         self.context = None
         if self.is_secure:
@@ -140,6 +155,8 @@ class _BasicClient(object):
         self.proxy_username = proxy_username
         self.proxy_password = proxy_password
         self.pattern = re.compile('xmlns="http.*?"')
+        self._redirect_cache = {}
+        self._signer = None
         self.ha = convertor.Adapter(self.signature)
         self.convertor = convertor.Convertor(self.signature, self.ha)
     
@@ -195,6 +212,14 @@ class _BasicClient(object):
 
     def refresh(self, access_key_id, secret_access_key, security_token=None):
         self.securityProvider = _SecurityProvider(access_key_id, secret_access_key, security_token)
+
+    def _get_signer(self):
+        securityProvider = self.securityProvider
+        signer = self._signer
+        if signer is None or signer.ak != securityProvider.access_key_id or signer.sk != securityProvider.secret_access_key:
+            signer = auth.Signer(securityProvider.access_key_id, securityProvider.secret_access_key, self.path_style, self.ha)
+            self._signer = signer
+        return signer
     
     def initLog(self, log_config=None, log_name='OBS_LOGGER'):
         if log_config:
@@ -233,14 +258,50 @@ class _BasicClient(object):
 
     def _make_request(self, methodType, bucketName, objectKey=None, pathArgs=None, headers=None, 
                        entity=None, chunkedMode=False, methodName=None, readable=False, parseMethod=None):
+        attempt = 0
+        # a stream entity is consumed by the first send and a readable response belongs to the caller
+        resendable = not readable and getattr(entity, 'resendable', True)
+        while True:
+            try:
+                result = self._make_request_once(methodType, bucketName, objectKey, pathArgs, headers, entity, chunkedMode, methodName, readable, parseMethod)
+            except Exception as e:
+                if not resendable or not self.retry_policy.is_retryable_error(e) or not self.retry_policy.should_retry(attempt):
+                    raise
+                self.log_client.log(WARNING, 'request failed, %s, retry request, retry time:%d', e, attempt + 1)
+                self.retry_policy.sleep(attempt)
+                attempt += 1
+                continue
+            if not self.retry_policy.is_retryable_result(result):
+                self.retry_policy.record_success()
+                return result
+            if readable or not self.retry_policy.should_retry(attempt):
+                return result
+            self.log_client.log(WARNING, 'http code is %s, error code is %s, retry request, retry time:%d', result.status, result.errorCode, attempt + 1)
+            self.retry_policy.sleep(attempt)
+            attempt += 1
+
+    def _make_request_once(self, methodType, bucketName, objectKey=None, pathArgs=None, headers=None, 
+                           entity=None, chunkedMode=False, methodName=None, readable=False, parseMethod=None):
+        redirectLocation = self._redirect_cache.get(bucketName) if bucketName else None
         try:
-            conn = self._make_request_internal(methodType, bucketName, objectKey, pathArgs, headers, entity, chunkedMode)
+            conn = self._make_request_internal(methodType, bucketName, objectKey, pathArgs, headers, entity, chunkedMode, redirectLocation)
+            if redirectLocation:
+                conn._redirect = True
             result = self._parse_xml(conn, methodName, readable) if not parseMethod else parseMethod(conn)
         except _RedirectException as e:
+            if redirectLocation:
+                self._invalidate_redirect(bucketName, redirectLocation)
+            if e.status in const.PERMANENT_REDIRECT_STATUS and bucketName:
+                self._cache_redirect(bucketName, e.location)
             conn = self._make_request_internal(methodType, bucketName, objectKey, pathArgs, headers, entity, chunkedMode, e.location)
             conn._redirect = True
             result = self._parse_xml(conn, methodName, readable) if not parseMethod else parseMethod(conn)
         except Exception as e:
+            if redirectLocation:
+                self._invalidate_redirect(bucketName, redirectLocation)
+                if not readable:
+                    return self._make_request_once(methodType, bucketName, objectKey, pathArgs, headers, entity, chunkedMode, methodName, readable, parseMethod)
+                raise e
             flag = False
             if self.long_conn_mode:
                 if const.IS_PYTHON35_UP:
@@ -254,8 +315,21 @@ class _BasicClient(object):
             conn = self._make_request_internal(methodType, bucketName, objectKey, pathArgs, headers, entity, chunkedMode)
             result = self._parse_xml(conn, methodName, readable) if not parseMethod else parseMethod(conn)
         
+        if redirectLocation and util.to_int(result.status) >= 500:
+            self._invalidate_redirect(bucketName, redirectLocation)
         return result
 
+    def _cache_redirect(self, bucketName, location):
+        location = urlparse(location)
+        if location.scheme and location.netloc:
+            self._redirect_cache[bucketName] = '%s://%s' % (location.scheme, location.netloc)
+            self.log_client.log(INFO, 'cache redirect location %s for bucket %s', self._redirect_cache[bucketName], bucketName)
+
+    def _invalidate_redirect(self, bucketName, location):
+        if self._redirect_cache.get(bucketName) == location:
+            self._redirect_cache.pop(bucketName, None)
+            self.log_client.log(WARNING, 'invalidate redirect location %s for bucket %s', location, bucketName)
+
     def _make_request_internal(self, method, bucketName='', objectKey=None, pathArgs=None, headers=None, entity=None, 
                                chunkedMode=False, redirectLocation=None):
         objectKey = util.safe_encode(objectKey)
@@ -316,11 +390,11 @@ class _BasicClient(object):
                     now_date = datetime.strptime(headers[self.ha.date_header()], const.LONG_DATE_FORMAT)
                 shortDate = now_date.strftime(const.SHORT_DATE_FORMAT)
                 longDate = now_date.strftime(const.LONG_DATE_FORMAT)
-                v4Auth = auth.V4Authentication(ak, sk, str(self.region) if self.region is not None else '', shortDate, longDate, self.path_style, self.ha)
+                v4Auth = self._get_signer().getV4Authentication(str(self.region) if self.region is not None else '', shortDate, longDate)
                 ret = v4Auth.doAuth(method, bucketName, objectKey, pathArgs, headers)
                 self.log_client.log(DEBUG, '%s: %s' % (const.CANONICAL_REQUEST, ret[const.CANONICAL_REQUEST]))
             else:
-                obsAuth = auth.Authentication(ak, sk, self.path_style, self.ha)
+                obsAuth = self._get_signer().v2Auth
                 ret = obsAuth.doAuth(method, bucketName, objectKey, pathArgs, headers)
                 self.log_client.log(DEBUG, '%s: %s' % (const.CANONICAL_STRING, ret[const.CANONICAL_STRING]))
             headers[const.AUTHORIZATION_HEADER] = ret[const.AUTHORIZATION_HEADER]
@@ -364,12 +438,97 @@ class _BasicClient(object):
         else:
             conn = httplib.HTTPConnection(server, port=port, timeout=self.timeout)
 
+        if hasattr(conn, '_create_connection'):
+            conn._create_connection = self._create_connection
+
         return conn
 
+    def _get_socket_buffer_size(self):
+        if self.socket_buffer_size:
+            return self.socket_buffer_size
+        bdp = util.get_bdp(self.bandwidth, self.rtt)
+        return min(bdp, const.MAX_SOCKET_BUFFER_SIZE) if bdp else None
+
+    def _update_rtt(self, rtt):
+        with self._rtt_lock:
+            self.rtt = rtt if self.rtt is None else 0.875 * self.rtt + 0.125 * rtt
+            if self._auto_chunk_size:
+                self.chunk_size = util.get_chunk_size_by_bdp(util.get_bdp(self.bandwidth, self.rtt))
+
+    def _create_connection(self, address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None):
+        host, port = address
+        error = None
+        for af, socktype, proto, _, sa in socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM):
+            sock = None
+            try:
+                sock = socket.socket(af, socktype, proto)
+                if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                    sock.settimeout(timeout)
+                buffer_size = self._get_socket_buffer_size()
+                if buffer_size:
+                    util.set_socket_buffer_size(sock, buffer_size, self.log_client)
+                if source_address:
+                    sock.bind(source_address)
+                start = time.time()
+                sock.connect(sa)
+                if self._measure_rtt:
+                    self._update_rtt(time.time() - start)
+                return sock
+            except socket.error as e:
+                error = e
+                if sock is not None:
+                    sock.close()
+        if error is not None:
+            raise error
+        raise socket.error('getaddrinfo returns an empty list')
+
+    def _log_throughput(self, action, size, cost):
+        if size and cost > 0:
+            self.log_client.log(INFO, '%s %d bytes cost %d ms, throughput %.2f MB/s, chunk size %d, socket buffer size %s',
+                                action, size, int(cost * 1000), size / cost / 1048576, self.chunk_size, self._get_socket_buffer_size())
+
+    def _need_expect_continue(self, method, header, entity, chunkedMode):
+        if not self.expect_continue_threshold or entity is None or chunkedMode or header is None:
+            return False
+        if method not in (const.HTTP_METHOD_PUT, const.HTTP_METHOD_POST):
+            return False
+        content_length = util.to_long(header.get(const.CONTENT_LENGTH_HEADER))
+        return content_length is not None and content_length >= self.expect_continue_threshold
+
+    def _wait_for_continue(self, conn, method):
+        sock = conn.sock
+        if sock is None:
+            return None
+        # an ssl socket may already hold the decrypted response, select only sees the raw socket
+        pending = getattr(sock, 'pending', None)
+        if not (pending and pending()) and not select.select([sock], [], [], self.expect_continue_timeout)[0]:
+            self.log_client.log(DEBUG, 'no interim response in %s seconds, send body anyway', self.expect_continue_timeout)
+            return None
+        data = b''
+        while not data.endswith(b'\r\n\r\n'):
+            c = sock.recv(1)
+            if not c:
+                break
+            data += c
+        status_line = data.split(b'\r\n', 1)[0].split()
+        if len(status_line) >= 2 and status_line[1] == b'100':
+            return None
+        self.log_client.log(WARNING, 'request rejected before sending body, %s', util.to_string(data.split(b'\r\n', 1)[0]))
+        response = httplib.HTTPResponse(util.PrefixedSocket(data, sock), method=method)
+        response.begin()
+        return response
+
+    def _get_response(self, conn):
+        early_response = getattr(conn, '_early_response', None)
+        return early_response if early_response is not None else conn.getresponse()
+
     def _send_request(self, server, method, path, header, entity=None, port=None, scheme=None, redirect=False, chunkedMode=False):
 
-        flag = 0
+        attempt = 0
         conn = None
+        expect_continue = self._need_expect_continue(method, header, entity, chunkedMode)
+        if expect_continue:
+            header[const.EXPECT_HEADER] = const.EXPECT_CONTINUE_VALUE
         while True:
             try:
                 connection_key = const.CONNECTION_HEADER
@@ -415,25 +574,30 @@ class _BasicClient(object):
                     conn.endheaders()
                 else:
                     conn.request(method, path, headers=header)
-            except socket.error as e:
+            except (socket.error, httplib.HTTPException) as e:
                 util.close_conn(conn, self.log_client)
-                errno, _ = sys.exc_info()[:2]
-                if errno != socket.timeout or flag >= self.max_retry_count:
+                if not self.retry_policy.is_retryable_error(e) or not self.retry_policy.should_retry(attempt):
                     self.log_client.log(ERROR, 'connect service error, %s' % e)
                     self.log_client.log(ERROR, traceback.format_exc())
                     raise e
-                flag += 1
-                time.sleep(math.pow(2, flag) * 0.05)
-                self.log_client.log(WARNING, 'connect service time out, connect again, connect time:%d', int(flag))
+                self.retry_policy.sleep(attempt)
+                attempt += 1
+                self.log_client.log(WARNING, 'connect service error, %s, connect again, connect time:%d', e, attempt)
                 continue
             break
 
         if entity is not None:
+            if expect_continue:
+                conn._early_response = self._wait_for_continue(conn, method)
+                if conn._early_response is not None:
+                    return conn
+            start = time.time()
             if callable(entity):
                 entity(conn)
             else:
                 conn.send(entity)
                 self.log_client.log(DEBUG, 'request content:%s', util.to_string(entity))
+            self._log_throughput('send', util.to_long(header.get(const.CONTENT_LENGTH_HEADER)), time.time() - start)
         return conn
     
     def _getNoneResult(self, message='None Result'):
@@ -444,7 +608,7 @@ class _BasicClient(object):
             return self._getNoneResult('connection is none')
         result = None
         try:
-            result = conn.getresponse()
+            result = self._get_response(conn)
             if not result:
                 return self._getNoneResult('response is none')
             return self._parse_xml_internal(result, methodName, readable=readable)
@@ -456,31 +620,30 @@ class _BasicClient(object):
         finally:
             util.do_close(result, conn, self.connHolder, self.log_client)
             
-    def _parse_content(self, conn, objectKey, downloadPath=None, chuckSize=65536, loadStreamInMemory=False):
+    def _parse_content(self, conn, objectKey, downloadPath=None, chuckSize=65536, loadStreamInMemory=False, zeroCopy=False):
         if not conn:
             return self._getNoneResult('connection is none')
         close_conn_flag = True
         result = None
         try:
-            result = conn.getresponse()
+            result = self._get_response(conn)
             if not result:
                 return self._getNoneResult('response is none')
  
             if not util.to_int(result.status) < 300:
                 return self._parse_xml_internal(result)
  
-            if loadStreamInMemory:
-                self.log_client.log(DEBUG, 'loadStreamInMemory is True, read stream into memory')
-                buf = None
-                while True:
-                    chunk = result.read(chuckSize)
-                    if not chunk:
-                        break
-                    if buf is None:
-                        buf = chunk
-                    else:
-                        buf += chunk
+            start = time.time()
+            if zeroCopy:
+                self.log_client.log(DEBUG, 'zeroCopy is True, read stream into a preallocated buffer')
+                buf = util.read_response_into_buffer(result, util.to_long(result.getheader(const.CONTENT_LENGTH_HEADER)), chuckSize)
                 body = ObjectStream(buffer=buf, size=util.to_long(len(buf)))
+                self._log_throughput('receive', body.size, time.time() - start)
+            elif loadStreamInMemory:
+                self.log_client.log(DEBUG, 'loadStreamInMemory is True, read stream into memory')
+                buf = util.read_response(result, chuckSize)
+                body = ObjectStream(buffer=buf, size=util.to_long(len(buf)) if buf is not None else 0)
+                self._log_throughput('receive', body.size, time.time() - start)
             elif downloadPath is None:
                 self.log_client.log(DEBUG, 'DownloadPath is none, return conn directly')
                 close_conn_flag = False
@@ -489,6 +652,7 @@ class _BasicClient(object):
                 objectKey = util.safe_encode(objectKey)
                 downloadPath = util.safe_encode(downloadPath)
                 file_path = self._get_data(result, downloadPath, chuckSize)
+                self._log_throughput('receive', util.to_long(result.getheader(const.CONTENT_LENGTH_HEADER)), time.time() - start)
                 body = ObjectStream(url=util.to_string(file_path))
                 self.log_client.log(DEBUG, 'DownloadPath is ' + util.to_string(file_path))
  
@@ -510,6 +674,40 @@ class _BasicClient(object):
             if close_conn_flag:
                 util.do_close(result, conn, self.connHolder, self.log_client)
     
+    def _parse_list_objects(self, conn, skipOwner=False, compact=False, chuckSize=65536):
+        if not conn:
+            return self._getNoneResult('connection is none')
+        result = None
+        try:
+            result = self._get_response(conn)
+            if not result:
+                return self._getNoneResult('response is none')
+
+            if not util.to_int(result.status) < 300:
+                return self._parse_xml_internal(result, 'listObjects')
+
+            headers = {}
+            for k, v in result.getheaders():
+                headers[k.lower()] = v
+            parser = convertor.ListObjectsParser(self.convertor, skipOwner, compact)
+            while True:
+                chunk = result.read(chuckSize)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+            body = parser.close(headers)
+            self.log_client.log(DEBUG, 'recv %d objects by stream parser', len(body.contents))
+            header = self._rename_response_headers(headers)
+            requestId = headers.get(self.ha.request_id_header())
+            return GetResult(status=util.to_int(result.status), reason=result.reason, header=header, body=body, requestId=requestId)
+        except _RedirectException as ex:
+            raise ex
+        except Exception as e:
+            self.log_client.log(ERROR, traceback.format_exc())
+            raise e
+        finally:
+            util.do_close(result, conn, self.connHolder, self.log_client)
+
     def _get_data(self, result, downloadPath, chuckSize):
         origin_file_path = downloadPath
         if const.IS_WINDOWS:
@@ -574,22 +772,16 @@ class _BasicClient(object):
         for k, v in result.getheaders():
             headers[k.lower()] = v
         
-        xml = None
-        while True:
-            chunk = result.read(chuckSize)
-            if not chunk:
-                break
-            xml = chunk if xml is None else xml + chunk
+        xml = util.read_response(result, chuckSize)
          
         if status >= 300 and status < 400 and status != 304 and not readable and const.LOCATION_HEADER.lower() in headers:
             location = headers.get(const.LOCATION_HEADER.lower())
             self.log_client.log(WARNING, 'http code is %d, need to redirect to %s', status, location)
-            raise _RedirectException('http code is {0}, need to redirect to {1}'.format(status, location), location)
+            raise _RedirectException('http code is {0}, need to redirect to {1}'.format(status, location), location, status)
         else:
             if status < 300:
                 if methodName is not None:
-                    methodName = 'parse' + methodName[:1].upper() + methodName[1:]
-                    parseMethod = getattr(self.convertor, methodName)
+                    parseMethod = getattr(self.convertor, 'parse' + methodName[:1].upper() + methodName[1:])
                     if parseMethod is not None:
                         if xml:
                             xml = xml if const.IS_PYTHON2 else xml.decode('UTF-8')
@@ -613,6 +805,12 @@ class _BasicClient(object):
                     self.log_client.log(ERROR, util.to_string(ee))
                     self.log_client.log(ERROR, traceback.format_exc())
                     
+        if methodName in const.FAST_RESULT_METHODS:
+            self.log_client.log(DEBUG, 'http response result:status:%d,reason:%s,code:%s,message:%s,headers:%s', status, reason, code,
+                                message, headers)
+            return FastGetResult(code=code, message=message, status=status, reason=reason, body=body, 
+                                 requestId=requestId, hostId=hostId, resource=resource, headers=headers, rename=self._rename_response_headers)
+
         header = self._rename_response_headers(headers)
         self.log_client.log(DEBUG, 'http response result:status:%d,reason:%s,code:%s,message:%s,headers:%s', status, reason, code,
                             message, header)
@@ -656,29 +854,39 @@ class ObsClient(_BasicClient):
     def createV4SignedUrl(self, method, bucketName=None, objectKey=None, specialParam=None, expires=300, headers=None, queryParams=None):
         return self._createV4SignedUrl(method, bucketName, objectKey, specialParam, expires, headers, queryParams)
     
-    def _createV2SignedUrl(self, method, bucketName=None, objectKey=None, specialParam=None, expires=300, headers=None, queryParams=None):
+    def _getSignedUrlHost(self, calling_format, bucketName):
+        host = calling_format.get_server(self.server, bucketName)
+        if self.port != 443 and self.port != 80:
+            host = host + ':' + util.to_string(self.port)
+        return host
 
+    def _prepareV2SignedUrl(self, bucketName, specialParam, expires, headers, queryParams):
         headers, queryParams, expires, calling_format = self._prepareParameterForSignedUrl(specialParam, expires, headers, queryParams)
-        
-        headers[const.HOST_HEADER] = calling_format.get_server(self.server, bucketName)
-        
-        if self.port != 443 and self.port != 80:
-            headers[const.HOST_HEADER] = headers[const.HOST_HEADER] + util.to_string(self.port)
-        
+
+        headers[const.HOST_HEADER] = self._getSignedUrlHost(calling_format, bucketName)
+
         expires += util.to_int(time.time())
 
         securityProvider = self.securityProvider
         if securityProvider.security_token is not None and self.ha.security_token_header() not in headers:
             headers[self.ha.security_token_header()] = securityProvider.security_token
 
-        v2Auth = auth.Authentication(securityProvider.access_key_id, securityProvider.secret_access_key, self.path_style, self.ha)
+        return headers, queryParams, expires, calling_format
 
-        signature = v2Auth.getSignature(method, bucketName, objectKey, queryParams, headers, util.to_string(expires))['Signature']
+    def _signV2Url(self, v2Auth, method, bucketName, objectKey, queryParams, headers, expires):
+        signParams = queryParams.copy()
+        signature = v2Auth.getSignature(method, bucketName, objectKey, signParams, headers, util.to_string(expires))['Signature']
+        signParams['Expires'] = expires
+        signParams['AccessKeyId' if self.signature == 'obs' else 'AWSAccessKeyId'] = self.securityProvider.access_key_id
+        signParams['Signature'] = signature
+        return signParams
+
+    def _createV2SignedUrl(self, method, bucketName=None, objectKey=None, specialParam=None, expires=300, headers=None, queryParams=None):
+
+        headers, queryParams, expires, calling_format = self._prepareV2SignedUrl(bucketName, specialParam, expires, headers, queryParams)
+
+        queryParams = self._signV2Url(self._get_signer().v2Auth, method, bucketName, objectKey, queryParams, headers, expires)
 
-        queryParams['Expires'] = expires
-        queryParams['AccessKeyId' if self.signature == 'obs' else 'AWSAccessKeyId'] = securityProvider.access_key_id
-        queryParams['Signature'] = signature
-        
         result = {
             'signedUrl': calling_format.get_full_url(self.is_secure, self.server, self.port, bucketName, objectKey, queryParams),
             'actualSignedRequestHeaders': headers
@@ -686,15 +894,26 @@ class ObsClient(_BasicClient):
 
         return _CreateSignedUrlResponse(**result)
     
+    def createSignedUrls(self, method, bucketName, objectKeys, specialParam=None, expires=300, headers=None, queryParams=None):
+        if self.signature.lower() == 'v4':
+            for objectKey in objectKeys:
+                yield objectKey, self._createV4SignedUrl(method, bucketName, objectKey, specialParam, expires, headers, queryParams).signedUrl
+            return
+
+        headers, queryParams, expires, calling_format = self._prepareV2SignedUrl(bucketName, specialParam, expires, headers, queryParams)
+
+        v2Auth = self._get_signer().v2Auth
+
+        for objectKey in objectKeys:
+            signParams = self._signV2Url(v2Auth, method, bucketName, objectKey, queryParams, headers, expires)
+            yield objectKey, calling_format.get_full_url(self.is_secure, self.server, self.port, bucketName, objectKey, signParams)
+
     def _createV4SignedUrl(self, method, bucketName=None, objectKey=None, specialParam=None, expires=300, headers=None, queryParams=None):
         from datetime import datetime
 
         headers, queryParams, expires, calling_format = self._prepareParameterForSignedUrl(specialParam, expires, headers, queryParams)
 
-        headers[const.HOST_HEADER] = calling_format.get_server(self.server, bucketName)
-        
-        if self.port != 443 and self.port != 80:
-            headers[const.HOST_HEADER] = headers[const.HOST_HEADER] + util.to_string(self.port)
+        headers[const.HOST_HEADER] = self._getSignedUrlHost(calling_format, bucketName)
 
         date = headers[const.DATE_HEADER] if const.DATE_HEADER in headers else headers.get(const.DATE_HEADER.lower())
         date = datetime.strptime(date, const.GMT_DATE_FORMAT) if date else datetime.utcnow()
@@ -706,7 +925,7 @@ class ObsClient(_BasicClient):
         if securityProvider.security_token is not None and self.ha.security_token_header() not in headers:
             headers[self.ha.security_token_header()] = securityProvider.security_token
 
-        v4Auth = auth.V4Authentication(securityProvider.access_key_id, securityProvider.secret_access_key, self.region, shortDate, longDate, self.path_style, self.ha)
+        v4Auth = self._get_signer().getV4Authentication(self.region, shortDate, longDate)
 
         queryParams['X-Amz-Algorithm'] = 'AWS4-HMAC-SHA256'
         queryParams['X-Amz-Credential'] = v4Auth.getCredenttial()
@@ -804,13 +1023,12 @@ class ObsClient(_BasicClient):
         policy = util.base64_encode(originPolicy)
         
         if is_v4:
-            v4Auth = auth.V4Authentication(securityProvider.access_key_id, securityProvider.secret_access_key, self.region, shortDate, longDate,
-                                           self.path_style, self.ha)
-            signingKey = v4Auth.getSigningKey_python2() if const.IS_PYTHON2 else v4Auth.getSigningKey_python3()
+            v4Auth = self._get_signer().getV4Authentication(self.region, shortDate, longDate)
+            signingKey = v4Auth.getSigningKey()
             signature = v4Auth.hmacSha256(signingKey, policy if const.IS_PYTHON2 else policy.encode('UTF-8'))
             result = {'originPolicy': originPolicy, 'policy': policy, 'algorithm': formParams['X-Amz-Algorithm'], 'credential': formParams['X-Amz-Credential'], 'date': formParams['X-Amz-Date'], 'signature': signature}
         else:
-            v2Auth = auth.Authentication(securityProvider.access_key_id, securityProvider.secret_access_key, self.path_style, self.ha)
+            v2Auth = self._get_signer().v2Auth
             signature = v2Auth.hmacSha128(policy)
             result = {'originPolicy': originPolicy, 'policy': policy, 'signature': signature, 'accessKeyId': securityProvider.access_key_id}
         return _CreatePostSignatureResponse(**result)
@@ -827,8 +1045,10 @@ class ObsClient(_BasicClient):
         return self._make_put_request(bucketName, **self.convertor.trans_create_bucket(header=header, location=location))
 
     @count_time
-    def listObjects(self, bucketName, prefix=None, marker=None, max_keys=None, delimiter=None):
-        return self._make_get_request(bucketName, methodName='listObjects', **self.convertor.trans_list_objects(prefix=prefix, marker=marker, max_keys=max_keys, delimiter=delimiter))
+    def listObjects(self, bucketName, prefix=None, marker=None, max_keys=None, delimiter=None, skipOwner=False, compact=False):
+        def parseMethod(conn):
+            return self._parse_list_objects(conn, skipOwner, compact)
+        return self._make_get_request(bucketName, parseMethod=parseMethod, **self.convertor.trans_list_objects(prefix=prefix, marker=marker, max_keys=max_keys, delimiter=delimiter))
 
     @count_time
     def headBucket(self, bucketName):
@@ -1011,6 +1231,15 @@ class ObsClient(_BasicClient):
         
         return self._make_get_request(bucketName, objectKey, parseMethod=parseMethod, **self.convertor.trans_get_object(getObjectRequest=getObjectRequest, headers=headers))
     
+    @count_time
+    def getObjectIntoBuffer(self, bucketName, objectKey, getObjectRequest=GetObjectRequest(), headers=GetObjectHeader()):
+        _parse_content = self._parse_content
+        CHUNKSIZE = self.chunk_size
+        def parseMethod(conn):
+            return _parse_content(conn, objectKey, chuckSize=CHUNKSIZE, zeroCopy=True)
+        
+        return self._make_get_request(bucketName, objectKey, parseMethod=parseMethod, **self.convertor.trans_get_object(getObjectRequest=getObjectRequest, headers=headers))
+    
     @count_time
     def appendObject(self, bucketName, objectKey, content=None, metadata=None, headers=None):
         objectKey = util.safe_encode(objectKey)
@@ -1251,7 +1480,8 @@ class ObsClient(_BasicClient):
     @count_time
     def deleteObjects(self, bucketName, deleteObjectsRequest):
         self._assert_not_null(deleteObjectsRequest, 'deleteObjectsRequest is empty')
-        return self._make_post_request(bucketName, methodName='deleteObjects', **self.convertor.trans_delete_objects(deleteObjectsRequest=deleteObjectsRequest))
+        methodName = 'deleteObjectsQuiet' if deleteObjectsRequest.get('quiet') else 'deleteObjects'
+        return self._make_post_request(bucketName, methodName=methodName, **self.convertor.trans_delete_objects(deleteObjectsRequest=deleteObjectsRequest))
 
     @count_time
     def restoreObject(self, bucketName, objectKey, days, tier=None, versionId=None):
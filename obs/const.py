@@ -32,6 +32,8 @@ IF_MODIFIED_SINCE = 'If-Modified-Since'
 IF_UNMODIFIED_SINCE = 'If-Unmodified-Since'
 IF_MATCH = 'If-Match'
 IF_NONE_MATCH = 'If-None-Match'
+EXPECT_HEADER = 'Expect'
+EXPECT_CONTINUE_VALUE = '100-continue'
 
 
 CONNECTION_KEEP_ALIVE_VALUE = 'Keep-Alive'
@@ -67,6 +69,9 @@ LONG = long if IS_PYTHON2 else int
 
 DEFAULT_SECURE_PORT = 443
 DEFAULT_INSECURE_PORT = 80
+MAX_SOCKET_BUFFER_SIZE = 64 * 1024 * 1024
+PERMANENT_REDIRECT_STATUS = (301, 308)
+FAST_RESULT_METHODS = ('uploadPart', 'copyPart', 'deleteObject')
 DEFAULT_MINIMUM_SIZE = 5 * 1024 * 1024
 DEFAULT_MAXIMUM_SIZE = 5 * 1024 * 1024 * 1024
 OBS_SDK_VERSION = '3.0.0'
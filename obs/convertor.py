@@ -5,6 +5,16 @@ import xml.etree.ElementTree as ET
 from obs.model import *
 from obs import util
 from obs import const
+from obs import xmlbackend
+
+def _escape_text(text):
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
 
 class Adapter(object):
     
@@ -347,18 +357,29 @@ class Convertor(object):
         return {'pathArgs' : {'delete': None}, 'headers' : headers, 'entity' : entity}
     
     def trans_delete_objects_request(self, deleteObjectsRequest):
-        root = ET.Element('Delete')
+        parts = ['<Delete>']
         if deleteObjectsRequest is not None:
             if deleteObjectsRequest.get('quiet') is not None:
-                ET.SubElement(root, 'Quiet').text = util.to_string(deleteObjectsRequest['quiet']).lower()
-            if isinstance(deleteObjectsRequest.get('objects'), list) and len(deleteObjectsRequest['objects']) > 0:
-                for obj in deleteObjectsRequest['objects']:
-                    if obj.get('key') is not None:
-                        objectEle = ET.SubElement(root, 'Object')
-                        ET.SubElement(objectEle, 'Key').text = util.safe_decode(obj['key'])
-                        if obj.get('versionId') is not None:
-                            ET.SubElement(objectEle, 'VersionId').text = util.safe_decode(obj['versionId'])
-        return ET.tostring(root, 'UTF-8')
+                parts.append('<Quiet>' + util.to_string(deleteObjectsRequest['quiet']).lower() + '</Quiet>')
+            objects = deleteObjectsRequest.get('objects')
+            if isinstance(objects, (list, tuple)):
+                for obj in objects:
+                    if isinstance(obj, dict):
+                        key, versionId = obj.get('key'), obj.get('versionId')
+                    elif isinstance(obj, tuple):
+                        key, versionId = obj
+                    else:
+                        key, versionId = obj, None
+                    if key is None:
+                        continue
+                    parts.append('<Object><Key>' + _escape_text(util.safe_decode(key)) + '</Key>')
+                    if versionId is not None:
+                        parts.append('<VersionId>' + _escape_text(util.safe_decode(versionId)) + '</VersionId>')
+                    parts.append('</Object>')
+        if len(parts) == 1:
+            return b'<Delete />'
+        parts.append('</Delete>')
+        return ''.join(parts).encode('UTF-8')
     
     def trans_version_status(self, status):
         root = ET.Element('VersioningConfiguration')
@@ -874,7 +895,7 @@ class Convertor(object):
         return code, message, requestId, hostId, resource
     
     def parseListObjects(self, xml, headers=None):
-        root = ET.fromstring(xml)
+        root = xmlbackend.fromstring(xml)
     
         name = self._find_item(root, 'Name')
         prefix = self._find_item(root, 'Prefix')
@@ -999,7 +1020,7 @@ class Convertor(object):
         return corsList
     
     def parseListVersions(self, xml, headers=None):
-        root = ET.fromstring(xml)
+        root = xmlbackend.fromstring(xml)
         Name = self._find_item(root, './Name')
         Prefix = self._find_item(root, './Prefix')
         Delimiter = self._find_item(root, './Delimiter')
@@ -1070,7 +1091,7 @@ class Convertor(object):
         return option
     
     def parseDeleteObjects(self, xml, headers=None):
-        root = ET.fromstring(xml)
+        root = xmlbackend.fromstring(xml)
         deleted_list = []
         error_list = []
         deleteds = root.findall('./Deleted')
@@ -1092,6 +1113,18 @@ class Convertor(object):
                 error_list.append(ErrorResult(key=_key, versionId=_versionId, code=_code, message=_message))
         return DeleteObjectsResponse(deleted=deleted_list, error=error_list)
     
+    def parseDeleteObjectsQuiet(self, xml, headers=None):
+        error_list = []
+        if '<Error>' in xml:
+            root = xmlbackend.fromstring(xml)
+            for e in root.iter('Error'):
+                _key = self._find_item(e, './Key')
+                _versionId = self._find_item(e, './VersionId')
+                _code = self._find_item(e, './Code')
+                _message = self._find_item(e, './Message')
+                error_list.append(ErrorResult(key=_key, versionId=_versionId, code=_code, message=_message))
+        return DeleteObjectsResponse(deleted=[], error=error_list)
+    
     def parseDeleteObject(self, headers):
         deleteObjectResponse = DeleteObjectResponse()
         delete_marker = headers.get(self.ha.delete_marker_header())
@@ -1231,7 +1264,7 @@ class Convertor(object):
         return notification
     
     def parseListMultipartUploads(self, xml, headers=None):
-        root = ET.fromstring(xml)
+        root = xmlbackend.fromstring(xml)
         bucket = self._find_item(root, './Bucket')
         KeyMarker = self._find_item(root, './KeyMarker')
         UploadIdMarker = self._find_item(root, './UploadIdMarker')
@@ -1281,7 +1314,7 @@ class Convertor(object):
                                             isTruncated=IsTruncated, prefix=prefix, delimiter=delimiter, upload=uploadlist, commonPrefixs=commonlist)
     
     def parseCompleteMultipartUpload(self, xml, headers=None):
-        root = ET.fromstring(xml)
+        root = xmlbackend.fromstring(xml)
         location = self._find_item(root, './Location')
         bucket = self._find_item(root, './Bucket')
         key = self._find_item(root, './Key')
@@ -1296,7 +1329,7 @@ class Convertor(object):
         return completeMultipartUploadResponse
     
     def parseListParts(self, xml, headers=None):
-        root = ET.fromstring(xml)
+        root = xmlbackend.fromstring(xml)
         bucketName = self._find_item(root, './Bucket')
         objectKey = self._find_item(root, './Key')
         uploadId = self._find_item(root, './UploadId')
@@ -1424,7 +1457,7 @@ class Convertor(object):
         return option
     
     def parseInitiateMultipartUpload(self, xml, headers=None):
-        root = ET.fromstring(xml)
+        root = xmlbackend.fromstring(xml)
         bucketName = self._find_item(root, './Bucket')
         objectKey = self._find_item(root, './Key')
         uploadId = self._find_item(root, './UploadId')
@@ -1526,3 +1559,95 @@ class Convertor(object):
         replication = Replication(agency=agency, replicationRules=_rules)
         return replication
 
+
+
+class ListObjectsParser(object):
+    '''
+    Incremental parser for listObjects responses. Feed it the body chunk by chunk as it
+    arrives; each Contents element is turned into an entry and discarded right away, so a
+    1000-key page never exists as a full element tree. Owner fields are skipped when skipOwner is set,
+    and entries are CompactContent rows instead of Content dicts when compact is set.
+    '''
+    def __init__(self, convertor, skipOwner=False, compact=False):
+        self.convertor = convertor
+        self.skipOwner = skipOwner
+        self.compact = compact
+        self._fields = {}
+        self._contents = []
+        self._prefixes = []
+        self._root = None
+        self._depth = 0
+        self._parser = xmlbackend.pull_parser(('start', 'end'))
+
+    @staticmethod
+    def _tag(elem):
+        tag = elem.tag
+        return tag[tag.rfind('}') + 1:] if tag[:1] == '{' else tag
+
+    @staticmethod
+    def _text(elem):
+        if elem is None:
+            return None
+        text = elem.text
+        if const.IS_PYTHON2:
+            text = util.safe_encode(text)
+        return util.to_string(text)
+
+    def feed(self, data):
+        self._parser.feed(data)
+        self._handle(self._parser.read_events())
+
+    def close(self, headers=None):
+        self._parser.close()
+        self._handle(self._parser.read_events())
+        fields = self._fields
+        location = headers.get(self.convertor.ha.bucket_region_header()) if headers is not None else None
+        return ListObjectsResponse(name=fields.get('Name'), location=location, prefix=fields.get('Prefix'), marker=fields.get('Marker'),
+                                   delimiter=fields.get('Delimiter'), max_keys=util.to_int(fields.get('MaxKeys')),
+                                   is_truncated=util.to_bool(fields.get('IsTruncated')), next_marker=fields.get('NextMarker'),
+                                   contents=self._contents, commonPrefixs=self._prefixes)
+
+    def _handle(self, events):
+        for event, elem in events:
+            if event == 'start':
+                if self._root is None:
+                    self._root = elem
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if self._depth != 1:
+                continue
+            tag = self._tag(elem)
+            if tag == 'Contents':
+                self._contents.append(self._parse_content(elem))
+            elif tag == 'CommonPrefixes':
+                prefix = None
+                for child in elem:
+                    if self._tag(child) == 'Prefix':
+                        prefix = self._text(child)
+                self._prefixes.append(CommonPrefix(prefix=prefix))
+            else:
+                self._fields[tag] = self._text(elem)
+            self._root.clear()
+
+    def _parse_content(self, elem):
+        values = {}
+        owner = None
+        for child in elem:
+            tag = self._tag(child)
+            if tag == 'Owner':
+                if not self.skipOwner:
+                    ownerValues = dict((self._tag(item), self._text(item)) for item in child)
+                    owner = Owner(owner_id=ownerValues.get('ID'),
+                                  owner_name=None if self.convertor.is_obs else ownerValues.get('DisplayName'))
+            else:
+                values[tag] = self._text(child)
+        if owner is None and not self.skipOwner:
+            owner = Owner()
+        if self.compact:
+            return CompactContent(key=values.get('Key'), mtime=DateTime.UTCToEpoch(values.get('LastModified')), etag=values.get('ETag'),
+                                  size=util.to_long(values.get('Size')), owner=owner, storageClass=values.get('StorageClass'),
+                                  isAppendable=values.get('Type') == 'Appendable')
+        return Content(key=values.get('Key'), lastModified=DateTime.UTCToLocal(values.get('LastModified')), etag=values.get('ETag'),
+                       size=util.to_long(values.get('Size')), owner=owner, storageClass=values.get('StorageClass'),
+                       isAppendable=values.get('Type') == 'Appendable')
@@ -111,6 +111,8 @@ class LogClient(object):
             self.logger.addHandler(console_handler)
 
     def log(self, level, msg, *args, **kwargs):
+        if not self.logger.isEnabledFor(level):
+            return
         base_back = sys._getframe().f_back
         funcname = base_back.f_code.co_name
         while funcname.lower() == 'log':
@@ -2,12 +2,14 @@
 # -*- coding:utf-8 -*-
 
 import time
+import calendar
 from obs.const import LONG, BASESTRING
 from obs import util
 
 __all__ = [
     'BaseModel',
     'GetResult',
+    'FastGetResult',
     'CompletePart',
     'Permission',
     'StorageClass', 
@@ -24,6 +26,7 @@ __all__ = [
     'CommonPrefix',
     'Condition',
     'Content',
+    'CompactContent',
     'DateTime',
     'SseHeader',
     'SseCHeader',
@@ -138,6 +141,71 @@ class GetResult(BaseModel):
         self.resource = resource
         self.header = header
 
+class FastGetResult(GetResult):
+    # the response headers are renamed on first access of header, most callers never read them
+
+    def __init__(self, code=None, message=None, status=None, reason=None, body=None, requestId=None, hostId=None, resource=None,
+                 headers=None, rename=None):
+        super(FastGetResult, self).__init__(code=code, message=message, status=status, reason=reason, body=body,
+                                            requestId=requestId, hostId=hostId, resource=resource)
+        object.__setattr__(self, '_headers', headers)
+        object.__setattr__(self, '_rename', rename)
+
+    def _load_header(self):
+        if self._headers is not None:
+            headers, rename = self._headers, self._rename
+            object.__setattr__(self, '_headers', None)
+            object.__setattr__(self, '_rename', None)
+            self.header = rename(headers) if rename is not None else list(headers.items())
+
+    def __getattr__(self, key):
+        if key[:1].lower() + key[1:] == 'header':
+            self._load_header()
+        return super(FastGetResult, self).__getattr__(key)
+
+    def __getitem__(self, key):
+        if key == 'header':
+            self._load_header()
+        return super(FastGetResult, self).__getitem__(key)
+
+    def get(self, key, default=None):
+        if key == 'header':
+            self._load_header()
+        return super(FastGetResult, self).get(key, default)
+
+    def __contains__(self, key):
+        if key == 'header':
+            self._load_header()
+        return super(FastGetResult, self).__contains__(key)
+
+    def __iter__(self):
+        self._load_header()
+        return super(FastGetResult, self).__iter__()
+
+    def __len__(self):
+        self._load_header()
+        return super(FastGetResult, self).__len__()
+
+    def __repr__(self):
+        self._load_header()
+        return super(FastGetResult, self).__repr__()
+
+    def keys(self):
+        self._load_header()
+        return super(FastGetResult, self).keys()
+
+    def values(self):
+        self._load_header()
+        return super(FastGetResult, self).values()
+
+    def items(self):
+        self._load_header()
+        return super(FastGetResult, self).items()
+
+    def __reduce__(self):
+        # the rename callable is bound to the client, pickle the loaded header instead
+        return FastGetResult, (), None, None, iter(self.items())
+
 class CompletePart(BaseModel):
     allowedAttr = {'partNum': int, 'etag': BASESTRING}
 
@@ -270,6 +338,37 @@ class Content(BaseModel):
     def __str__(self):
         return self.key
 
+class CompactContent(object):
+    __slots__ = ('key', 'mtime', 'etag', 'size', 'owner', 'storageClass', 'isAppendable')
+    fields = ('key', 'lastModified', 'mtime', 'etag', 'size', 'owner', 'storageClass', 'isAppendable')
+
+    def __init__(self, key=None, mtime=None, etag=None, size=None, owner=None, storageClass=None, isAppendable=None):
+        self.key = key
+        self.mtime = mtime
+        self.etag = etag
+        self.size = size
+        self.owner = owner
+        self.storageClass = storageClass
+        self.isAppendable = isAppendable
+
+    @property
+    def lastModified(self):
+        return DateTime.EpochToLocal(self.mtime)
+
+    def __getitem__(self, key):
+        if key not in self.fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.fields else default
+
+    def __str__(self):
+        return self.key
+
+    def __repr__(self):
+        return repr(dict((key, getattr(self, key)) for key in self.fields if getattr(self, key) is not None))
+
 class DateTime(BaseModel):
 
     allowedAttr = {'year': int, 'month': int, 'day': int, 'hour': int, 'min':int, 'sec':int}
@@ -310,6 +409,24 @@ class DateTime(BaseModel):
 
         return dt
     
+    @staticmethod
+    def UTCToEpoch(strUTC):
+        if strUTC is None:
+            return None
+        if len(strUTC) >= 19 and strUTC[4] == '-' and strUTC[10] == 'T' and strUTC[13] == ':':
+            try:
+                return calendar.timegm((int(strUTC[0:4]), int(strUTC[5:7]), int(strUTC[8:10]),
+                                        int(strUTC[11:13]), int(strUTC[14:16]), int(strUTC[17:19]), 0, 0, 0))
+            except ValueError:
+                pass
+        return calendar.timegm(time.strptime(strUTC, '%Y-%m-%dT%H:%M:%S.%fZ'))
+
+    @staticmethod
+    def EpochToLocal(epoch):
+        if epoch is None:
+            return None
+        return time.strftime('%Y/%m/%d %H:%M:%S', time.localtime(epoch))
+
     @staticmethod
     def UTCToLocalMid(strUTC):
         if strUTC is None:
@@ -790,7 +907,7 @@ class DeleteObjectResponse(BaseModel):
     
 class DeleteObjectsRequest(BaseModel):
 
-    allowedAttr = {'quiet': bool, 'objects': list}
+    allowedAttr = {'quiet': bool, 'objects': [list, tuple]}
 
     def __init__(self, quiet=None, objects=None):
         self.quiet = quiet
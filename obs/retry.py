@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+
+import multiprocessing
+import random
+import socket
+import threading
+import time
+
+from obs import util
+from obs.const import IS_PYTHON2
+
+if IS_PYTHON2:
+    import httplib
+else:
+    import http.client as httplib
+
+RETRYABLE_STATUS = (500, 502, 503, 504)
+RETRYABLE_ERROR_CODES = ('SlowDown', 'RequestTimeout', 'InternalError', 'ServiceUnavailable')
+
+
+class _Tokens(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class RetryBudget(object):
+    '''
+    Caps how many retries a whole job may spend. Each retry takes one token and
+    each successful request gives back refill_ratio of a token, so a job that
+    keeps failing stops retrying instead of adding load to an overloaded service.
+    The tokens belong to one process unless shared is set, then they live in
+    shared memory and worker processes forked after the budget is created spend
+    from the same budget.
+    '''
+    def __init__(self, max_tokens=100, refill_ratio=0.1, shared=False):
+        self.max_tokens = float(max_tokens)
+        self.refill_ratio = float(refill_ratio)
+        if shared:
+            self._tokens = multiprocessing.Value('d', self.max_tokens)
+            self._lock = self._tokens.get_lock()
+        else:
+            self._tokens = _Tokens(self.max_tokens)
+            self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._tokens.value < 1:
+                return False
+            self._tokens.value -= 1
+            return True
+
+    def deposit(self):
+        with self._lock:
+            self._tokens.value = min(self.max_tokens, self._tokens.value + self.refill_ratio)
+
+    @property
+    def remaining(self):
+        return int(self._tokens.value)
+
+
+class RetryPolicy(object):
+    '''
+    Decides whether a failed request is retried and how long to wait first.
+    Delays use exponential backoff with full jitter: uniform(0, min(max_delay, base_delay * 2 ** attempt)).
+    '''
+    def __init__(self, max_retry_count=3, base_delay=0.1, max_delay=20, budget=None):
+        self.max_retry_count = max_retry_count
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def is_retryable_error(self, e):
+        return isinstance(e, (socket.error, httplib.HTTPException))
+
+    def is_retryable_result(self, result):
+        if result is None:
+            return False
+        status = util.to_int(result.status)
+        if status in RETRYABLE_STATUS:
+            return True
+        return status is not None and status >= 400 and result.errorCode in RETRYABLE_ERROR_CODES
+
+    def should_retry(self, attempt):
+        if attempt >= self.max_retry_count:
+            return False
+        return self.budget is None or self.budget.acquire()
+
+    def record_success(self):
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def get_delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def sleep(self, attempt):
+        time.sleep(self.get_delay(attempt))
@@ -425,7 +425,7 @@ class downloadOperation(Operation):
                 resp = self.obsClient.getObject(bucketName=self._record['bucketName'], objectKey=self._record['objectKey'], getObjectRequest=get_object_request, headers=self.header)
                 if resp.status < 300:
                     respone = resp.body.response
-                    chunk_size = 65536
+                    chunk_size = self.obsClient.chunk_size
                     with self._lock:
                         if respone is not None:
                             with open(_to_unicode(self._tmp_file), 'rb+') as f:
@@ -436,7 +436,7 @@ class downloadOperation(Operation):
                                     if not chunk:
                                         break
                                     f.write(chunk)
-                                    position += chunk_size
+                                    position += len(chunk)
                                     f.seek(position, 0)
                                 respone.close()
                                 f.close()
@@ -591,7 +591,7 @@ class downloadOperation(Operation):
             resp = self.obsClient.getObject(bucketName=self.bucketName, objectKey=self.objectKey, getObjectRequest=get_object_request, headers=self.header)
             if resp.status < 300:
                 respone = resp.body.response
-                chunk_size = 65536
+                chunk_size = self.obsClient.chunk_size
                 with self._lock:
                     if respone is not None:
                         with open(_to_unicode(self._tmp_file), 'rb+') as fs:
@@ -602,7 +602,7 @@ class downloadOperation(Operation):
                                 if not chunk:
                                     break
                                 fs.write(chunk)
-                                position += chunk_size
+                                position += len(chunk)
                                 fs.seek(position, 0)
                             fs.close()
                         respone.close()
@@ -1,9 +1,11 @@
 #!/usr/bin/python
 # -*- coding:utf-8 -*-
 
+import io
 import re
 import base64
 import hashlib
+import socket
 from obs.const import LONG, IS_PYTHON2, UNICODE, IPv4_REGEX
 if IS_PYTHON2:
     import urllib
@@ -56,22 +58,21 @@ class RequestFormat(object):
 
     @classmethod
     def convert_path_string(cls, path_args, allowdNames=None):
-        e = ''
-        if isinstance(path_args, dict):
-            e1 = '?'
-            e2 = '&'
-            for path_key, path_value in path_args.items():
-                flag = True
-                if allowdNames is not None and path_key not in allowdNames:
-                    flag = False
-                if flag:
-                    path_key = encode_item(path_key, '/')
-                    if path_value is None:
-                        e1 += path_key + '&'
-                        continue
-                    e2 += path_key + '=' + encode_item(path_value, '/') + '&'
-            e = (e1 + e2).replace('&&', '&').replace('?&', '?')[:-1]
-        return e
+        if not path_args or not isinstance(path_args, dict):
+            return ''
+        noneValues = []
+        values = []
+        for path_key, path_value in path_args.items():
+            if allowdNames is not None and path_key not in allowdNames:
+                continue
+            path_key = encode_item(path_key, '/')
+            if path_value is None:
+                noneValues.append(path_key)
+            else:
+                values.append(path_key + '=' + encode_item(path_value, '/'))
+        if not noneValues and not values:
+            return ''
+        return '?' + '&'.join(noneValues + values)
 
     def get_endpoint(self, server, port, bucket):
         return
@@ -147,6 +148,8 @@ def get_readable_entity(readable, chunk_size=65536):
         finally:
             if hasattr(readable, 'close') and callable(readable.close):
                 readable.close()
+    # the stream is read once, the request cannot be sent again
+    entity.resendable = False
     return entity
 
 def get_readable_entity_by_totalcount(readable, totalCount, chunk_size=65536):
@@ -165,6 +168,8 @@ def get_readable_entity_by_totalcount(readable, totalCount, chunk_size=65536):
         finally:
             if hasattr(readable, 'close') and callable(readable.close):
                 readable.close()
+    # the stream is read once, the request cannot be sent again
+    entity.resendable = False
     return entity
 
 def get_file_entity(file_path, chunk_size=65536):
@@ -208,6 +213,27 @@ def get_file_entity_by_offset_partsize(file_path, offset, partSize, chunk_size=6
     return entity
 
 
+def get_bdp(bandwidth, rtt):
+    if not bandwidth or not rtt:
+        return None
+    return LONG(bandwidth * rtt)
+
+def get_chunk_size_by_bdp(bdp, min_size=65536, max_size=4194304):
+    if not bdp:
+        return min_size
+    chunk_size = min_size
+    while chunk_size * 2 <= max_size and chunk_size * 2 * 8 <= bdp:
+        chunk_size *= 2
+    return chunk_size
+
+def set_socket_buffer_size(sock, size, log_client=None):
+    for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, size)
+        except socket.error as e:
+            if log_client:
+                log_client.log(ERROR, 'set socket buffer size error, %s' % e)
+
 def is_ipaddress(item):
     return re.match(IPv4_REGEX, item)
 
@@ -222,8 +248,17 @@ def base64_encode(unencoded):
     encodeestr = base64.b64encode(unencoded, altchars=None)
     return encodeestr if IS_PYTHON2 else encodeestr.decode('UTF-8')
 
+_ENCODED_OBJECT_KEYS = {}
+_ENCODED_OBJECT_KEYS_MAX = 1024
+
 def encode_object_key(key):
-    return encode_item(key, '/')
+    encoded = _ENCODED_OBJECT_KEYS.get(key)
+    if encoded is None:
+        encoded = encode_item(key, '/')
+        if len(_ENCODED_OBJECT_KEYS) >= _ENCODED_OBJECT_KEYS_MAX:
+            _ENCODED_OBJECT_KEYS.clear()
+        _ENCODED_OBJECT_KEYS[key] = encoded
+    return encoded
 
 
 def encode_item(item, safe='/'):
@@ -311,6 +346,8 @@ def do_close(result, conn, connHolder, log_client=None):
         close_conn(conn, log_client)
     elif hasattr(conn, '_redirect') and conn._redirect:
         close_conn(conn, log_client)
+    elif getattr(conn, '_early_response', None) is not None:
+        close_conn(conn, log_client)
     else:
         if connHolder is not None:
             try:
@@ -326,6 +363,67 @@ def close_conn(conn, log_client=None):
         if log_client:
             log_client.log(ERROR, ex)
 
+class _PrefixedSocketIO(io.RawIOBase):
+    def __init__(self, prefix, sock):
+        self._prefix = prefix
+        self._sock = sock
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._prefix:
+            n = min(len(b), len(self._prefix))
+            b[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        return self._sock.recv_into(b)
+
+class PrefixedSocket(object):
+    def __init__(self, prefix, sock):
+        self._prefix = prefix
+        self._sock = sock
+
+    def makefile(self, *args, **kwargs):
+        return io.BufferedReader(_PrefixedSocketIO(self._prefix, self._sock))
+
+def read_response(result, chunk_size=65536):
+    chunks = []
+    while True:
+        chunk = result.read(chunk_size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    if not chunks:
+        return None
+    return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+def read_response_into_buffer(result, length=None, chunk_size=65536):
+    if length is None or length < 0:
+        buf = bytearray()
+        while True:
+            chunk = result.read(chunk_size)
+            if not chunk:
+                break
+            buf.extend(chunk)
+        return memoryview(buf)
+
+    buf = bytearray(length)
+    view = memoryview(buf)
+    pos = 0
+    readinto = getattr(result, 'readinto', None)
+    while pos < length:
+        if readinto is not None:
+            n = readinto(view[pos:min(pos + chunk_size, length)])
+        else:
+            chunk = result.read(min(chunk_size, length - pos))
+            n = len(chunk) if chunk else 0
+            view[pos:pos + n] = chunk
+        if not n:
+            break
+        pos += n
+    return view if pos == length else view[:pos]
+
 SKIP_VERIFY_ATTR_TYPE = False
 def verify_attr_type(value, allowedAttrType):
     if SKIP_VERIFY_ATTR_TYPE:
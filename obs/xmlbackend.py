@@ -0,0 +1,94 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+
+'''
+XML parsing backend for response parsers. xml.etree.ElementTree is the default;
+lxml can be selected with use_backend when it is installed. Both expose the same
+find/findall/iter/text API that the convertor relies on.
+'''
+
+import xml.etree.ElementTree as ET
+from obs.const import IS_PYTHON2, UNICODE
+
+try:
+    from lxml import etree as _lxml
+except ImportError:
+    _lxml = None
+
+STDLIB = 'stdlib'
+LXML = 'lxml'
+
+_backend = STDLIB
+
+
+def available_backends():
+    return (STDLIB, LXML) if _lxml is not None else (STDLIB,)
+
+def get_backend():
+    return _backend
+
+def use_backend(name):
+    global _backend
+    if name not in available_backends():
+        raise ValueError('xml backend %s is not available' % name)
+    _backend = name
+
+def _lxml_parser():
+    return _lxml.XMLParser(resolve_entities=False, no_network=True, remove_comments=True, remove_pis=True, huge_tree=True)
+
+def fromstring(xml):
+    if _backend == LXML:
+        if isinstance(xml, UNICODE) or (not IS_PYTHON2 and isinstance(xml, str)):
+            xml = xml.encode('UTF-8')
+        return _lxml.fromstring(xml, _lxml_parser())
+    return ET.fromstring(xml)
+
+def pull_parser(events):
+    if _backend == LXML:
+        return _lxml.XMLPullParser(events=events, resolve_entities=False, no_network=True, remove_comments=True,
+                                   remove_pis=True, huge_tree=True)
+    if hasattr(ET, 'XMLPullParser'):
+        return ET.XMLPullParser(events=events)
+    return _PullParser(events)
+
+
+class _EventBuilder(ET.TreeBuilder):
+    '''
+    TreeBuilder that also records start and end events, python 2 has no XMLPullParser
+    '''
+    def __init__(self, events):
+        ET.TreeBuilder.__init__(self)
+        self.wanted = events
+        self.events = []
+
+    def start(self, tag, attrs):
+        elem = ET.TreeBuilder.start(self, tag, attrs)
+        if 'start' in self.wanted:
+            self.events.append(('start', elem))
+        return elem
+
+    def end(self, tag):
+        elem = ET.TreeBuilder.end(self, tag)
+        if 'end' in self.wanted:
+            self.events.append(('end', elem))
+        return elem
+
+
+class _PullParser(object):
+    '''
+    the feed/read_events/close part of XMLPullParser built on XMLParser with a target
+    '''
+    def __init__(self, events):
+        self._target = _EventBuilder(events)
+        self._parser = ET.XMLParser(target=self._target)
+
+    def feed(self, data):
+        self._parser.feed(data)
+
+    def read_events(self):
+        events = self._target.events
+        self._target.events = []
+        return iter(events)
+
+    def close(self):
+        self._parser.close()
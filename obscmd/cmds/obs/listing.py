@@ -0,0 +1,465 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import threading
+
+from obscmd.cmds.obs.obsutil import check_resp
+from obscmd.compat import queue
+
+LIST_WORKERS = 8
+QUEUE_PAGES = 4
+RANGES_PER_WORKER = 4
+MAX_SPLIT_DEPTH = 8
+# printable ascii, the characters probed when looking for range boundaries
+PROBE_FIRST = 0x20
+PROBE_LAST = 0x7e
+_DONE = object()
+
+
+class _Planned(object):
+    """
+    end of the plan in an unordered listing, with the number of listed units
+    """
+
+    def __init__(self, count):
+        self.count = count
+
+
+class ListUnit(object):
+    """
+    one piece of a listing: either objects that are already known from the
+    delimiter listing, or keys under prefix that a worker lists page by page.
+    a key range starts after marker and stops before end, first is the known
+    key the range starts with
+    """
+
+    def __init__(self, sort_key, prefix=None, entries=None, marker=None, end=None, first=None):
+        self.sort_key = sort_key
+        self.prefix = prefix
+        self.entries = entries
+        self.marker = marker
+        self.end = end
+        self.first = first
+        self.output = None
+
+
+class ParallelLister(object):
+    """
+    list all objects under a prefix with several concurrent listObjects streams.
+    the prefix is split into subtrees by a delimiter listing, or into key ranges
+    when it is a flat namespace, each unit is listed by a worker thread and the
+    pages are merged back into one stream, in key order when ordered is set.
+    """
+
+    def __init__(self, client, workers=LIST_WORKERS, fanout_depth=1, skip_owner=True):
+        self.client = client
+        self.workers = max(1, workers)
+        self.fanout_depth = fanout_depth
+        self.skip_owner = skip_owner
+        self._stop = threading.Event()
+
+    def list_page(self, bucket, prefix=None, marker=None, delimiter=None, max_keys=None):
+        resp = self.client.listObjects(bucket, prefix=prefix, marker=marker, max_keys=max_keys, delimiter=delimiter,
+                                       skipOwner=self.skip_owner, compact=True)
+        check_resp(resp)
+        return resp.body
+
+    def iter_pages(self, bucket, prefix=None, marker=None, end=None):
+        """
+        list pages of objects under prefix after marker
+        :param bucket:
+        :param prefix:
+        :param marker: start after this key
+        :param end: stop before this key
+        :return: generator of entry lists
+        """
+        while not self._stop.is_set():
+            body = self.list_page(bucket, prefix, marker)
+            contents = body.contents
+            if end is not None and contents and contents[-1].key >= end:
+                contents = [entry for entry in contents if entry.key < end]
+                if contents:
+                    yield contents
+                break
+            if contents:
+                yield contents
+            if not body.is_truncated or not contents:
+                break
+            marker = body.next_marker or contents[-1].key
+
+    def probe_starts(self, bucket, prefix, base, after=None):
+        """
+        find the first key after base + c for every character c that keys under
+        base continue with, skipping characters no key starts with
+        :param bucket:
+        :param prefix: prefix of the listing
+        :param base: common start of the keys to split, prefix or longer
+        :param after: only keys after this one
+        :return: list of entries in key order
+        """
+        starts = []
+        code = PROBE_FIRST
+        while code <= PROBE_LAST and not self._stop.is_set():
+            marker = base + chr(code)
+            if after is not None and after > marker:
+                marker = after
+            body = self.list_page(bucket, prefix, marker, max_keys=1)
+            if not body.contents or not body.contents[0].key.startswith(base):
+                break
+            entry = body.contents[0]
+            if len(entry.key) == len(base):
+                break
+            starts.append(entry)
+            code = max(code, ord(entry.key[len(base)])) + 1
+        return starts
+
+    def split_ranges(self, bucket, prefix, after=None):
+        """
+        split the keys under prefix into ranges whose first keys are found by
+        max_keys=1 probes, so a flat namespace is listed concurrently too
+        :param bucket:
+        :param prefix:
+        :param after: only keys after this one
+        :return: list of ListUnit in key order
+        """
+        base = prefix or ''
+        starts = []
+        for _ in range(MAX_SPLIT_DEPTH):
+            starts = self.probe_starts(bucket, prefix, base, after)
+            if len(starts) != 1:
+                break
+            base = starts[0].key[:len(base) + 1]
+
+        limit = self.workers * RANGES_PER_WORKER
+        if len(starts) > limit:
+            step = float(len(starts)) / limit
+            starts = [starts[int(i * step)] for i in range(limit)]
+
+        units = []
+        first = starts[0].key if starts else None
+        if first is None or after is None or after < base + chr(PROBE_FIRST):
+            units.append(ListUnit(after or prefix or '', prefix=prefix, marker=after, end=first))
+        ends = [entry.key for entry in starts[1:]] + [None]
+        for entry, end in zip(starts, ends):
+            units.append(ListUnit(entry.key, prefix=prefix, marker=entry.key, end=end, first=entry))
+        return units
+
+    def fanout(self, bucket, prefix, depth):
+        """
+        split prefix into units with delimiter listings, depth levels deep. units
+        are yielded page by page so workers start while the listing goes on, the
+        objects of a page make one unit. once a page is mostly objects the rest
+        of the prefix is split into key ranges
+        :param bucket:
+        :param prefix:
+        :param depth:
+        :return: generator of ListUnit in key order
+        """
+        marker = None
+        while not self._stop.is_set():
+            body = self.list_page(bucket, prefix, marker, delimiter='/')
+            prefixes = [item['prefix'] for item in body.commonPrefixs]
+            items = sorted([(entry.key, entry) for entry in body.contents] + [(sub, None) for sub in prefixes],
+                           key=lambda item: item[0])
+            entries = []
+            for key, entry in items:
+                if entry is not None:
+                    entries.append(entry)
+                    continue
+                if entries:
+                    yield ListUnit(entries[0].key, entries=entries)
+                    entries = []
+                if depth > 1:
+                    for unit in self.fanout(bucket, key, depth - 1):
+                        yield unit
+                else:
+                    yield ListUnit(key, prefix=key)
+            if entries:
+                yield ListUnit(entries[0].key, entries=entries)
+
+            marker = body.next_marker
+            if not body.is_truncated or not marker:
+                break
+            # a marker that is a common prefix would list that subtree again without delimiter
+            if len(body.contents) >= len(prefixes) and marker not in prefixes:
+                for unit in self.split_ranges(bucket, prefix, marker):
+                    yield unit
+                break
+
+    def plan(self, bucket, prefix=None):
+        """
+        units to list
+        :param bucket:
+        :param prefix:
+        :return: generator of ListUnit in key order
+        """
+        return self.fanout(bucket, prefix, self.fanout_depth)
+
+    def list_unit(self, bucket, unit):
+        if unit.first is not None:
+            yield [unit.first]
+        for page in self.iter_pages(bucket, unit.prefix, unit.marker, unit.end):
+            yield page
+
+    def iter_objects(self, bucket, prefix=None, ordered=True):
+        """
+        list all objects under prefix concurrently
+        :param bucket:
+        :param prefix:
+        :param ordered: yield objects in key order, otherwise as soon as any page arrives
+        :return: generator of entries
+        """
+        for page in self.iter_object_pages(bucket, prefix, ordered):
+            for entry in page:
+                yield entry
+
+    def iter_object_pages(self, bucket, prefix=None, ordered=True):
+        self._stop.clear()
+        planned = queue.Queue(self.workers * QUEUE_PAGES) if ordered else None
+        shared = None if ordered else queue.Queue(self.workers * QUEUE_PAGES)
+        pending = queue.Queue()
+        threads = [threading.Thread(target=self._feed, args=(bucket, prefix, pending, planned, shared))]
+        threads.extend(threading.Thread(target=self._work, args=(bucket, pending)) for _ in range(self.workers))
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            for page in (self._merge_ordered(planned) if ordered else self._merge_unordered(shared)):
+                yield page
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    def _feed(self, bucket, prefix, pending, planned, shared):
+        """
+        hand the planned units to the workers, and in key order to the merge
+        through planned, or the known entries and the unit count through shared
+        """
+        output = planned if shared is None else shared
+        tasks = 0
+        try:
+            for unit in self.plan(bucket, prefix):
+                if unit.entries is None:
+                    unit.output = queue.Queue(QUEUE_PAGES) if shared is None else shared
+                    pending.put(unit)
+                    tasks += 1
+                    if shared is None and not self._put(planned, unit):
+                        return
+                elif not self._put(output, unit if shared is None else unit.entries):
+                    return
+            self._put(output, _DONE if shared is None else _Planned(tasks))
+        except Exception as e:
+            self._put(output, e)
+        finally:
+            for _ in range(self.workers):
+                pending.put(_DONE)
+
+    def _merge_ordered(self, planned):
+        while True:
+            unit = self._get(planned)
+            if unit is _DONE:
+                break
+            if unit.entries is not None:
+                yield unit.entries
+                continue
+            while True:
+                page = self._get(unit.output)
+                if page is _DONE:
+                    break
+                yield page
+
+    def _merge_unordered(self, shared):
+        done = 0
+        tasks = None
+        while tasks is None or done < tasks:
+            page = self._get(shared)
+            if page is _DONE:
+                done += 1
+            elif isinstance(page, _Planned):
+                tasks = page.count
+            else:
+                yield page
+
+    def _get(self, output):
+        page = output.get()
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    def _put(self, output, page):
+        while not self._stop.is_set():
+            try:
+                output.put(page, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _work(self, bucket, pending):
+        while True:
+            unit = pending.get()
+            if unit is _DONE or self._stop.is_set():
+                return
+            try:
+                for page in self.list_unit(bucket, unit):
+                    if not self._put(unit.output, page):
+                        return
+            except Exception as e:
+                self._put(unit.output, e)
+                continue
+            self._put(unit.output, _DONE)
+
+
+def prefetch(pages, depth=2):
+    """
+    fetch the next pages of a page iterator in a background thread while the
+    caller works on the current one, at most depth pages are held ahead
+    :param pages: iterable of pages
+    :param depth: max pages fetched ahead
+    :return: generator of pages
+    """
+    output = queue.Queue(depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            page = output.get()
+            if page is _DONE:
+                break
+            if isinstance(page, Exception):
+                raise page
+            yield page
+    finally:
+        stop.set()
+        thread.join()
+
+
+def ordered_map(func, items, workers=LIST_WORKERS):
+    """
+    call func on every item with a bounded pool of threads and yield the results
+    in item order, each one as soon as it and all before it are done
+    :param func: function of one item
+    :param items: iterable of items
+    :param workers: max concurrent calls
+    :return: generator of results
+    """
+    return _pool_map(func, items, workers, True)
+
+
+def unordered_map(func, items, workers=LIST_WORKERS):
+    """
+    call func on every item with a bounded pool of threads and yield the results
+    as they complete
+    :param func: function of one item
+    :param items: iterable of items
+    :param workers: max concurrent calls
+    :return: generator of results
+    """
+    return _pool_map(func, items, workers, False)
+
+
+def _pool_map(func, items, workers, ordered):
+    """
+    items is read lazily by a feeder thread and at most workers items wait for a
+    free thread, so an endless listing can be fed through. in order every item
+    gets its own result queue, which the caller reads in item order; otherwise
+    all results go to one queue and every worker ends it with _DONE
+    """
+    workers = max(1, workers)
+    stop = threading.Event()
+    pending = queue.Queue(workers)
+    results = queue.Queue(workers * QUEUE_PAGES)
+
+    def put(output, item):
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def feed():
+        try:
+            for item in items:
+                output = queue.Queue(1) if ordered else results
+                if not put(pending, (item, output)) or (ordered and not put(results, output)):
+                    return
+        except BaseException as e:
+            if ordered:
+                output = queue.Queue(1)
+                output.put(e)
+                put(results, output)
+            else:
+                put(results, e)
+        finally:
+            for _ in range(workers):
+                put(pending, _DONE)
+            if ordered:
+                put(results, _DONE)
+
+    def work():
+        try:
+            while not stop.is_set():
+                try:
+                    task = pending.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if task is _DONE:
+                    return
+                item, output = task
+                try:
+                    result = func(item)
+                except BaseException as e:
+                    result = e
+                if not put(output, result):
+                    return
+        finally:
+            if not ordered:
+                put(results, _DONE)
+
+    threads = [threading.Thread(target=feed)] + [threading.Thread(target=work) for _ in range(workers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    try:
+        done = 0
+        while True:
+            result = results.get()
+            if result is _DONE:
+                done += 1
+                if ordered or done == workers:
+                    break
+                continue
+            if ordered:
+                result = result.get()
+            if isinstance(result, BaseException):
+                raise result
+            yield result
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
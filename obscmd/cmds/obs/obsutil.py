@@ -1,17 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
+import fnmatch
+import io
+import itertools
 import json
 import os
+import posixpath
 import threading
 import time
 import math
 
 from obscmd import globl
 from obscmd.constant import STORAGE_CLASS, STORAGE_CLASS_TR, HEADER_PARAMS
-from obscmd.utils import calculate_etag
-from obs import ObsClient, DeleteObjectsRequest, Object, ListMultipartUploadsRequest, CreateBucketHeader, \
-    GetObjectRequest, GetObjectHeader
+from obscmd.utils import calculate_etag, unitstr_to_bytes
+from obs import ObsClient, DeleteObjectsRequest, ListMultipartUploadsRequest, CreateBucketHeader, \
+    GetObjectRequest, GetObjectHeader, RetryPolicy, RetryBudget, Versions
 
+from obs import xmlbackend
+from obs.retry import RETRYABLE_ERROR_CODES
 from obscmd.compat import safe_decode, is_windows
 from obscmd.config import config, MAX_PART_NUM
 from obscmd.exceptions import InternalError
@@ -23,6 +29,9 @@ common obs util functions
 """
 
 LIST_OBJECTS_MAX = 1000
+# seconds a bucket storage class is reused without asking again
+BUCKET_STORAGE_TTL = 60
+_bucket_storage_cache = {}
 
 
 from obscmd.utils import count_time
@@ -68,13 +77,20 @@ class ObsCmdUtil(object):
         check_resp(resp)
 
 
-    def clear_bucket(self, bucket):
-        keys = self.get_objects_info(bucket, None, 'key')
-        self.delete_all_objects(bucket, keys)
+    def iter_clear_bucket(self, bucket):
+        """
+        delete every version and delete marker of the bucket in concurrent batches,
+        abort multipart uploads last. listVersions also lists the current objects,
+        with versionid null when versioning was never enabled, so deleting them one
+        by one first would only add delete markers in a versioned bucket
+        :param bucket: 
+        :return: generator of (deleted, failed) per batch, see delete_batches
+        """
+        for deleted, failed in self.delete_versions(bucket):
+            yield deleted, failed
 
         # abort multipart upload tasks
         self.remove_object_multipart(bucket)
-        return keys
 
     ###############################################
     ########### upload ############################
@@ -132,19 +148,6 @@ class ObsCmdUtil(object):
         check_resp(resp)
         return resp
 
-    @count_time
-    def force_remove_bucket(self, bucket):
-        """
-        batch remove all objects in the bucket firstly, and then 
-        abort multipart upload tasks，remove the empty bucket last
-        :param bucket: 
-        :return: 
-        """
-
-        keys = self.clear_bucket(bucket)
-        self.remove_bucket(bucket)
-        return keys
-
     def get_local_etag(self, filepath, partsize, part_threshold):
         size = os.path.getsize(filepath)
         # for partnum > 10000
@@ -268,48 +271,172 @@ class ObsCmdUtil(object):
         :param prefix: 
         :return: 
         """
-        resp = self.client.listObjects(bucket, prefix=prefix, delimiter='/')
+        resp = self.client.listObjects(bucket, prefix=prefix, delimiter='/', skipOwner=True, compact=True)
         check_resp(resp)
         dirs = [safe_decode(item['prefix']) for item in resp.body.commonPrefixs]
         objects = resp.body.contents
         return dirs, objects
 
     @count_time
-    def list_objects(self, bucket, prefix=None):
+    def list_objects(self, bucket, prefix=None, skip_owner=True, max_keys=None):
         """
         can only list 1000 objects
         :param bucket: 
         :param prefix: 
+        :param skip_owner: do not parse owner fields of each object
+        :param max_keys: max objects returned, 1000 when not set
         :return: 
         """
-        resp = self.client.listObjects(bucket, prefix=prefix)
+        resp = self.client.listObjects(bucket, prefix=prefix, max_keys=max_keys, skipOwner=skip_owner, compact=True)
         check_resp(resp)
         return resp.body.contents
 
-    @count_time
-    def list_all_objects(self, bucket, prefix=None, marker=None):
-        resp = self.client.listObjects(bucket, prefix=prefix, marker=marker)
-        check_resp(resp)
-        items = resp.body.contents
-
-        while resp.body.is_truncated:
-            resp = self.client.listObjects(bucket, prefix=prefix, marker=resp.body.next_marker)
+    def _list_pages(self, bucket, prefix=None, marker=None, skip_owner=True, limit=None):
+        count = 0
+        while True:
+            max_keys = min(LIST_OBJECTS_MAX, limit - count) if limit else None
+            resp = self.client.listObjects(bucket, prefix=prefix, marker=marker, max_keys=max_keys,
+                                           skipOwner=skip_owner, compact=True)
             check_resp(resp)
-            items += resp.body.contents
-        # if resp.body.is_truncated:
-        #     items = items + self.list_all_objects(bucket, prefix=prefix, marker=resp.body.next_marker)
-        return items
+            contents = resp.body.contents
+            if contents:
+                yield contents
+            count += len(contents)
+            if not resp.body.is_truncated or not contents or (limit and count >= limit):
+                break
+            marker = resp.body.next_marker or contents[-1]['key']
+
+    def iter_object_pages(self, bucket, prefix=None, marker=None, skip_owner=True, threads=True, ordered=True,
+                          limit=None):
+        """
+        list objects under prefix page by page in key order. with threads the next
+        pages are fetched in the background, by the parallel lister when listtasknum > 1
+        and the whole prefix is listed. without threads every page is listed in the
+        calling thread when it is asked for, which is what a parent process that forks
+        workers meanwhile needs.
+        :param bucket: 
+        :param prefix: 
+        :param marker: start after this key
+        :param skip_owner: do not parse owner fields of each object
+        :param threads: allow background listing threads
+        :param ordered: keep key order, otherwise parallel pages are yielded as they arrive
+        :param limit: stop after this many objects, the last page only asks for the rest
+        :return: generator of object lists
+        """
+        from obscmd.cmds.obs.listing import ParallelLister, prefetch
+        if threads and marker is None and not limit and get_list_tasknum() > 1:
+            lister = ParallelLister(self.client, workers=get_list_tasknum(), skip_owner=skip_owner)
+            return lister.iter_object_pages(bucket, prefix, ordered)
+        pages = self._list_pages(bucket, prefix, marker, skip_owner, limit)
+        # a limit that fits in one page is not worth a thread
+        if threads and not (limit and limit <= LIST_OBJECTS_MAX):
+            pages = prefetch(pages)
+        return pages
+
+    def iter_version_pages(self, bucket, prefix=None, key_marker=None, version_id_marker=None):
+        """
+        list versions and delete markers page by page with listVersions
+        :param bucket: 
+        :param prefix: 
+        :param key_marker: 
+        :param version_id_marker: 
+        :return: generator of ObjectVersions bodies
+        """
+        while True:
+            versions = Versions(prefix=prefix, key_marker=key_marker, version_id_marker=version_id_marker)
+            resp = self.client.listVersions(bucket, versions)
+            check_resp(resp)
+            yield resp.body
+            head = resp.body.head
+            if not head.isTruncated or not head.nextKeyMarker:
+                break
+            key_marker, version_id_marker = head.nextKeyMarker, head.nextVersionIdMarker
+
+    def iter_versions(self, bucket, prefix=None, threads=True):
+        """
+        stream every version and delete marker under prefix in key order, the next
+        page is fetched in the background while the current one is used
+        :param bucket: 
+        :param prefix: 
+        :param threads: allow the background listing thread
+        :return: generator of (key, versionid)
+        """
+        from obscmd.cmds.obs.listing import prefetch
+        pages = self.iter_version_pages(bucket, prefix)
+        for body in prefetch(pages) if threads else pages:
+            # the response lists versions and delete markers apart, stable sort keeps the order per key
+            for item in sorted(list(body.versions) + list(body.markers), key=lambda item: item.key):
+                yield item.key, item.versionId
+
+    def iter_objects_info(self, bucket, prefix=None, topics=None, limit=None, threads=True, match=None):
+        """
+        same values as get_objects_info, yielded page by page as the listing goes on.
+        without match the limit is passed down as max_keys, so no more objects than
+        limit are listed; with match the listing stops after limit matching objects
+        :param bucket: bucket name
+        :param prefix: 
+        :param topics: info topic or tuple of topics
+        :param limit: max objects
+        :param threads: allow background listing threads, see iter_object_pages
+        :param match: only objects whose key passes match(key) are yielded and counted
+        :return: generator of values or tuples
+        """
+        single = False if isinstance(topics, (list, tuple)) else True
+        skip_owner = topics != 'owner' if single else 'owner' not in topics
+        pages = self.iter_object_pages(bucket, prefix, skip_owner=skip_owner, threads=threads,
+                                       limit=limit if match is None else None)
+
+        count = 0
+        for page in pages:
+            if match is not None:
+                page = [item for item in page if match(safe_decode(item['key']))]
+            if limit and count + len(page) > limit:
+                page = page[:limit - count]
+            count += len(page)
+            if single:
+                for item in page:
+                    yield safe_decode(item[topics])
+            else:
+                for item in page:
+                    yield tuple(safe_decode(item[topic]) for topic in topics)
+            if limit and count >= limit:
+                break
+
+    def iter_snapshot_info(self, bucket, prefix=None, topics=None, limit=None, mode='reuse'):
+        """
+        same values as iter_objects_info, answered from the local listing snapshot.
+        with mode reuse a complete snapshot of prefix or of a shorter prefix is used as
+        it is, otherwise the snapshot of prefix is refreshed first, see snapshot.MODES
+        :param bucket: bucket name
+        :param prefix: 
+        :param topics: info topic or tuple of topics, owner is not kept in snapshots
+        :param limit: max objects
+        :param mode: reuse, append or full
+        :return: generator of values or tuples
+        """
+        from obscmd.cmds.obs.snapshot import open_snapshot_store, REUSE
+        store = open_snapshot_store()
+        try:
+            snapshot_prefix = store.find(bucket, prefix) if mode == REUSE else None
+            if snapshot_prefix is None:
+                store.sync(self, bucket, prefix, mode)
+                snapshot_prefix = prefix or ''
+            for info in store.query(bucket, prefix, topics, limit=limit, snapshot_prefix=snapshot_prefix):
+                yield info
+        finally:
+            store.close()
 
     def get_objects_info(self, bucket, prefix=None, topics=None, limit=None):
         """
         list obs objects information
         :param bucket: bucket name
-        :param topics: info topic, choices are [etag, key, lastModified, owner, size, storageClass]
+        :param topics: info topic, choices are [etag, key, lastModified, mtime, owner, size, storageClass]
         
         values are like following:
         etag: "d7deee6cced029b4ca652a59c768538e-2"
         key: 'test.txt'
         lastModified: '2018/08/02 17:45:55'
+        mtime: 1533203155
         owner: {'owner_name': 'jiaowoxiaoming', 'owner_id': '8be8301bdfc7469aaf721d0504826420'}
         size: 15668606
         storageClass: 'STANDARD'
@@ -320,43 +447,16 @@ class ObsCmdUtil(object):
         ret value: ['doc/test1.txt', 'doc/test2.txt']
         
         get_objects_info('mybucket', 'doc', ('key', 'size'), 2)
-        ret value: [['doc/test1.txt', 123125], ['doc/test2.txt', 4352345], ]
+        ret value: [('doc/test1.txt', 123125), ('doc/test2.txt', 4352345), ]
         :return: 
         """
-
-        single = False if isinstance(topics, (list, tuple)) else True
-        if limit and limit <= LIST_OBJECTS_MAX:
-            items = self.list_objects(bucket, prefix)
-        else:
-            items = self.list_all_objects(bucket, prefix)
-
-        if limit:
-            items = items[:limit]
-        infos = []
-        if single:
-            infos = [safe_decode(item[topics]) for item in items]
-        else:
-            for item in items:
-                info = [safe_decode(item[topic]) for topic in topics]
-                infos.append(info)
-
-        return infos
+        return list(self.iter_objects_info(bucket, prefix, topics, limit))
 
     @count_time
     def put_file(self, bucket, objkey, filepath, metadata=None):
-        times = 0
-        retry_times = 3
-        while times < retry_times:
-            try:
-                resp = self.client.putFile(bucket, objkey, filepath, metadata)
-                check_resp(resp)
-            except Exception as e:
-                times += 1
-                if times == retry_times:
-                    raise e
-                time.sleep(.001)
-            else:
-                return resp
+        resp = self.client.putFile(bucket, objkey, filepath, metadata)
+        check_resp(resp)
+        return resp
 
     @count_time
     def put_content(self, bucket, objkey, content=None):
@@ -392,25 +492,78 @@ class ObsCmdUtil(object):
         else:
             self.download_file(bucket, key, filepath)
 
-    def delete_all_objects(self, bucket, keys):
+    def delete_batches(self, bucket, keys, tasknum=None):
         """
-        delete all object for several times batch delete
+        delete keys in batches of 1000 with concurrent deleteObjects requests,
+        keys are read lazily so a listing can be deleted while it goes on.
+        keys the server reports as not deleted are retried, see delete_batch
         :param bucket: 
-        :param keys: 
-        :return: 
+        :param keys: iterable of keys or (key, versionid)
+        :param tasknum: concurrent requests, [task] deletetasknum when not set
+        :return: generator of (deleted, failed) per batch, in completion order
         """
-        num = len(keys)
-        if num <= LIST_OBJECTS_MAX:
-            return self.batch_delete_objects(bucket, keys)
+        from obscmd.cmds.obs.listing import unordered_map
 
-        times = int(num / LIST_OBJECTS_MAX)
-        for i in range(times):
-            start = i * LIST_OBJECTS_MAX
-            resp = self.batch_delete_objects(bucket, keys[start:start+LIST_OBJECTS_MAX])
-            check_resp(resp)
-        if times * LIST_OBJECTS_MAX < num:
-            resp = self.batch_delete_objects(bucket, keys[times * LIST_OBJECTS_MAX:])
-            check_resp(resp)
+        def delete(batch):
+            return self.delete_batch(bucket, batch)
+        return unordered_map(delete, iter_batches(keys, LIST_OBJECTS_MAX), tasknum or get_delete_tasknum())
+
+    def delete_batch(self, bucket, batch, policy=None):
+        """
+        delete one batch with quiet deleteObjects, the keys the response reports
+        with a retryable error code are sent again with backoff until the retry
+        policy gives up, keys with other errors fail right away
+        :param bucket: 
+        :param batch: keys or (key, versionid), at most 1000
+        :param policy: RetryPolicy, the client's when not set
+        :return: (deleted, failed), failed is a list of (key or (key, versionid), error code, error message)
+        """
+        policy = policy or self.client.retry_policy
+        items = {}
+        for item in batch:
+            key, version = item if isinstance(item, tuple) else (item, None)
+            items[(key, version)] = item
+            items.setdefault((key, None), item)
+
+        pending = list(batch)
+        failed = []
+        attempt = 0
+        while pending:
+            resp = self.batch_delete_objects(bucket, pending)
+            errors = resp.body.error if resp.body else None
+            if not errors:
+                break
+            retry = []
+            for error in errors:
+                item = items.get((error.key, error.versionId)) or items.get((error.key, None)) or error.key
+                (retry if error.code in RETRYABLE_ERROR_CODES else failed).append((item, error.code, error.message))
+            if not retry:
+                break
+            if not policy.should_retry(attempt):
+                failed.extend(retry)
+                break
+            policy.sleep(attempt)
+            attempt += 1
+            pending = [item for item, _, _ in retry]
+
+        failed_items = set(item for item, _, _ in failed)
+        return [item for item in batch if item not in failed_items], failed
+
+    def delete_versions(self, bucket, prefix=None, key=None, tasknum=None):
+        """
+        delete every version and delete marker under prefix, or of key only
+        :param bucket: 
+        :param prefix: 
+        :param key: only versions of this key
+        :param tasknum: concurrent requests
+        :return: generator of (deleted, failed) per batch, see delete_batches
+        """
+        if key is None:
+            return self.delete_batches(bucket, self.iter_versions(bucket, prefix), tasknum)
+        # versions come in key order, so paging stops at the first key after key
+        versions = itertools.takewhile(lambda version: version[0] <= key,
+                                       self.iter_versions(bucket, key, threads=False))
+        return self.delete_batches(bucket, (version for version in versions if version[0] == key), tasknum)
 
     @count_time
     def batch_delete_objects(self, bucket, keys):
@@ -422,8 +575,7 @@ class ObsCmdUtil(object):
         """
         if len(keys) == 0:
             return 0
-        delete_objects_request = DeleteObjectsRequest()
-        delete_objects_request.objects = [Object(key=key) for key in keys]
+        delete_objects_request = DeleteObjectsRequest(quiet=True, objects=keys)
         resp = self.client.deleteObjects(bucket, deleteObjectsRequest=delete_objects_request)
         check_resp(resp)
         # for key in keys:
@@ -445,12 +597,54 @@ class ObsCmdUtil(object):
 
     @count_time
     def get_bucket_storage(self, bucket):
+        cached = _bucket_storage_cache.get(bucket)
+        if cached is not None and time.time() - cached[1] < BUCKET_STORAGE_TTL:
+            return cached[0]
         resp = self.client.getBucketMetadata(bucket)
         try:
             check_resp(resp)
         except:
             return STORAGE_CLASS[0]
-        return STORAGE_CLASS_TR[resp.body.storageClass]
+        storage = STORAGE_CLASS_TR[resp.body.storageClass]
+        _bucket_storage_cache[bucket] = (storage, time.time())
+        return storage
+
+    def iter_bucket_storages(self, buckets, tasknum=None):
+        """
+        get storage class of many buckets concurrently
+        :param buckets: bucket names
+        :param tasknum: concurrent getBucketMetadata requests, [task] metatasknum when not set
+        :return: generator of storage classes in bucket order
+        """
+        from obscmd.cmds.obs.listing import ordered_map
+        return ordered_map(self.get_bucket_storage, buckets, tasknum or get_meta_tasknum())
+
+
+class PeekIterator(object):
+    """
+    iterator with a queue-like empty()/get() interface, the next item is pulled
+    from the source only when empty() is asked
+    """
+    _NONE = object()
+
+    def __init__(self, items):
+        self._items = iter(items)
+        self._next = self._NONE
+
+    def empty(self):
+        if self._next is self._NONE:
+            self._next = next(self._items, self._NONE)
+        return self._next is self._NONE
+
+    def get(self):
+        if self.empty():
+            raise IndexError('get from an exhausted iterator')
+        item, self._next = self._next, self._NONE
+        return item
+
+    def __iter__(self):
+        while not self.empty():
+            yield self.get()
 
 
 def multitask_with_sleep(process, func, func_arg, items, tasknum, flowwith=None):
@@ -458,16 +652,13 @@ def multitask_with_sleep(process, func, func_arg, items, tasknum, flowwith=None)
     multitasks for uploading and downloading with progressbar
     :param func: function for task dispatching
     :param func_arg: func arguments
-    :param items: items for tasks to dispatch
+    :param items: items for tasks to dispatch, any iterable, taken one by one when a task starts
     :param tasknum: max tasks for parallel
     :param flowwith: max flow width
     :param flowtime: the time for statistic 
     :return: 
     """
-    from obscmd.compat import queue
-    qitems = queue.Queue()
-    for item in items:
-        qitems.put(item)
+    qitems = PeekIterator(items)
 
     pid = os.getpid()
     procs = []
@@ -552,13 +743,177 @@ def multithreading_with_sleep(func, func_arg, items, tasknum, flowwith=None):
     multitask_with_sleep(Process, func, func_arg, items, tasknum, flowwith)
 
 
-def create_client(ak=None, sk=None, server=None):
+def create_retry_policy():
+    """
+    build the retry policy shared by all requests of one obscmd job, the budget is
+    in shared memory so the forked worker processes spend from it too
+    :return: 
+    """
+    max_retry_count = int(config.client.get('max_retry_count', 3))
+    budget = RetryBudget(max_tokens=int(config.client.get('retry_budget', 100)), shared=True)
+    return RetryPolicy(max_retry_count=max_retry_count, budget=budget)
+
+
+_retry_policy = None
+
+
+def get_retry_policy():
+    """
+    the retry policy of this obscmd job, built on first use so every client of the
+    job and the worker processes forked from it spend from one budget
+    :return: 
+    """
+    global _retry_policy
+    if _retry_policy is None:
+        _retry_policy = create_retry_policy()
+    return _retry_policy
+
+
+def iter_batches(items, size):
+    """
+    group an iterable into lists of at most size items
+    :param items: 
+    :param size: 
+    :return: 
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def filter_patterns(path, pattern_prefix, exclude_pattern, include_pattern, obs_key=False):
+    """
+    filter file name pattern like *.jpg, [a-z].jpg, ?pg, doc*
+    include pattern priority higher than exclude pattern
+    :param path: local or obs file path
+    :param pattern_prefix: pattern prefix
+    :param exclude_pattern: exclude pattern
+    :param include_pattern: include pattern
+    :param obs_key: path is an object key, matched case sensitively with / separators on every
+    platform, like the listing prefix pattern_list_prefix narrows to
+    :return: True when path is filtered out
+    """
+    join, match = (posixpath.join, fnmatch.fnmatchcase) if obs_key else (os.path.join, fnmatch.fnmatch)
+    isfilter = False
+    if exclude_pattern:
+        full_exclude_pattern = join(pattern_prefix, exclude_pattern)
+        if match(path, full_exclude_pattern):
+            isfilter = True
+    if include_pattern:
+        full_include_pattern = join(pattern_prefix, include_pattern)
+        if match(path, full_include_pattern):
+            isfilter = False
+    return isfilter
+
+
+def pattern_list_prefix(key, exclude_pattern, include_pattern):
+    """
+    when everything is excluded but the include pattern, only keys under the
+    literal start of the include pattern can pass, so list from there
+    :param key: prefix key
+    :param exclude_pattern: exclude pattern
+    :param include_pattern: include pattern
+    :return: prefix to list
+    """
+    if exclude_pattern != '*' or not include_pattern:
+        return key
+    literal = glob_literal_prefix(include_pattern)
+    if not literal:
+        return key
+    return key + literal if not key or key.endswith('/') else key + '/' + literal
+
+
+def read_keys(keys_file):
+    """
+    stream the object keys of a file, one key per line
+    :param keys_file: 
+    :return: generator of keys
+    """
+    with io.open(keys_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            key = line.rstrip('\r\n')
+            if key:
+                yield key
+
+
+def glob_literal_prefix(pattern):
+    """
+    the part of a glob pattern before its first wildcard, every key the pattern
+    matches starts with it
+    :param pattern: glob like logs/2024-*
+    :return: literal prefix like logs/2024-
+    """
+    for i, char in enumerate(pattern):
+        if char in '*?[':
+            return pattern[:i]
+    return pattern
+
+
+def get_list_tasknum():
+    """
+    number of concurrent listObjects requests used to list a large prefix
+    :return: 
+    """
+    return int(config.task.get('listtasknum') or 8)
+
+
+def get_delete_tasknum():
+    """
+    number of concurrent deleteObjects requests of a recursive delete
+    :return: 
+    """
+    return int(config.task.get('deletetasknum') or 8)
+
+
+def get_meta_tasknum():
+    """
+    number of concurrent per-bucket metadata requests, used when listing buckets
+    :return: 
+    """
+    return int(config.task.get('metatasknum') or 8)
+
+
+def get_network_tuning():
+    """
+    socket buffer size, bandwidth(bytes/s) and rtt(seconds) from config, 0 or empty means not set
+    :return: 
+    """
+    socket_buffer_size = unitstr_to_bytes(config.client.get('socket_buffer_size') or '0') or None
+    bandwidth = unitstr_to_bytes(config.client.get('bandwidth') or '0') or None
+    rtt = float(config.client.get('rtt') or 0) / 1000 or None
+    return socket_buffer_size, bandwidth, rtt
+
+
+def configure_xml_backend():
+    """
+    select the response xml parser from config, lxml is used only if it is installed
+    :return: 
+    """
+    backend = config.client.get('xml_backend') or xmlbackend.STDLIB
+    if backend not in xmlbackend.available_backends():
+        backend = xmlbackend.STDLIB
+    xmlbackend.use_backend(backend)
+
+
+def create_client(ak=None, sk=None, server=None, retry_policy=None):
     is_secure = False if config.client.secure == 'HTTP' else True
+    socket_buffer_size, bandwidth, rtt = get_network_tuning()
+    configure_xml_backend()
     return ObsClient(
         access_key_id=ak,
         secret_access_key=sk,
         server=server,
         is_secure=is_secure,
+        retry_policy=retry_policy or get_retry_policy(),
+        socket_buffer_size=socket_buffer_size,
+        bandwidth=bandwidth,
+        rtt=rtt,
+        expect_continue_threshold=unitstr_to_bytes(config.client.get('expect_continue_threshold') or '0') or None,
     )
 
 
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import os
+import time
+
+from obscmd import compat
+from obscmd.compat import safe_decode
+from obscmd.exceptions import NotSupportError
+
+SNAPSHOT_FILE = 'listing.db'
+# reuse a complete snapshot as it is, list only when there is none
+REUSE = 'reuse'
+# list again from the last partition (the last "dir" of the newest key) onwards
+APPEND = 'append'
+# drop the snapshot and list everything again
+FULL = 'full'
+MODES = (REUSE, APPEND, FULL)
+
+# listing topic -> snapshot column
+COLUMNS = {'key': 'key', 'mtime': 'mtime', 'etag': 'etag', 'size': 'size', 'storageClass': 'storage_class'}
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS snapshots (bucket TEXT, prefix TEXT, updated REAL, complete INTEGER, '
+    'last_key TEXT, PRIMARY KEY (bucket, prefix))',
+    'CREATE TABLE IF NOT EXISTS objects (bucket TEXT, prefix TEXT, key TEXT, mtime INTEGER, etag TEXT, '
+    'size INTEGER, storage_class TEXT, PRIMARY KEY (bucket, prefix, key))',
+)
+
+
+def prefix_upper(prefix):
+    """
+    smallest string greater than every string starting with prefix
+    :param prefix:
+    :return: None when there is no upper bound
+    """
+    while prefix:
+        if ord(prefix[-1]) < 0x10ffff:
+            return prefix[:-1] + compat.six.unichr(ord(prefix[-1]) + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class SnapshotStore(object):
+    """
+    listing results of (bucket, prefix) kept in a local sqlite database.
+    a sync writes one page per transaction and checkpoints the last key, so an
+    interrupted listing goes on from there next time. queries are answered from
+    the local copy in key order without listing again.
+    """
+
+    def __init__(self, path):
+        if compat.sqlite3 is None:
+            raise NotSupportError(**{'msg': 'listing snapshot without sqlite3'})
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        self.path = path
+        self.conn = compat.sqlite3.connect(path)
+        self.conn.text_factory = compat.six.text_type
+        for statement in _SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, bucket, prefix):
+        """
+        :param bucket:
+        :param prefix:
+        :return: (updated, complete, last_key) or None
+        """
+        return self.conn.execute('SELECT updated, complete, last_key FROM snapshots WHERE bucket=? AND prefix=?',
+                                 (bucket, prefix or '')).fetchone()
+
+    def find(self, bucket, prefix):
+        """
+        the longest complete snapshot prefix that covers prefix
+        :param bucket:
+        :param prefix:
+        :return: snapshot prefix or None
+        """
+        prefix = prefix or ''
+        rows = self.conn.execute('SELECT prefix FROM snapshots WHERE bucket=? AND complete=1', (bucket,)).fetchall()
+        covering = [row[0] for row in rows if prefix.startswith(row[0])]
+        return max(covering, key=len) if covering else None
+
+    def drop(self, bucket, prefix):
+        prefix = prefix or ''
+        self.conn.execute('DELETE FROM objects WHERE bucket=? AND prefix=?', (bucket, prefix))
+        self.conn.execute('DELETE FROM snapshots WHERE bucket=? AND prefix=?', (bucket, prefix))
+        self.conn.commit()
+
+    def refresh_marker(self, bucket, prefix, last_key):
+        """
+        keys from the last partition of a complete snapshot on are listed again, new
+        date partitions sort after the old ones so they are all picked up. the rows
+        from there on are removed and the key before them is returned as marker
+        :param bucket:
+        :param prefix:
+        :param last_key: newest key of the snapshot
+        :return: marker to list after, None when everything has to be listed
+        """
+        slash = last_key.rfind('/')
+        start = last_key[:slash + 1] if slash >= len(prefix) else last_key
+        row = self.conn.execute('SELECT MAX(key) FROM objects WHERE bucket=? AND prefix=? AND key<?',
+                                (bucket, prefix, start)).fetchone()
+        self.conn.execute('DELETE FROM objects WHERE bucket=? AND prefix=? AND key>=?', (bucket, prefix, start))
+        return row[0] if row else None
+
+    def sync(self, util, bucket, prefix=None, mode=REUSE):
+        """
+        bring the snapshot of (bucket, prefix) up to date
+        :param util: ObsCmdUtil used to list
+        :param bucket:
+        :param prefix:
+        :param mode: reuse, append or full
+        :return: number of objects listed
+        """
+        prefix = prefix or ''
+        if mode == FULL:
+            self.drop(bucket, prefix)
+        state = self.get(bucket, prefix)
+        marker = None
+        if state is not None:
+            updated, complete, last_key = state
+            if complete and mode == REUSE:
+                return 0
+            if not complete:
+                marker = last_key
+            elif last_key:
+                marker = self.refresh_marker(bucket, prefix, last_key)
+                if marker is None:
+                    self.drop(bucket, prefix)
+        self.conn.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, 0, ?)', (bucket, prefix, time.time(), marker))
+        self.conn.commit()
+
+        count = 0
+        for page in util.iter_object_pages(bucket, prefix or None, marker):
+            rows = [(bucket, prefix, safe_decode(item['key']), item['mtime'], item['etag'], item['size'],
+                     item['storageClass']) for item in page]
+            self.conn.executemany('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            self.conn.execute('UPDATE snapshots SET last_key=? WHERE bucket=? AND prefix=?', (rows[-1][2], bucket, prefix))
+            self.conn.commit()
+            count += len(rows)
+        self.conn.execute('UPDATE snapshots SET complete=1, updated=? WHERE bucket=? AND prefix=?',
+                          (time.time(), bucket, prefix))
+        self.conn.commit()
+        return count
+
+    def query(self, bucket, prefix=None, topics='key', start_after=None, limit=None, snapshot_prefix=None):
+        """
+        objects under prefix from the snapshot, in key order
+        :param bucket:
+        :param prefix:
+        :param topics: topic or tuple of topics, see COLUMNS
+        :param start_after: only keys after this one
+        :param limit: max objects
+        :param snapshot_prefix: snapshot to read, the one covering prefix when not set
+        :return: generator of values or tuples like ObsCmdUtil.get_objects_info
+        """
+        prefix = prefix or ''
+        single = not isinstance(topics, (list, tuple))
+        columns = ', '.join(COLUMNS[topic] for topic in ((topics,) if single else topics))
+        if snapshot_prefix is None:
+            snapshot_prefix = self.find(bucket, prefix) or ''
+        sql = 'SELECT %s FROM objects WHERE bucket=? AND prefix=? AND key>=?' % columns
+        args = [bucket, snapshot_prefix, prefix]
+        upper = prefix_upper(prefix)
+        if upper is not None:
+            sql += ' AND key<?'
+            args.append(upper)
+        if start_after is not None:
+            sql += ' AND key>?'
+            args.append(start_after)
+        sql += ' ORDER BY key'
+        if limit:
+            sql += ' LIMIT %d' % int(limit)
+        for row in self.conn.execute(sql, args):
+            yield row[0] if single else tuple(row)
+
+
+def open_snapshot_store():
+    from obscmd.config import SNAPSHOT_DIR
+    return SnapshotStore(os.path.join(SNAPSHOT_DIR, SNAPSHOT_FILE))
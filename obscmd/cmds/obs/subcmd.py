@@ -3,7 +3,7 @@
 
 from obscmd.cmds.commands import BasicCommand
 
-from obscmd.cmds.obs.obsutil import create_client
+from obscmd.cmds.obs.obsutil import create_client, get_retry_policy
 from obscmd.compat import compat_input
 
 
@@ -13,7 +13,7 @@ class SubObsCommand(BasicCommand):
     client = None
 
     def _create_client(self, ak=None, sk=None, server=None):
-        self.client = create_client(ak, sk, server)
+        self.client = create_client(ak, sk, server, get_retry_policy())
 
     def _run_main(self, parsed_args, parsed_globals):
         ak = parsed_args.ak if parsed_args.ak else self.session.config.client.access_key_id
@@ -3,13 +3,13 @@
 import json
 import os
 import time
-import fnmatch
 
 from obs import GetObjectHeader
 from tqdm import tqdm
 
 from obscmd.cmds.obs.obsutil import multiprocess_with_sleep, split_bucket_key, check_resp, join_bucket_key, ObsCmdUtil, \
-    get_object_name, get_object_key, join_obs_path, pbar_add_size, pbar_get_size, reset_partsize
+    get_object_name, get_object_key, join_obs_path, pbar_add_size, pbar_get_size, reset_partsize, PeekIterator, \
+    filter_patterns, pattern_list_prefix
 from obscmd.cmds.obs.subcmd import SubObsCommand
 from obscmd.cmds.obs.transfer import UploadOperation, DownloadOperation, CopyOperation
 from obscmd.constant import PUTFILE_MAX_SIZE
@@ -26,21 +26,26 @@ def progressbar(total, alive, desc=None):
     """
     progressbar for single file uploading, downloading, copying
     :param cpfilepath: checkpoint file
-    :param total: file size
+    :param total: file size, or a shared Value that keeps growing while the files are still being listed
     :param alive: 0-init state; 1-task complete; 2-task failed
     :param desc: 
     :return: 
     """
-    with tqdm(total=total, unit="B", unit_scale=True, mininterval=BAR_MININTERVAL, miniters=BAR_MINITERS, desc=desc,
+    dynamic = hasattr(total, 'value')
+    current = total.value if dynamic else total
+    with tqdm(total=current, unit="B", unit_scale=True, mininterval=BAR_MININTERVAL, miniters=BAR_MINITERS, desc=desc,
               unit_divisor=1024, ncols=BAR_NCOLS, postfix={'td': 0, 'tps': 0}) as pbar:
         size = 0
         tmp_latency = '0ms'
         tmp_tps = '0'
-        while size < total:
+        while dynamic or size < current:
+            if dynamic and total.value != current:
+                current = total.value
+                pbar.total = current
             size = pbar_get_size()
-            size = size if size < total else total
+            size = size if size < current else current
             updata = size - pbar.n
-            updata = check_value_threshold(updata, 0, total)
+            updata = check_value_threshold(updata, 0, current)
 
             pbar.set_description(desc)
             pbar.update(updata)
@@ -51,7 +56,7 @@ def progressbar(total, alive, desc=None):
 
             if alive.value > 0:
                 if alive.value == 1 and not globl.get_value('force_exit').value:
-                    pbar.update(total - pbar.n)
+                    pbar.update(current - pbar.n)
                 break
             time.sleep(BAR_SLEEP_FOR_UPDATE)
 
@@ -94,7 +99,7 @@ class CpCommand(SubObsCommand):
     DESCRIPTION = "Copies a local file or obs object to another location " \
                   "locally or in obs."
     USAGE = "cp <LocalPath> <ObsPath> or <ObsPath> <LocalPath> " \
-            "or <ObsPath> <ObsPath> [--md5] [--recursive] [--update] [--exclude] [--include] [--tasknum]"
+            "or <ObsPath> <ObsPath> [--md5] [--recursive] [--update] [--snapshot] [--exclude] [--include] [--tasknum]"
     ARG_TABLE = [
         {'name': 'srcpath', 'positional_arg': True,
          'help_text': USAGE},
@@ -109,6 +114,10 @@ class CpCommand(SubObsCommand):
         {'name': 'update', 'action': 'store_true',
          'help_text': (
              "upload the modified and new files in local dictionary")},
+        {'name': 'snapshot', 'choices': ['reuse', 'append', 'full'],
+         'help_text': (
+             "with --update, compare with the local listing snapshot of the obs prefix. reuse a saved "
+             "snapshot, append the keys after its last partition, or full refresh it")},
         {'name': 'include',
          'help_text': (
              "Don't exclude files or objects in the command that match the specified pattern")},
@@ -262,8 +271,11 @@ class CpCommand(SubObsCommand):
         self.md5 = parsed_args.md5
         self.recursive = parsed_args.recursive
         self.update = parsed_args.update
+        self.snapshot = parsed_args.snapshot
         self.include = parsed_args.include
         self.exclude = parsed_args.exclude
+        if self.snapshot and not self.update:
+            raise NotSupportError(**{'msg': 'snapshot option without update option'})
 
         # read from configure file
         self.tasknum = int(parsed_args.tasknum) if parsed_args.tasknum else int(self.session.config.task.tasknum)
@@ -545,17 +557,21 @@ class CpCommand(SubObsCommand):
     def _download_dir(self, bucket, key):
 
         key = key.strip('/') + '/' if key else key
-        obsfile_infos = self._list_filter_obsfiles(bucket, key, self.exclude, self.include)
-        obskeys = [info[0] for info in obsfile_infos if not info[0].endswith('/')]
-
-        self.make_local_dirs([info[0] for info in obsfile_infos if info[0].endswith('/')])
-
-        if len(obskeys) == 0:
+        total = compat.Value('d', 0)
+
+        def iter_obskeys():
+            for info in self._iter_filter_obsfiles(bucket, key, self.exclude, self.include):
+                total.value += info[-1]
+                if info[0].endswith('/'):
+                    self.make_local_dirs([info[0]])
+                else:
+                    yield info[0]
+
+        obskeys = PeekIterator(iter_obskeys())
+        if obskeys.empty():
             self._outprint('No files to %s.' % self.cmdtype)
             return 0
 
-        total = sum([info[-1] for info in obsfile_infos])
-
         alive = compat.Value('i', 0)
         lock = compat.Lock()
         oklist = compat.List()
@@ -648,20 +664,20 @@ class CpCommand(SubObsCommand):
         srck = srck if not srck or srck.endswith('/') else srck + '/'
         destb, destk = split_bucket_key(destdir)
         destk = destk if not destk or destk.endswith('/') else destk + '/'
-        obsfile_infos = self._list_filter_obsfiles(srcb, srck, self.exclude, self.include)
+        total = compat.Value('d', 0)
 
-        src_dest_obsfiles = []
-        for info in obsfile_infos:
-            key = info[0]
-            tmp_destk = destk + key[len(srck):] if srck else destk + key
-            src_dest_obsfiles.append((join_bucket_key(srcb, key), join_bucket_key(destb, tmp_destk)))
+        def iter_src_dest_obsfiles():
+            for info in self._iter_filter_obsfiles(srcb, srck, self.exclude, self.include):
+                key = info[0]
+                total.value += info[-1]
+                tmp_destk = destk + key[len(srck):] if srck else destk + key
+                yield join_bucket_key(srcb, key), join_bucket_key(destb, tmp_destk)
 
-        if len(src_dest_obsfiles) == 0:
+        src_dest_obsfiles = PeekIterator(iter_src_dest_obsfiles())
+        if src_dest_obsfiles.empty():
             self._outprint('No files to %s.' % self.cmdtype)
             return 0
 
-        total = sum([info[-1] for info in obsfile_infos])
-
         alive = compat.Value('i', 0)
         lock = compat.Lock()
         oklist = compat.List()
@@ -710,35 +726,42 @@ class CpCommand(SubObsCommand):
         :param include_pattern: include pattern
         :return: bool
         """
-        isfilter = False
-        if exclude_pattern:
-            full_exclude_pattern = os.path.join(pattern_prefix, exclude_pattern)
-            if fnmatch.fnmatch(filepath, full_exclude_pattern):
-                isfilter = True
-        if include_pattern:
-            full_include_pattern = os.path.join(pattern_prefix, include_pattern)
-            if fnmatch.fnmatch(filepath, full_include_pattern):
-                isfilter = False
-        return isfilter
-
-    def _list_filter_obsfiles(self, bucket, key, exclude, include):
-        obsfile_infos = self._list_obsfiles(bucket, key)
-        return [info for info in obsfile_infos if not self._filter_patterns(info[0], key, exclude, include)]
+        return filter_patterns(filepath, pattern_prefix, exclude_pattern, include_pattern)
+
+    def _iter_filter_obsfiles(self, bucket, key, exclude, include):
+        """
+        stream (key, mtime, size) of obsfiles that pass the patterns, page by page.
+        worker processes are forked while this listing runs, so on posix it stays
+        in the calling thread instead of using listing threads
+        :param bucket: bucket name 
+        :param key: prefix key
+        :param exclude: exclude pattern
+        :param include: include pattern
+        :return: generator of (key, mtime, size)
+        """
+        def match(obskey):
+            return not filter_patterns(obskey, key, exclude, include, obs_key=True)
+
+        prefix = pattern_list_prefix(key, exclude, include)
+        return self.obs_cmd_util.iter_objects_info(bucket, prefix, ('key', 'mtime', 'size'),
+                                                   threads=compat.is_windows, match=match)
 
     def _list_obsfiles(self, bucket, key):
         """
         list obsfiles 
         :param bucket: bucket name 
         :param key: prefix key
-        :return: list((key, lastModified, size),)
+        :return: list((key, mtime, size),)
         """
-        return self.obs_cmd_util.get_objects_info(bucket, key, ('key', 'lastModified', 'size'))
+        if self.snapshot:
+            return list(self.obs_cmd_util.iter_snapshot_info(bucket, key, ('key', 'mtime', 'size'), mode=self.snapshot))
+        return self.obs_cmd_util.get_objects_info(bucket, key, ('key', 'mtime', 'size'))
 
     def localfiles_for_update(self, localfiles, obsfiles):
         """
         compare the last modified time of localfile and obsfile which has the same prefix key
         :param localfiles: filepath, key
-        :param obsfiles: key, lastModifiedTime, size
+        :param obsfiles: key, mtime, size
         :return: list((filepath, key),)
         """
         upload_local_files = []
@@ -752,9 +775,7 @@ class CpCommand(SubObsCommand):
             fullkey = fullkey.strip('/')
             if fullkey in obs_dict.keys():
                 localfile_timestamp = os.path.getmtime(filepath)
-                obsfile_timestamp = time.mktime(time.strptime(obs_dict[fullkey], "%Y/%m/%d %H:%M:%S"))
-
-                if localfile_timestamp > obsfile_timestamp:
+                if localfile_timestamp > obs_dict[fullkey]:
                     upload_local_files.append(localfile)
             else:
                 upload_local_files.append(localfile)
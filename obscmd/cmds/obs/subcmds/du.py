@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+from obscmd.cmds.obs.obsutil import split_bucket_key, join_bucket_key, ObsCmdUtil
+from obscmd.cmds.obs.subcmd import SubObsCommand
+from obscmd.compat import safe_decode
+from obscmd.utils import bytes_to_unitstr
+
+
+class PrefixUsage(object):
+    """
+    size and object count of every sub prefix of prefix down to depth levels,
+    one node per sub prefix is kept no matter how many objects are added
+    """
+
+    def __init__(self, prefix='', depth=1):
+        self.prefix = prefix
+        self.depth = depth
+        self.size = 0
+        self.count = 0
+        self.nodes = {}
+
+    def add(self, key, size):
+        self.size += size
+        self.count += 1
+        end = len(self.prefix)
+        for _ in range(self.depth):
+            end = key.find('/', end) + 1
+            if not end:
+                break
+            node = self.nodes.get(key[:end])
+            if node is None:
+                node = self.nodes[key[:end]] = [0, 0]
+            node[0] += size
+            node[1] += 1
+
+    def add_page(self, page):
+        for item in page:
+            self.add(safe_decode(item['key']), item['size'] or 0)
+
+    def summary(self, sort='name'):
+        """
+        :param sort: name, size or count, size and count are largest first
+        :return: list of (prefix, size, count)
+        """
+        rows = [(prefix, node[0], node[1]) for prefix, node in self.nodes.items()]
+        if sort == 'size':
+            rows.sort(key=lambda row: (-row[1], row[0]))
+        elif sort == 'count':
+            rows.sort(key=lambda row: (-row[2], row[0]))
+        else:
+            rows.sort()
+        return rows
+
+
+class DuCommand(SubObsCommand):
+    NAME = 'du'
+    DESCRIPTION = "Show the size and object number of every sub prefix under a prefix."
+    USAGE = "du <ObsUri> [--depth] [--sort]"
+    ARG_TABLE = [
+        {'name': 'paths', 'positional_arg': True, 'synopsis': USAGE},
+        {'name': 'depth', 'cli_type_name': 'integer', 'default': 1,
+         'help_text': "levels of sub prefixes to show, 0 shows only the total"},
+        {'name': 'sort', 'choices': ['name', 'size', 'count'], 'default': 'name',
+         'help_text': "order of the sub prefixes, size and count show the largest first"},
+    ]
+
+    EXAMPLES = """
+        The following du command shows the size of every sub prefix under doc/.
+
+          obscmd obs du obs://mybucket/doc --depth 2 --sort size
+
+       Output:
+
+              14.9M	       3	obs://mybucket/doc/news/
+              12.2M	       2	obs://mybucket/doc/news/2018/
+             191.4K	       1	obs://mybucket/doc/lfw_home/
+
+              15.1M	       6	obs://mybucket/doc/
+
+       total: 6 objects
+    """
+
+    def _run(self, parsed_args, parsed_globals):
+        bucket, key = split_bucket_key(parsed_args.paths)
+        key = key.strip('/') + '/' if key else ''
+        depth = int(parsed_args.depth) if parsed_args.depth is not None else 1
+
+        usage = PrefixUsage(key, depth)
+        for page in ObsCmdUtil(self.client).iter_object_pages(bucket, key or None, ordered=False):
+            usage.add_page(page)
+
+        for prefix, size, count in usage.summary(parsed_args.sort):
+            self._outprint("%10s\t%8d\t%s\n" % (bytes_to_unitstr(size), count, join_bucket_key(bucket, prefix)))
+        self._outprint("\n%10s\t%8d\t%s\n" % (bytes_to_unitstr(usage.size), usage.count, join_bucket_key(bucket, key)))
+        self._outprint('\ntotal: %d objects' % usage.count)
@@ -1,16 +1,118 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
-from obscmd.cmds.obs.obsutil import check_resp, split_bucket_key, join_bucket_key, ObsCmdUtil
+import io
+import json
+
+import six
+
+from obs import DateTime
+from obscmd.cmds.obs.obsutil import check_resp, split_bucket_key, join_bucket_key, get_bucket, ObsCmdUtil
 from obscmd.cmds.obs.subcmd import SubObsCommand
 from obscmd.compat import safe_decode
-from obscmd.utils import bytes_to_unitstr
+from obscmd.exceptions import NotSupportError
+from obscmd.utils import bytes_to_unitstr, uni_print
+
+FORMATS = ('text', 'jsonl', 'csv', 'tsv')
+OBJECT_TOPICS = ('key', 'size', 'mtime', 'etag', 'storageClass')
+WRITE_BUFFER_SIZE = 1024 * 1024
+# rows echoed to the screen are collected up to this size before one print
+ECHO_BUFFER_SIZE = 64 * 1024
+
+
+def _text(value):
+    if value is None:
+        return u''
+    if isinstance(value, six.string_types):
+        return safe_decode(value)
+    return six.text_type(value)
+
+
+def _csv_field(value):
+    value = _text(value)
+    if any(char in value for char in u',"\r\n'):
+        return u'"' + value.replace(u'"', u'""') + u'"'
+    return value
+
+
+def _tsv_field(value):
+    value = _text(value)
+    return value.replace(u'\\', u'\\\\').replace(u'\t', u'\\t').replace(u'\n', u'\\n').replace(u'\r', u'\\r')
+
+
+class ListingWriter(object):
+    """
+    write listing rows through one buffered writer. text is the screen format,
+    jsonl, csv and tsv carry raw byte sizes and epoch times for other tools,
+    with a header line for csv and tsv. rows also go to the screen when echo is
+    set and they are written into a file
+    """
+
+    def __init__(self, bucket, fmt='text', outfile=None, echo=True):
+        self.bucket = bucket
+        self.fmt = fmt
+        self.count = 0
+        self.out = io.open(outfile, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) if outfile else None
+        self.echo = echo or not outfile
+        self._echo_lines = []
+        self._echo_size = 0
+        if fmt in ('csv', 'tsv'):
+            self._write(self._line(OBJECT_TOPICS))
+
+    def _line(self, fields):
+        if self.fmt == 'csv':
+            return u','.join(_csv_field(field) for field in fields) + u'\n'
+        return u'\t'.join(_tsv_field(field) for field in fields) + u'\n'
+
+    def _write(self, line):
+        if self.out is not None:
+            self.out.write(line)
+        if self.echo:
+            self._echo_lines.append(line)
+            self._echo_size += len(line)
+            if self._echo_size >= ECHO_BUFFER_SIZE:
+                self._flush_echo()
+
+    def _flush_echo(self):
+        if self._echo_lines:
+            uni_print(u''.join(self._echo_lines))
+            self._echo_lines = []
+            self._echo_size = 0
+
+    def write_object(self, key, size, mtime, etag=None, storage_class=None):
+        key = safe_decode(key)
+        if self.fmt == 'text':
+            line = u"%19s\t%8s\t%s\n" % (DateTime.EpochToLocal(mtime), bytes_to_unitstr(size),
+                                          join_bucket_key(self.bucket, key))
+        elif self.fmt == 'jsonl':
+            line = safe_decode(json.dumps({'key': key, 'size': size, 'mtime': mtime, 'etag': etag,
+                                           'storageClass': storage_class}, ensure_ascii=False)) + u'\n'
+        else:
+            line = self._line((key, size, mtime, etag, storage_class))
+        self._write(line)
+        self.count += 1
+
+    def write_prefix(self, prefix):
+        prefix = safe_decode(prefix)
+        if self.fmt == 'text':
+            line = u"%19s\t%8s\t%s\n" % ('--', '--', join_bucket_key(self.bucket, prefix))
+        elif self.fmt == 'jsonl':
+            line = safe_decode(json.dumps({'prefix': prefix}, ensure_ascii=False)) + u'\n'
+        else:
+            line = self._line((prefix, None, None, None, None))
+        self._write(line)
+        self.count += 1
+
+    def close(self):
+        if self.out is not None:
+            self.out.close()
+        self._flush_echo()
 
 
 class LsCommand(SubObsCommand):
     NAME = 'ls'
     DESCRIPTION = ("List Obs objects and common prefixes under a prefix or "
                    "all Obs buckets.")
-    USAGE = "ls <ObsUri> or NONE [--outfile] [--recursive] [--limit]"
+    USAGE = "ls <ObsUri> or NONE [--outfile] [--recursive] [--limit] [--snapshot] [--format] [--quiet]"
     ARG_TABLE = [
         {'name': 'paths', 'nargs': '?', 'default': 'obs://',
             'positional_arg': True, 'synopsis': USAGE},
@@ -22,6 +124,14 @@ class LsCommand(SubObsCommand):
          'help_text': "list all objects"},
         {'name': 'limit', 'cli_type_name': 'integer',
          'help_text': "limit number of objects for display"},
+        {'name': 'snapshot', 'choices': ['reuse', 'append', 'full'],
+         'help_text': ("with --recursive, list from the local listing snapshot. reuse a saved snapshot, "
+                       "append the keys after its last partition, or full refresh it")},
+        {'name': 'format', 'choices': list(FORMATS), 'default': 'text',
+         'help_text': ("output format of objects. jsonl, csv and tsv show raw byte sizes and epoch "
+                       "times, csv and tsv start with a header line")},
+        {'name': 'quiet', 'action': 'store_true',
+         'help_text': "with --outfile, write objects only into the file, not to the screen"},
     ]
 
     EXAMPLES = """
@@ -81,6 +191,19 @@ class LsCommand(SubObsCommand):
           2013-09-02 21:32:57        189 obs://mybucket/foo/bar/.baz/hooks/foo
           2013-09-02 21:32:57        398 obs://mybucket/z.txt
           
+        list objects from the local snapshot, then refresh only the newest partitions
+        of a date partitioned prefix on later runs.
+
+          obscmd obs ls obs://mybucket/logs/ --recursive --snapshot full
+          obscmd obs ls obs://mybucket/logs/ --recursive --snapshot append
+
+        export an inventory of all objects as json lines, without printing them.
+
+          obscmd obs ls obs://mybucket --recursive --format jsonl --outfile inventory.jsonl --quiet
+
+        Output:
+          {"key": "a.txt", "size": 10, "mtime": 1378128473, "etag": "\\"d7deee6c...\\"", "storageClass": "STANDARD"}
+
         list object to a file.
         
           obscmd obs ls obs://mybucket --recursive -limit 10 --outfile result.txt
@@ -92,10 +215,14 @@ class LsCommand(SubObsCommand):
     def _run(self, parsed_args, parsed_globals):
 
         path = parsed_args.paths
+        if parsed_args.snapshot and not (get_bucket(path) and parsed_args.recursive):
+            raise NotSupportError(**{'msg': 'snapshot option without recursive object listing'})
         outfile = parsed_args.outfile
         if outfile:
             with open(outfile, 'w'):
                 pass
+        self.format = parsed_args.format or 'text'
+        self.quiet = parsed_args.quiet
         recursive = parsed_args.recursive
         limit = int(parsed_args.limit) if parsed_args.limit else parsed_args.limit
         bucket, key = split_bucket_key(path)
@@ -104,7 +231,7 @@ class LsCommand(SubObsCommand):
         if not bucket:
             self._list_all_buckets()
         elif recursive:
-            self._list_all_objects(bucket, key, limit, outfile)
+            self._list_all_objects(bucket, key, limit, outfile, parsed_args.snapshot)
         else:
             self._list_dirs_objects(bucket, key, limit, outfile)
 
@@ -114,38 +241,49 @@ class LsCommand(SubObsCommand):
 
         if not resp.body.buckets:
             self._outprint("no bucket found.")
-        bucket_infos = []
-
-        for bucket in resp.body.buckets:
-            storage = ObsCmdUtil(self.client).get_bucket_storage(bucket.name)
-            bucket_infos.append((bucket, storage))
+        buckets = resp.body.buckets
+        storages = ObsCmdUtil(self.client).iter_bucket_storages([bucket.name for bucket in buckets])
 
-        for bucket, storage in bucket_infos:
+        for bucket, storage in zip(buckets, storages):
             self._outprint("%-19s\t%-8s\t%-8s\t%-8s\n" % (bucket.create_date, bucket.location, storage, join_bucket_key(bucket.name)))
 
     def _list_dirs_objects(self, bucket, prefix, limit, outfile=None):
 
         dirs, objects = ObsCmdUtil(self.client).list_dirs_objects(bucket, prefix)
-        cur = 0
-        for item in dirs:
-            if limit and cur >= limit:
-                break
-            self._outprint("%19s\t%8s\t%s\n" % ('--', '--', join_bucket_key(bucket, item)), outfile)
-            cur += 1
-        for item in objects:
-            if limit and cur >= limit:
-                break
-            self._outprint("%19s\t%8s\t%s\n" % (item['lastModified'], bytes_to_unitstr(item['size']), (join_bucket_key(bucket, item['key']))), outfile)
-            cur += 1
-
-        self._outprint('\ntotal: %d dirs, %d objects' % (len(dirs), len(objects)), outfile)
-
-    def _list_all_objects(self, bucket, prefix, limit,  outfile=None):
-        items = ObsCmdUtil(self.client).get_objects_info(bucket, prefix, ('lastModified', 'size', 'key'), limit)
-
-        for item in items:
-            self._outprint("%19s\t%8s\t%s\n" % (item[0], bytes_to_unitstr(item[1]), join_bucket_key(bucket, item[2])), outfile)
-
-        self._outprint('\ndisplay total: %d objects' % len(items), outfile)
+        writer = ListingWriter(bucket, self.format, outfile, not self.quiet)
+        try:
+            for item in dirs:
+                if limit and writer.count >= limit:
+                    break
+                writer.write_prefix(item)
+            for item in objects:
+                if limit and writer.count >= limit:
+                    break
+                writer.write_object(item['key'], item['size'], item['mtime'], item['etag'], item['storageClass'])
+        finally:
+            writer.close()
+
+        self._outprint('\ntotal: %d dirs, %d objects' % (len(dirs), len(objects)), self._summary_file(outfile))
+
+    def _list_all_objects(self, bucket, prefix, limit,  outfile=None, snapshot=None):
+        if snapshot:
+            items = ObsCmdUtil(self.client).iter_snapshot_info(bucket, prefix, OBJECT_TOPICS, limit, snapshot)
+        else:
+            items = ObsCmdUtil(self.client).iter_objects_info(bucket, prefix, OBJECT_TOPICS, limit)
+
+        writer = ListingWriter(bucket, self.format, outfile, not self.quiet)
+        try:
+            for key, size, mtime, etag, storage_class in items:
+                writer.write_object(key, size, mtime, etag, storage_class)
+        finally:
+            writer.close()
+
+        self._outprint('\ndisplay total: %d objects' % writer.count, self._summary_file(outfile))
         if outfile:
-            self._outprint('ls to file %s complete.' % outfile)
\ No newline at end of file
+            self._outprint('ls to file %s complete.' % outfile)
+
+    def _summary_file(self, outfile):
+        """
+        the summary line goes into the outfile only with the text format
+        """
+        return outfile if self.format == 'text' else None
@@ -1,7 +1,5 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
-from obs import DeleteObjectsRequest, Object, ListMultipartUploadsRequest
-
 from obscmd.cmds.obs.obsutil import split_bucket_key, check_resp, join_bucket_key, ObsCmdUtil
 from obscmd.cmds.obs.subcmd import SubObsCommand
 
@@ -11,8 +9,8 @@ class RbCommand(SubObsCommand):
     DESCRIPTION = """
         Deletes  an  empty  Obs  bucket.  A  bucket  must be completely empty of
         objects and versioned objects before it can be  deleted.  However,  the
-        --force  parameter  can  be used to delete the non-versioned objects in
-        the bucket before the bucket is deleted
+        --force  parameter  can  be used to delete all objects, versions and
+        delete markers in the bucket before the bucket is deleted
     """
     USAGE = "rb <ObsUri> [--force]"
     ARG_TABLE = [
@@ -43,6 +41,8 @@ class RbCommand(SubObsCommand):
 
           delete: obs://mybucket/test1.txt
           delete: obs://mybucket/test2.txt
+
+          delete 2 objects and versions
           remove bucket complete: obs://mybucket
     """
 
@@ -57,17 +57,26 @@ class RbCommand(SubObsCommand):
 
         obs_cmd_util = ObsCmdUtil(self.client)
         if force:
-            keys = obs_cmd_util.force_remove_bucket(bucket)
-            self.print_results(bucket, keys)
-        else:
-            obs_cmd_util.remove_bucket(bucket)
+            self.clear_bucket(obs_cmd_util, bucket)
+        obs_cmd_util.remove_bucket(bucket)
         self._outprint('remove bucket complete: %s' % path)
         return 0
 
-    def print_results(self, bucket, keys):
-        if len(keys) == 0:
-            return 0
-        for key in keys:
-            self._outprint('delete: %s' % (join_bucket_key(bucket, key)))
-        self._outprint('\n')
-        self._outprint('delete %d objects' % len(keys))
\ No newline at end of file
+    def clear_bucket(self, obs_cmd_util, bucket):
+        count = 0
+        failed_total = 0
+        for deleted, failed in obs_cmd_util.iter_clear_bucket(bucket):
+            for key, version in deleted:
+                if version and version != 'null':
+                    self._outprint('delete: %s, version: %s' % (join_bucket_key(bucket, key), version))
+                else:
+                    self._outprint('delete: %s' % (join_bucket_key(bucket, key)))
+            for item, code, message in failed:
+                self._outprint('delete failed: %s, %s: %s' % (join_bucket_key(bucket, item[0]), code, message))
+            count += len(deleted)
+            failed_total += len(failed)
+        if count:
+            self._outprint('\n')
+            self._outprint('delete %d objects and versions' % count)
+        if failed_total:
+            self._outprint('delete failed %d objects' % failed_total)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
+import itertools
 import os
 
 import time
@@ -8,13 +9,17 @@ from obscmd.compat import safe_encode
 from obscmd.config import FILE_LIST_DIR
 from obs import Versions
 
-from obscmd.cmds.obs.obsutil import split_bucket_key, check_resp, ObsCmdUtil, join_bucket_key
+from obscmd.cmds.obs.obsutil import split_bucket_key, check_resp, ObsCmdUtil, join_bucket_key, filter_patterns, \
+    pattern_list_prefix, read_keys
 from obscmd.cmds.obs.subcmd import SubObsCommand
+from obscmd.exceptions import NotSupportError
+from obscmd.utils import bytes_to_unitstr, durationstr_to_seconds, unitstr_to_bytes
 
 class RmCommand(SubObsCommand):
     NAME = 'rm'
     DESCRIPTION = "Remove an obs object."
-    USAGE = "rm <ObsUri> [--version] [--recursive]"
+    USAGE = ("rm <ObsUri> [--version] [--recursive] [--all-versions] [--include] [--exclude] [--older-than] "
+             "[--newer-than] [--min-size] [--max-size] [--keys-from] [--dryrun]")
     ARG_TABLE = [{'name': 'paths', 'positional_arg': True, 'synopsis': USAGE},
                  {'name': 'recursive', 'action': 'store_true',
                   'help_text': (
@@ -22,6 +27,26 @@ class RmCommand(SubObsCommand):
                       "under the specified directory")},
                  {'name': 'versionid',
                   'help_text': "The object version, when recursive option exists, the version is invalid."},
+                 {'name': 'all-versions', 'action': 'store_true',
+                  'help_text': (
+                      "delete every version and delete marker of the object, or under the "
+                      "directory with --recursive")},
+                 {'name': 'include',
+                  'help_text': "Don't exclude objects that match the specified pattern"},
+                 {'name': 'exclude',
+                  'help_text': "Exclude all objects that match the specified pattern"},
+                 {'name': 'older-than',
+                  'help_text': "only delete objects last modified longer ago than this, like 30d, 12h, 90m"},
+                 {'name': 'newer-than',
+                  'help_text': "only delete objects last modified more recently than this, like 30d, 12h, 90m"},
+                 {'name': 'min-size',
+                  'help_text': "only delete objects at least this large, like 1M"},
+                 {'name': 'max-size',
+                  'help_text': "only delete objects at most this large, like 1G"},
+                 {'name': 'keys-from',
+                  'help_text': "delete the keys listed in this file, one key per line, instead of listing the prefix"},
+                 {'name': 'dryrun', 'action': 'store_true',
+                  'help_text': "only show how many objects and bytes would be deleted"},
         ]
     EXAMPLES = """
          The following rm command delete a single object. 
@@ -48,6 +73,29 @@ class RmCommand(SubObsCommand):
             delete: obs://tsdd/doc/test2.cp
             
             delete 2 objects
+
+       The following rm command deletes every version and delete marker under
+       a directory of a versioned bucket.
+          obscmd obs rm obs://mybucket/doc --recursive --all-versions
+
+       Output:
+
+            delete 1000 versions
+            delete 352 versions
+
+            delete 1352 versions
+
+       The following rm command shows how much would be deleted by removing
+       the logs of 2017 that are older than 90 days, without deleting anything.
+       Only keys under logs/2017- are listed.
+          obscmd obs rm obs://mybucket/logs --recursive --exclude "*" --include "2017-*" --older-than 90d --dryrun
+
+       Output:
+
+            dryrun: delete 1352 objects, 12.5G
+
+       The following rm command deletes the keys listed in keys.txt.
+          obscmd obs rm obs://mybucket --keys-from keys.txt
        
     """
 
@@ -58,23 +106,172 @@ class RmCommand(SubObsCommand):
         versionid = parsed_args.versionid
         bucket, key = split_bucket_key(path)
 
-        self._warning_prompt('Are you sure to delete bucket objects?')
+        self.include = parsed_args.include
+        self.exclude = parsed_args.exclude
+        now = time.time()
+        self.max_mtime = now - durationstr_to_seconds(parsed_args.older_than) if parsed_args.older_than else None
+        self.min_mtime = now - durationstr_to_seconds(parsed_args.newer_than) if parsed_args.newer_than else None
+        self.min_size = unitstr_to_bytes(parsed_args.min_size) if parsed_args.min_size else None
+        self.max_size = unitstr_to_bytes(parsed_args.max_size) if parsed_args.max_size else None
+        self.dryrun = parsed_args.dryrun
+        self._check_options(parsed_args)
+
+        if not parsed_args.dryrun:
+            self._warning_prompt('Are you sure to delete bucket objects?')
 
         self.now = time.strftime('%Y.%m.%d_%H.%M.%S', time.localtime(time.time()))
 
         self.obs_cmd_util = ObsCmdUtil(self.client)
         self._outprint('start delete objects ...')
 
-        if recursive:
+        if parsed_args.keys_from:
+            self.delete_items(bucket, self.iter_manifest(key, parsed_args.keys_from))
+        elif parsed_args.all_versions:
+            self.delete_versions(bucket, key, recursive)
+        elif recursive:
             self.delete_dir(bucket, key)
+        elif self.dryrun:
+            self._outprint("dryrun: delete object: %s" % join_bucket_key(bucket, key))
         else:
             self.delete_object(bucket, key, versionid)
 
+    def _check_options(self, parsed_args):
+        """
+        reject option combinations that would otherwise be ignored, before anything is deleted
+        :param parsed_args: 
+        :return: 
+        """
+        patterns = self.include or self.exclude
+        if parsed_args.versionid and (parsed_args.recursive or parsed_args.keys_from or parsed_args.all_versions):
+            raise NotSupportError(**{'msg': '--versionid with --recursive, --all-versions or --keys-from'})
+        if parsed_args.all_versions and parsed_args.keys_from:
+            raise NotSupportError(**{'msg': '--all-versions with --keys-from'})
+        if parsed_args.all_versions and (patterns or self._has_info_filters()):
+            raise NotSupportError(**{'msg': 'include, exclude, age and size filters with --all-versions'})
+        if parsed_args.keys_from and self._has_info_filters():
+            raise NotSupportError(**{'msg': 'age and size filters with --keys-from'})
+        if not (parsed_args.recursive or parsed_args.keys_from or parsed_args.all_versions) and \
+                (patterns or self._has_info_filters()):
+            raise NotSupportError(**{'msg': 'include, exclude, age and size filters without --recursive'})
+
     def delete_dir(self, bucket, key):
         key = key if key.endswith('/') or not key else key + '/'
-        keys = self.obs_cmd_util.get_objects_info(bucket, key, 'key')
-        self.obs_cmd_util.delete_all_objects(bucket, keys)
-        self.print_results(bucket, keys)
+        self.delete_items(bucket, self.iter_listed(bucket, key))
+
+    def iter_listed(self, bucket, key):
+        """
+        stream (key, size, mtime) of the objects under key that pass the filters,
+        an include pattern with everything else excluded narrows the listed prefix
+        :param bucket: 
+        :param key: 
+        :return: generator of (key, size, mtime)
+        """
+        match = None
+        if self.include or self.exclude:
+            def match(obskey):
+                return not filter_patterns(obskey, key, self.exclude, self.include, obs_key=True)
+        prefix = pattern_list_prefix(key, self.exclude, self.include)
+        for info in self.obs_cmd_util.iter_objects_info(bucket, prefix, ('key', 'size', 'mtime'), match=match):
+            if self._pass_info_filters(info[1], info[2]):
+                yield info
+
+    def iter_manifest(self, key, keys_file):
+        """
+        stream the keys of keys_file that pass the patterns
+        :param key: prefix key the patterns are relative to
+        :param keys_file: 
+        :return: generator of (key, None, None), size and mtime are not known
+        """
+        for obskey in read_keys(keys_file):
+            if not filter_patterns(obskey, key, self.exclude, self.include, obs_key=True):
+                yield obskey, None, None
+
+    def _has_info_filters(self):
+        return any(value is not None for value in (self.max_mtime, self.min_mtime, self.min_size, self.max_size))
+
+    def _pass_info_filters(self, size, mtime):
+        if self.max_mtime is not None and mtime > self.max_mtime:
+            return False
+        if self.min_mtime is not None and mtime < self.min_mtime:
+            return False
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        return True
+
+    def delete_items(self, bucket, items):
+        """
+        delete streamed (key, size, mtime) with the concurrent batch deleters, or
+        only count them with dryrun
+        :param bucket: 
+        :param items: 
+        :return: 
+        """
+        if self.dryrun:
+            count = 0
+            size = None
+            for _, item_size, _ in items:
+                count += 1
+                if item_size is not None:
+                    size = (size or 0) + item_size
+            sizestr = ', %s' % bytes_to_unitstr(size) if size is not None else ''
+            self._outprint('dryrun: delete %d objects%s' % (count, sizestr))
+            return
+
+        total = 0
+        failed_total = 0
+        for deleted, failed in self.obs_cmd_util.delete_batches(bucket, (item[0] for item in items)):
+            for obskey in deleted:
+                self._outprint('delete: %s' % (join_bucket_key(bucket, obskey)))
+            self.print_failed(bucket, failed)
+            total += len(deleted)
+            failed_total += len(failed)
+        if total or failed_total:
+            self._outprint('\n')
+            self._outprint('delete %d objects' % total)
+        if failed_total:
+            self._outprint('delete failed %d objects' % failed_total)
+
+    def delete_versions(self, bucket, key, recursive):
+        """
+        delete all versions under the directory key, or of the object key, batch by batch,
+        or only count them with dryrun
+        :param bucket: 
+        :param key: 
+        :param recursive: 
+        :return: 
+        """
+        if recursive:
+            key = key if key.endswith('/') or not key else key + '/'
+        if self.dryrun:
+            versions = self.obs_cmd_util.iter_versions(bucket, key or None, threads=recursive)
+            if not recursive:
+                versions = itertools.takewhile(lambda version: version[0] <= key, versions)
+            count = sum(1 for version in versions if recursive or version[0] == key)
+            self._outprint('dryrun: delete %d versions' % count)
+            return
+        if recursive:
+            batches = self.obs_cmd_util.delete_versions(bucket, prefix=key or None)
+        else:
+            batches = self.obs_cmd_util.delete_versions(bucket, key=key)
+        total = 0
+        failed_total = 0
+        for deleted, failed in batches:
+            self._outprint('delete %d versions' % len(deleted))
+            self.print_failed(bucket, failed)
+            total += len(deleted)
+            failed_total += len(failed)
+        self._outprint('\n')
+        self._outprint('delete %d versions' % total)
+        if failed_total:
+            self._outprint('delete failed %d versions' % failed_total)
+
+    def print_failed(self, bucket, failed):
+        for item, code, message in failed:
+            obskey, version = item if isinstance(item, tuple) else (item, None)
+            self._outprint('delete failed: %s%s, %s: %s' % (join_bucket_key(bucket, obskey),
+                                                           ' version: %s' % version if version else '', code, message))
 
     def delete_object(self, bucket, key, version):
         self.obs_cmd_util.delete_object(bucket, key, version)
@@ -83,14 +280,6 @@ class RmCommand(SubObsCommand):
         if version:
             self._outprint("version: %s" % version)
 
-    def print_results(self, bucket, keys):
-        if len(keys) == 0:
-            return 0
-        for key in keys:
-            self._outprint('delete: %s' % (join_bucket_key(bucket, key)))
-        self._outprint('\n')
-        self._outprint('delete %d objects' % len(keys))
-
     def _outprint(self, msg):
         filename = self.now + '-' + self.session.full_cmd.replace('://', '/').replace('--', '').replace(' ', '-').replace('/', '.')
         filename = filename.replace('\\', '.').replace(':', '')
@@ -3,15 +3,21 @@
 
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
-from obscmd.cmds.obs.obsutil import get_bucket,check_resp
-from obscmd.cmds.obs.obsutil import get_object_key,str_to_dict
+import io
+import json
+import sys
+
+from obscmd.cmds.obs.obsutil import get_bucket,check_resp, ObsCmdUtil
+from obscmd.cmds.obs.obsutil import get_object_key,str_to_dict, read_keys
 from obscmd.cmds.obs.subcmd import SubObsCommand
+from obscmd.compat import safe_decode
 
 
 class SurlCommand(SubObsCommand):
     NAME = 'surl'
     DESCRIPTION = "Creates an temporary authentication for the bucket and object "
-    USAGE = "surl < http method> [--obspath] [--special-param] [--expires] [--headers] [--query-param] "
+    USAGE = "surl < http method> [--obspath] [--special-param] [--expires] [--headers] [--query-param] " \
+            "[--recursive] [--keys-from] [--outfile]"
 
     ARG_TABLE = [
         {'name': 'method', 'positional_arg': True,
@@ -24,9 +30,31 @@ class SurlCommand(SubObsCommand):
          'help_text': "special parameter"},
         {'name': 'expires', 'cli_type_name': 'integer', 'help_text': "expires time"},
         {'name':'headers','help_text': "headers"},
-        {'name':'query-param','help_text': "query params"}
+        {'name':'query-param','help_text': "query params"},
+        {'name': 'recursive', 'action': 'store_true',
+         'help_text': "sign every object under the obspath prefix, output one json line per object"},
+        {'name': 'keys-from',
+         'help_text': "sign every object key listed in this file (one key per line) in the obspath bucket, "
+                      "output one json line per object"},
+        {'name': 'outfile', 'help_text': "write the json lines of bulk mode into this file instead of the screen"},
     ]
-    
+
+    EXAMPLES = """
+        The following surl command creates a signed url for one object.
+          obscmd obs surl GET --obspath obs://mybucket/test.txt --expires 3600
+
+        The following surl command signs every object under a prefix and writes
+        one json line per object into a file.
+          obscmd obs surl GET --obspath obs://mybucket/doc/ --recursive --outfile urls.jsonl
+
+       Output:
+
+          {"key": "doc/a.txt", "url": "http://mybucket.obs.myhwclouds.com:80/doc/a.txt?Expires=...&Signature=..."}
+
+        The following surl command signs the keys listed in keys.txt.
+          obscmd obs surl GET --obspath obs://mybucket --keys-from keys.txt
+    """
+
     def _run(self, parsed_args, parsed_globals):
 
         method = parsed_args.method
@@ -42,10 +70,38 @@ class SurlCommand(SubObsCommand):
         
         queryParam=str_to_dict(parsed_args.query_param) if parsed_args.query_param else None
 
+        if parsed_args.recursive or parsed_args.keys_from:
+            keys = self._read_keys(parsed_args.keys_from) if parsed_args.keys_from else self._list_keys(bucket, objectKey)
+            count = self._sign_urls(method, bucket, keys, specialParam, expires, headers, queryParam, parsed_args.outfile)
+            if parsed_args.outfile:
+                self._outprint("signed %d urls into %s\n" % (count, parsed_args.outfile))
+            return
+
         resp = self.client.createSignedUrl(method, bucket, objectKey, specialParam, expires,headers,queryParam )
         # this function return value has no status
         self._outprint("signed url: %s\n" % resp.signedUrl)
         self._outprint("request header: %s\n" % resp.actualSignedRequestHeaders)
 
+    def _list_keys(self, bucket, prefix):
+        return ObsCmdUtil(self.client).iter_objects_info(bucket, prefix or None, 'key')
 
+    def _read_keys(self, keys_file):
+        return read_keys(keys_file)
 
+    def _sign_urls(self, method, bucket, keys, special_param, expires, headers, query_param, outfile=None):
+        """
+        stream signed urls as json lines, all urls share the client signer and one expire time
+        :return: number of signed urls
+        """
+        out = io.open(outfile, 'w', encoding='utf-8', buffering=1024 * 1024) if outfile else sys.stdout
+        count = 0
+        try:
+            for key, url in self.client.createSignedUrls(method, bucket, keys, special_param, expires, headers, query_param):
+                out.write(safe_decode(json.dumps({'key': safe_decode(key), 'url': url}, ensure_ascii=False)) + u'\n')
+                count += 1
+        finally:
+            if outfile:
+                out.close()
+            else:
+                out.flush()
+        return count
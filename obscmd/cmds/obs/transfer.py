@@ -7,14 +7,14 @@ import operator
 import logging
 # from obscmd import compat
 import threading
+import time
 
 import shutil
 
 from obscmd import multithreading as compat, globl
 from obscmd.cmds.obs.obsutil import multiprocess_with_sleep, check_resp, multithreading_with_sleep, ObsCmdUtil, \
     pbar_add_size, read_cp_file, split_bucket_key
-from obscmd.config import TRY_MULTIPART_TIMES
-from obscmd.utils import string2md5, move_file
+from obscmd.utils import string2md5, move_file, bytes_to_unitstr
 from obs.const import LONG, IS_PYTHON2, UNICODE
 from obs.model import BaseModel, CompletePart, CompleteMultipartUploadRequest, GetObjectRequest
 from obs.util import safe_trans_to_gb2312, to_long, to_int
@@ -172,12 +172,8 @@ class UploadOperation(Operation):
         partEtag_infos, upload_infos, status = func_args
 
         if status.value == 0:
+            # retryable failures were already retried by the client
             resp = self.real_upload(part)
-            i = 0
-            while resp.status > 300 and i < TRY_MULTIPART_TIMES:
-                logger.warning('retry %s part, %d times, part number: %d' % (self.cmdtype, i, part['partNumber']))
-                resp = self.real_upload(part)
-                i += 1
 
             if resp.status < 300:
                 complete_part = CompletePart(to_int(part['partNumber']), resp.body.etag)
@@ -334,6 +330,49 @@ class DownloadOperation(Operation):
         return self.obscmdutil.get_object_metadata_nocheck(
             self._record['bucketName'], self._record['objectKey'], self._record['versionId'])
 
+    def _get_part(self, part, get_object_request):
+        """
+        download one range into the temp file, the range is read again when the
+        connection breaks while the body is streamed
+        :param part:
+        :param get_object_request:
+        :return: the get object response
+        """
+        policy = self.obscmdutil.client.retry_policy
+        attempt = 0
+        while True:
+            try:
+                resp = self.obscmdutil.get_object(bucketName=self._record['bucketName'],
+                                                  objectKey=self._record['objectKey'],
+                                                  getObjectRequest=get_object_request, headers=self.header)
+                if resp.status < 300 and resp.body.response is not None:
+                    self._write_part(part, resp.body.response)
+                return resp
+            except Exception as e:
+                if not policy.is_retryable_error(e) or not policy.should_retry(attempt):
+                    raise
+                logger.warning('%s part %d error, %s, retry time:%d' % (self.cmdtype, part['partNumber'], e, attempt + 1))
+            policy.sleep(attempt)
+            attempt += 1
+
+    def _write_part(self, part, respone):
+        chunk_size = self.obscmdutil.client.chunk_size
+        start = time.time()
+        try:
+            with open(_to_unicode(self._tmp_file), 'rb+') as f:
+                f.seek(part['offset'], 0)
+                while True:
+                    chunk = respone.read(chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+        finally:
+            respone.close()
+        cost = time.time() - start
+        if cost > 0:
+            logger.info('%s part %d throughput %s/s, chunk size %d' % (
+                self.cmdtype, part['partNumber'], bytes_to_unitstr(part['length'] / cost), chunk_size))
+
     def _download_part_process(self, func_args, item_args):
         part = item_args
         download_infos, status = func_args
@@ -341,31 +380,8 @@ class DownloadOperation(Operation):
             get_object_request = GetObjectRequest(versionId=self._record['versionId'])
             self.header.range = '%d-%d' % (part['offset'], part['offset'] + part['length'] - 1)
             try:
-                resp = self.obscmdutil.get_object(bucketName=self._record['bucketName'],
-                                                  objectKey=self._record['objectKey'],
-                                                  getObjectRequest=get_object_request, headers=self.header)
-
-                i = 0
-                while resp.status > 300 and i < TRY_MULTIPART_TIMES:
-                    logger.warning('retry %s part, %d times, part number: %d' % (self.cmdtype, i, part['partNumber']))
-                    resp = self.obscmdutil.get_object(bucketName=self._record['bucketName'],
-                                                      objectKey=self._record['objectKey'],
-                                                      getObjectRequest=get_object_request, headers=self.header)
-                    i += 1
-
+                resp = self._get_part(part, get_object_request)
                 if resp.status < 300:
-                    respone = resp.body.response
-                    chunk_size = 65536
-                    if respone is not None:
-                        with open(_to_unicode(self._tmp_file), 'rb+') as f:
-                            f.seek(part['offset'], 0)
-                            while True:
-                                chunk = respone.read(chunk_size)
-                                if not chunk:
-                                    break
-                                f.write(chunk)
-                            respone.close()
-
                     download_infos[part['partNumber'] - 1] = True
                     logger.info('%s part %d complete, %s' % (self.cmdtype, part['partNumber'], self.filename))
                     if self.enable_checkpoint:
@@ -30,6 +30,8 @@ LOG_FILE = os.path.join(LOG_DIR, 'obscmd.log')
 
 FILE_LIST_DIR = get_full_path(config.task.filelist_path)
 
+SNAPSHOT_DIR = get_full_path(config.task.get('snapshot_path') or os.path.join('~', '.obscmd', 'snapshot'))
+
 TRY_MULTIPART_TIMES = 2
 
 
@@ -183,6 +183,24 @@ def unitstr_to_bytes(unitstr):
     return int(float(digit) * base ** POSTFIXES.index(unit))
 
 
+DURATION_UNITS = {'S': 1, 'M': 60, 'H': 3600, 'D': 86400, 'W': 604800}
+
+
+def durationstr_to_seconds(durationstr):
+    """
+    transform 30d to 30*24*3600
+    12h to 12*3600, plain digits are seconds
+    :param durationstr: 
+    :return: 
+    """
+    unit = durationstr[-1].upper()
+    if unit.isdigit():
+        return int(float(durationstr))
+    if unit not in DURATION_UNITS:
+        raise ParamValidationError(**{'report': '%s unit must be in %s' % (durationstr, sorted(DURATION_UNITS))})
+    return int(float(durationstr[:-1]) * DURATION_UNITS[unit])
+
+
 def hour_time_to_int(hour_time):
     """
     translate time 08:23 to 823
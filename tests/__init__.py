@@ -32,11 +32,12 @@ class BaseObsCommandTest(BaseHcmdCommandParamsTest):
     def tearDown(self):
         super(BaseObsCommandTest, self).tearDown()
         if self.bucket:
-            ObsCmdUtil(self.client).clear_bucket(self.bucket)
+            self.clear_bucket_files()
         self.files.remove_all()
 
     def clear_bucket_files(self):
-        ObsCmdUtil(self.client).clear_bucket(self.bucket)
+        for _ in ObsCmdUtil(self.client).iter_clear_bucket(self.bucket):
+            pass
 
     def run_cmd_for_count_time(self, cmd, expected_rc=0):
         start_time = time.time()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+import gc
+
+from obs.convertor import Adapter, Convertor, ListObjectsParser
+from obscmd.testutils import unittest
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+ENTRIES = 5000
+
+
+def list_objects_xml(count):
+    contents = ''.join(
+        '<Contents><Key>dir/sub/object-%08d.dat</Key><LastModified>2018-08-02T09:45:55.000Z</LastModified>'
+        '<ETag>"d7deee6cced029b4ca652a59c768538e"</ETag><Size>%d</Size>'
+        '<Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner><StorageClass>STANDARD</StorageClass></Contents>'
+        % (i, i * 1024) for i in range(count))
+    return ('<?xml version="1.0" encoding="UTF-8"?><ListBucketResult><Name>bucket</Name>'
+            '<IsTruncated>false</IsTruncated>%s</ListBucketResult>' % contents).encode('UTF-8')
+
+
+@unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+class TestListingMemory(unittest.TestCase):
+    """
+    memory held per listed object, prints bytes per entry of Content dicts
+    against CompactContent rows
+    """
+
+    def setUp(self):
+        self.convertor = Convertor('obs', Adapter('obs'))
+        self.xml = list_objects_xml(ENTRIES)
+
+    def bytes_per_entry(self, skipOwner, compact):
+        gc.collect()
+        tracemalloc.start()
+        parser = ListObjectsParser(self.convertor, skipOwner, compact)
+        parser.feed(self.xml)
+        contents = parser.close().contents
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.assertEqual(len(contents), ENTRIES)
+        return float(size) / ENTRIES
+
+    def test_bytes_per_entry(self):
+        before = self.bytes_per_entry(False, False)
+        after = self.bytes_per_entry(True, True)
+        print('listing\t%d bytes/entry -> %d bytes/entry\t%.1fx' % (before, after, before / after))
+        self.assertLess(after, before)
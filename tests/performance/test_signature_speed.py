@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+import time
+
+from obs import auth, convertor, util
+from obscmd.testutils import unittest
+
+
+AK = 'AKIDEXAMPLE1234567890'
+SK = 'wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY'
+
+
+def signatures_per_second(sign, seconds=1.0):
+    count = 0
+    start = time.time()
+    while time.time() - start < seconds:
+        for _ in range(100):
+            sign()
+        count += 100
+    return count / (time.time() - start)
+
+
+class TestSignatureSpeed(unittest.TestCase):
+    """
+    microbenchmark of request signing, prints signatures per second of a
+    per-request authentication object against the long-lived signer
+    """
+
+    def setUp(self):
+        self.ha = convertor.Adapter('v2')
+        self.headers = {'Content-Type': 'application/octet-stream', 'Date': 'Mon, 19 Oct 2026 08:00:00 GMT',
+                        'x-amz-meta-name': 'value', 'Content-Length': '1048576'}
+        self.path_args = {'partNumber': '3', 'uploadId': '0000016A3D1E8F2A9B'}
+
+    def print_speed(self, name, before, after):
+        print('%s\t%d signatures/s -> %d signatures/s\t%.1fx' % (name, before, after, after / before))
+
+    def test_v2_signature_speed(self):
+        signer = auth.Signer(AK, SK, False, self.ha)
+
+        def per_request():
+            auth.Authentication(AK, SK, False, self.ha).doAuth('PUT', 'bucket', 'dir/object key', self.path_args, dict(self.headers))
+
+        def long_lived():
+            signer.v2Auth.doAuth('PUT', 'bucket', 'dir/object key', self.path_args, dict(self.headers))
+
+        before = signatures_per_second(per_request)
+        after = signatures_per_second(long_lived)
+        self.print_speed('v2', before, after)
+        self.assertGreater(after, before * 0.9)
+
+    def test_v4_signature_speed(self):
+        signer = auth.Signer(AK, SK, False, self.ha)
+
+        def per_request():
+            auth.V4Authentication(AK, SK, 'region', '20261019', '20261019T080000Z', False, self.ha).doAuth(
+                'PUT', 'bucket', 'dir/object key', dict(self.path_args), dict(self.headers))
+
+        def long_lived():
+            signer.getV4Authentication('region', '20261019', '20261019T080000Z').doAuth(
+                'PUT', 'bucket', 'dir/object key', dict(self.path_args), dict(self.headers))
+
+        before = signatures_per_second(per_request)
+        after = signatures_per_second(long_lived)
+        self.print_speed('v4', before, after)
+        self.assertGreater(after, before)
+
+    def test_v2_canonical_string_and_url_speed(self):
+        signer = auth.Signer(AK, SK, False, self.ha)
+        calling_format = util.RequestFormat.get_subdomainformat()
+
+        def sign_request():
+            path = calling_format.get_url('bucket', 'dir/object key', self.path_args)
+            signer.v2Auth.doAuth('PUT', 'bucket', 'dir/object key', self.path_args, self.headers)
+            return path
+
+        speed = signatures_per_second(sign_request)
+        print('v2 url + canonical string + signature\t%d requests/s' % speed)
+        self.assertGreater(speed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+import re
+import time
+
+from obs import xmlbackend
+from obs.convertor import Adapter, Convertor, ListObjectsParser
+from obscmd.testutils import unittest
+from tests.unit.obs import fixtures
+
+HEADERS = {}
+
+
+def seconds_per_call(call, seconds=1.0):
+    count = 0
+    start = time.time()
+    while time.time() - start < seconds:
+        call()
+        count += 1
+    return (time.time() - start) / count
+
+
+@unittest.skipIf(xmlbackend.LXML not in xmlbackend.available_backends(), 'lxml is not installed')
+class TestXmlBackendSpeed(unittest.TestCase):
+    """
+    parser benchmark over the recorded response fixtures, prints the time per
+    parse of the stdlib backend against lxml
+    """
+
+    def setUp(self):
+        self.convertor = Convertor('obs', Adapter('obs'))
+        self.previous = xmlbackend.get_backend()
+        self.page = fixtures.list_objects_page(1000).encode('UTF-8')
+
+    def tearDown(self):
+        xmlbackend.use_backend(self.previous)
+
+    def measure(self, call):
+        speeds = []
+        for backend in (xmlbackend.STDLIB, xmlbackend.LXML):
+            xmlbackend.use_backend(backend)
+            speeds.append(seconds_per_call(call, 0.5))
+        return speeds
+
+    def print_speed(self, name, before, after):
+        print('%-28s\t%.1fus -> %.1fus\t%.1fx' % (name, before * 1e6, after * 1e6, before / after))
+
+    def test_fixture_parse_speed(self):
+        for methodName, xml in fixtures.PARSE_METHODS:
+            parseMethod = getattr(self.convertor, 'parse' + methodName[:1].upper() + methodName[1:])
+            xml = re.sub('xmlns="http.*?"', '', xml)
+            before, after = self.measure(lambda: parseMethod(xml, HEADERS))
+            self.print_speed(methodName, before, after)
+
+    def test_list_objects_page_speed(self):
+        def parse_page():
+            parser = ListObjectsParser(self.convertor, True, True)
+            for i in range(0, len(self.page), 65536):
+                parser.feed(self.page[i:i + 65536])
+            parser.close(HEADERS)
+
+        before, after = self.measure(parse_page)
+        self.print_speed('listObjects 1000 keys stream', before, after)
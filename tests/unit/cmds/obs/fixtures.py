@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+fake clients shared by the listing and snapshot tests
+"""
+import threading
+
+from obs.model import CompactContent
+from obscmd.utils import DotDict
+
+
+class FakeBucketClient(object):
+    """
+    listObjects over an in-memory sorted key list, with small pages
+    """
+
+    def __init__(self, keys, page_size=3, fail_prefix=None):
+        self.keys = sorted(keys)
+        self.page_size = page_size
+        self.fail_prefix = fail_prefix
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def listObjects(self, bucket, prefix=None, marker=None, max_keys=None, delimiter=None, skipOwner=False, compact=False):
+        with self.lock:
+            self.calls.append((prefix, marker, delimiter))
+        if self.fail_prefix is not None and prefix == self.fail_prefix:
+            return DotDict({'status': 500, 'reason': 'Internal Error', 'errorCode': 'InternalError', 'errorMessage': 'boom'})
+        prefix = prefix or ''
+        page_size = min(max_keys or self.page_size, self.page_size)
+        contents, prefixes, next_marker = [], [], None
+        for key in self.keys:
+            if not key.startswith(prefix) or (marker is not None and key <= marker):
+                continue
+            if delimiter and delimiter in key[len(prefix):]:
+                common = key[:key.index(delimiter, len(prefix)) + 1]
+                if (marker is not None and common <= marker) or common in prefixes:
+                    continue
+                if len(contents) + len(prefixes) == page_size:
+                    break
+                prefixes.append(common)
+                next_marker = common
+            else:
+                if len(contents) + len(prefixes) == page_size:
+                    break
+                contents.append(CompactContent(key=key, size=len(key)))
+                next_marker = key
+        else:
+            next_marker = None
+        body = DotDict({'contents': contents, 'commonPrefixs': [{'prefix': p} for p in prefixes],
+                        'is_truncated': next_marker is not None, 'next_marker': next_marker})
+        return DotDict({'status': 200, 'body': body})
@@ -1,2 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
+import argparse
+import unittest
+
+from obscmd.cmds.obs.subcmds.cp import CpCommand
+from obscmd.exceptions import NotSupportError
+
+
+class TestSnapshotOption(unittest.TestCase):
+
+    def test_snapshot_needs_update(self):
+        cp = CpCommand.__new__(CpCommand)
+        args = argparse.Namespace(srcpath='logs', destpath='obs://mybucket/logs/', md5=False, recursive=True,
+                                  update=False, snapshot='reuse', include=None, exclude=None)
+        self.assertRaises(NotSupportError, cp._run, args, None)
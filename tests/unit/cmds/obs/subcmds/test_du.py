@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import unittest
+
+from obscmd.cmds.obs.subcmds.du import PrefixUsage
+
+
+class TestPrefixUsage(unittest.TestCase):
+
+    def setUp(self):
+        self.usage = PrefixUsage('doc/', depth=2)
+        self.usage.add_page([{'key': 'doc/a.txt', 'size': 1}, {'key': 'doc/news/x', 'size': 10},
+                             {'key': 'doc/news/2018/y', 'size': 100}, {'key': 'doc/news/2018/z/w', 'size': 1000},
+                             {'key': 'doc/pic/p', 'size': 5}])
+
+    def test_sizes_and_counts_per_prefix(self):
+        self.assertEqual(self.usage.summary(), [('doc/news/', 1110, 3), ('doc/news/2018/', 1100, 2),
+                                                ('doc/pic/', 5, 1)])
+        self.assertEqual((self.usage.size, self.usage.count), (1116, 5))
+
+    def test_sort_by_count(self):
+        self.assertEqual([row[0] for row in self.usage.summary('count')], ['doc/news/', 'doc/news/2018/', 'doc/pic/'])
+        self.assertEqual([row[0] for row in self.usage.summary('size')][-1], 'doc/pic/')
+
+    def test_depth_zero_keeps_only_the_total(self):
+        usage = PrefixUsage('', depth=0)
+        usage.add('a/b', 3)
+        self.assertEqual((usage.summary(), usage.size, usage.count), ([], 3, 1))
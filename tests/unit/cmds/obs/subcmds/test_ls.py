@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from obscmd.cmds.obs.subcmds.ls import ListingWriter, LsCommand
+from obscmd.exceptions import NotSupportError
+from obscmd.testutils import mock
+
+
+class TestListingWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.outfile = os.path.join(self.tmpdir, 'out')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, fmt):
+        writer = ListingWriter('mybucket', fmt, self.outfile, echo=False)
+        writer.write_prefix(u'doc/')
+        writer.write_object(u'doc/a,"b"\tc', 12, 1533203155, '"etag"', 'STANDARD')
+        writer.close()
+        with io.open(self.outfile, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_jsonl(self):
+        lines = [json.loads(line) for line in self._write('jsonl')]
+        self.assertEqual(lines[0], {'prefix': 'doc/'})
+        self.assertEqual(lines[1], {'key': 'doc/a,"b"\tc', 'size': 12, 'mtime': 1533203155, 'etag': '"etag"',
+                                    'storageClass': 'STANDARD'})
+
+    def test_csv(self):
+        self.assertEqual(self._write('csv'), [u'key,size,mtime,etag,storageClass', u'doc/,,,,',
+                                              u'"doc/a,""b""\tc",12,1533203155,"""etag""",STANDARD'])
+
+    def test_tsv(self):
+        self.assertEqual(self._write('tsv')[2], u'doc/a,"b"\\tc\t12\t1533203155\t"etag"\tSTANDARD')
+
+    def test_echo_is_printed_once_on_close(self):
+        writer = ListingWriter('mybucket', 'jsonl', self.outfile, echo=True)
+        with mock.patch('obscmd.cmds.obs.subcmds.ls.uni_print') as uni_print:
+            writer.write_prefix(u'a/')
+            writer.write_prefix(u'b/')
+            self.assertFalse(uni_print.called)
+            writer.close()
+        uni_print.assert_called_once_with(u'{"prefix": "a/"}\n{"prefix": "b/"}\n')
+
+    def test_text(self):
+        lines = self._write('text')
+        self.assertTrue(lines[0].endswith(u'--\tobs://mybucket/doc/'))
+        self.assertTrue(lines[1].endswith(u'12B\tobs://mybucket/doc/a,"b"\tc'))
+
+
+class TestSnapshotOption(unittest.TestCase):
+
+    def test_snapshot_needs_recursive_object_listing(self):
+        ls = LsCommand.__new__(LsCommand)
+        for path, recursive in (('obs://mybucket/logs/', False), ('', True)):
+            args = argparse.Namespace(paths=path, recursive=recursive, snapshot='reuse', outfile=None)
+            self.assertRaises(NotSupportError, ls._run, args, None)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import argparse
+import unittest
+
+from obscmd.cmds.obs.subcmds.rm import RmCommand
+from obscmd.exceptions import NotSupportError
+from obscmd.testutils import mock
+from obscmd.utils import DotDict
+
+
+class TestRmFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.rm = RmCommand.__new__(RmCommand)
+        self.rm.obs_cmd_util = mock.Mock()
+        self.rm.obs_cmd_util.iter_objects_info.return_value = iter([('logs/2017-a', 10, 100), ('logs/2017-b', 2000, 100),
+                                                                    ('logs/2017-c', 10, 900)])
+        self.rm.include = '2017-*'
+        self.rm.exclude = '*'
+        self.rm.max_mtime = 500
+        self.rm.min_mtime = None
+        self.rm.min_size = None
+        self.rm.max_size = 1000
+        self.rm.dryrun = True
+        self.rm._outprint = mock.Mock()
+
+    def test_listing_is_narrowed_and_filtered(self):
+        self.assertEqual(list(self.rm.iter_listed('bucket', 'logs/')), [('logs/2017-a', 10, 100)])
+        args, kwargs = self.rm.obs_cmd_util.iter_objects_info.call_args
+        self.assertEqual(args[:2], ('bucket', 'logs/2017-'))
+        self.assertTrue(kwargs['match']('logs/2017-x'))
+        self.assertFalse(kwargs['match']('logs/2018-x'))
+
+    def test_dryrun_only_counts(self):
+        self.rm.delete_items('bucket', self.rm.iter_listed('bucket', 'logs/'))
+        self.rm._outprint.assert_called_once_with('dryrun: delete 1 objects, 10B')
+        self.assertFalse(self.rm.obs_cmd_util.delete_batches.called)
+
+
+class TestRmOptions(unittest.TestCase):
+
+    def setUp(self):
+        self.rm = RmCommand.__new__(RmCommand)
+        self.rm.client = mock.Mock()
+        self.rm._outprint = mock.Mock()
+        self.rm._warning_prompt = mock.Mock()
+
+    def _args(self, **kwargs):
+        args = dict(paths='obs://bucket/logs', recursive=False, versionid=None, all_versions=False, include=None,
+                    exclude=None, older_than=None, newer_than=None, min_size=None, max_size=None, keys_from=None,
+                    dryrun=False)
+        args.update(kwargs)
+        return argparse.Namespace(**args)
+
+    def test_all_versions_dryrun_deletes_nothing(self):
+        head = DotDict({'isTruncated': False})
+        versions = [DotDict({'key': 'logs/a', 'versionId': '1'}), DotDict({'key': 'logs/b', 'versionId': '1'})]
+        body = DotDict({'head': head, 'versions': versions, 'markers': []})
+        self.rm.client.listVersions.return_value = DotDict({'status': 200, 'body': body})
+        self.rm._run(self._args(recursive=True, all_versions=True, dryrun=True), None)
+        self.rm._outprint.assert_called_with('dryrun: delete 2 versions')
+        self.assertFalse(self.rm.client.deleteObjects.called)
+
+    def test_ignored_filters_are_rejected_before_the_prompt(self):
+        for kwargs in ({'all_versions': True, 'recursive': True, 'include': '*.log'},
+                       {'all_versions': True, 'min_size': '1M'},
+                       {'exclude': '*.tmp'},
+                       {'older_than': '30d'},
+                       {'versionid': '1', 'recursive': True},
+                       {'versionid': '1', 'all_versions': True},
+                       {'versionid': '1', 'keys_from': 'keys.txt'}):
+            self.assertRaises(NotSupportError, self.rm._run, self._args(**kwargs), None)
+        self.assertFalse(self.rm._warning_prompt.called)
+        self.assertFalse(self.rm.client.method_calls)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import threading
+import time
+import unittest
+
+from obscmd.cmds.obs.listing import ParallelLister, ordered_map, unordered_map
+from obscmd.exceptions import InternalError
+from tests.unit.cmds.obs.fixtures import FakeBucketClient
+
+
+KEYS = ['a.txt', 'a/1', 'a/2', 'a/b/1', 'ab', 'b/', 'b/x', 'c', 'd/1/2', 'd/3', 'e/f/g/h', 'z']
+
+
+class TestParallelLister(unittest.TestCase):
+
+    def test_ordered_listing_matches_sorted_keys(self):
+        for workers in (1, 3, 8):
+            lister = ParallelLister(FakeBucketClient(KEYS, page_size=20), workers=workers)
+            self.assertEqual([item.key for item in lister.iter_objects('bucket')], sorted(KEYS))
+
+    def test_deeper_fanout_and_prefix(self):
+        lister = ParallelLister(FakeBucketClient(KEYS, page_size=20), workers=4, fanout_depth=2)
+        self.assertEqual([item.key for item in lister.iter_objects('bucket')], sorted(KEYS))
+        self.assertEqual([item.key for item in lister.iter_objects('bucket', 'd/')], ['d/1/2', 'd/3'])
+
+    def test_unordered_listing_has_every_key_once(self):
+        lister = ParallelLister(FakeBucketClient(KEYS), workers=4)
+        keys = [item.key for item in lister.iter_objects('bucket', ordered=False)]
+        self.assertEqual(sorted(keys), sorted(KEYS))
+
+    def test_subtree_error_is_raised(self):
+        lister = ParallelLister(FakeBucketClient(KEYS, page_size=20, fail_prefix='d/'), workers=2)
+        self.assertRaises(InternalError, list, lister.iter_objects('bucket'))
+
+    def test_stop_early(self):
+        lister = ParallelLister(FakeBucketClient(['p%d/%d' % (i, j) for i in range(10) for j in range(50)]), workers=4)
+        threads = threading.active_count()
+        stream = lister.iter_objects('bucket')
+        self.assertEqual(next(stream).key, 'p0/0')
+        self.assertGreater(threading.active_count(), threads)
+        stream.close()
+        self.assertEqual(threading.active_count(), threads)
+
+
+class TestRangeSplitting(unittest.TestCase):
+
+    def setUp(self):
+        self.keys = ['%08x' % (i * 2654435761 % 2 ** 32) for i in range(300)] + ['', ' ', '!a', u'\u4e2d']
+        self.keys = [key for key in self.keys if key]
+
+    def test_flat_namespace_is_split_into_ranges(self):
+        client = FakeBucketClient(self.keys, page_size=10)
+        lister = ParallelLister(client, workers=4)
+        units = list(lister.plan('bucket'))
+        self.assertGreater(len(units), 4)
+        self.assertEqual([item.key for item in lister.iter_objects('bucket')], sorted(self.keys))
+        keys = [item.key for item in lister.iter_objects('bucket', ordered=False)]
+        self.assertEqual(sorted(keys), sorted(self.keys))
+
+    def test_common_start_is_descended(self):
+        keys = ['img_%04d' % i for i in range(200)] + ['img_']
+        lister = ParallelLister(FakeBucketClient(keys, page_size=10), workers=2)
+        units = list(lister.plan('bucket', 'img'))
+        self.assertGreater(len(units), 2)
+        self.assertEqual([item.key for item in lister.iter_objects('bucket', 'img')], sorted(keys))
+
+    def test_units_are_streamed(self):
+        keys = ['d%03d/x' % i for i in range(100)]
+        client = FakeBucketClient(keys, page_size=10)
+        lister = ParallelLister(client, workers=2)
+        self.assertEqual(next(lister.plan('bucket')).prefix, 'd000/')
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual([item.key for item in lister.iter_objects('bucket')], keys)
+
+    def test_later_object_pages_are_split(self):
+        keys = ['a/1', 'b/1', 'c/1'] + ['f%03d' % i for i in range(100)]
+        client = FakeBucketClient(keys, page_size=5)
+        lister = ParallelLister(client, workers=2)
+        self.assertEqual([item.key for item in lister.iter_objects('bucket')], keys)
+        self.assertEqual(len([call for call in client.calls if call[2] == '/']), 2)
+        listed = [item.key for item in lister.iter_objects('bucket', ordered=False)]
+        self.assertEqual(sorted(listed), keys)
+
+    def test_ranges_are_capped(self):
+        keys = ['%c%d' % (c, i) for c in range(0x21, 0x7f) for i in range(3)]
+        lister = ParallelLister(FakeBucketClient(keys, page_size=5), workers=2)
+        self.assertEqual(len(list(lister.plan('bucket'))), 2 * 4 + 1)
+        self.assertEqual([item.key for item in lister.iter_objects('bucket')], sorted(keys))
+
+
+class TestOrderedMap(unittest.TestCase):
+
+    def test_results_keep_item_order(self):
+        def slow_square(n):
+            time.sleep(0.001 * (10 - n))
+            return n * n
+
+        self.assertEqual(list(ordered_map(slow_square, range(10), workers=4)), [n * n for n in range(10)])
+
+    def test_error_is_raised_in_order(self):
+        def check(n):
+            if n == 3:
+                raise ValueError('failed %d' % n)
+            return n
+
+        results = []
+        with self.assertRaises(ValueError):
+            for result in ordered_map(check, range(6), workers=3):
+                results.append(result)
+        self.assertEqual(results, [0, 1, 2])
+
+    def test_any_error_reaches_the_caller(self):
+        def leave(n):
+            raise SystemExit(n)
+
+        threads = threading.active_count()
+        self.assertRaises(SystemExit, list, ordered_map(leave, range(3), workers=2))
+        self.assertRaises(SystemExit, list, unordered_map(leave, range(3), workers=2))
+        self.assertEqual(threading.active_count(), threads)
+
+
+class TestUnorderedMap(unittest.TestCase):
+
+    def test_every_result_once(self):
+        self.assertEqual(sorted(unordered_map(lambda n: n * 2, iter(range(50)), workers=4)), list(range(0, 100, 2)))
+
+    def test_items_are_read_lazily(self):
+        read = []
+
+        def items():
+            for n in range(1000):
+                read.append(n)
+                yield n
+
+        results = unordered_map(lambda n: n, items(), workers=2)
+        next(results)
+        results.close()
+        self.assertLess(len(read), 100)
+
+    def test_errors_are_raised(self):
+        def check(n):
+            if n == 5:
+                raise ValueError(n)
+            return n
+
+        def items():
+            for n in range(10):
+                yield n
+            raise KeyError('listing failed')
+
+        self.assertRaises(ValueError, list, unordered_map(check, range(10), workers=3))
+        self.assertRaises(KeyError, list, unordered_map(lambda n: n, items(), workers=3))
@@ -1,10 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
+import threading
 import unittest
 
+from obscmd import globl
 from obscmd.cmds.obs.obsutil import check_resp, split_bucket_key, get_bucket, join_bucket_key, join_obs_path, \
-    get_object_name
+    get_object_name, glob_literal_prefix, ObsCmdUtil, PeekIterator, filter_patterns, pattern_list_prefix, \
+    get_retry_policy
+from obs import RetryPolicy
 from obscmd.exceptions import InternalError
+from obscmd.testutils import mock
 from obscmd.utils import DotDict
 
 
@@ -55,3 +60,184 @@ class TestGetObjectName(unittest.TestCase):
         self.assertEqual(get_object_name('obs://bucket'), '')
         self.assertEqual(get_object_name('obs://bucket/key'), 'key')
         self.assertEqual(get_object_name('obs://bucket/key/key2'), 'key2')
+
+
+class TestIterObjects(unittest.TestCase):
+
+    def _page(self, keys, truncated, next_marker=None):
+        body = DotDict({'contents': [{'key': key} for key in keys], 'is_truncated': truncated,
+                        'next_marker': next_marker})
+        return DotDict({'status': 200, 'body': body})
+
+    def test_pages_follow_markers(self):
+        client = mock.Mock()
+        client.listObjects.side_effect = [self._page(['a', 'b'], True, 'b'), self._page(['c'], True),
+                                          self._page([], False)]
+        pages = ObsCmdUtil(client).iter_object_pages('bucket', 'p', threads=False)
+        keys = [item['key'] for page in pages for item in page]
+        self.assertEqual(keys, ['a', 'b', 'c'])
+        self.assertEqual([call[1]['marker'] for call in client.listObjects.call_args_list], [None, 'b', 'c'])
+
+    def test_iter_objects_info_stops_at_limit(self):
+        client = mock.Mock()
+        client.listObjects.side_effect = [self._page(['a', 'b'], True, 'b'), self._page(['c', 'd'], True, 'd'),
+                                          self._page(['e'], False)]
+        with mock.patch('obscmd.cmds.obs.obsutil.get_list_tasknum', return_value=1):
+            infos = ObsCmdUtil(client).iter_objects_info('bucket', 'p', ('key',), limit=1003, threads=False)
+            self.assertEqual(list(infos), [('a',), ('b',), ('c',), ('d',), ('e',)])
+        client.listObjects.side_effect = [self._page(['a', 'b', 'c'], True, 'c')]
+        self.assertEqual(ObsCmdUtil(client).get_objects_info('bucket', 'p', 'key', limit=2), ['a', 'b'])
+
+    def test_limit_is_passed_down_as_max_keys(self):
+        client = mock.Mock()
+        client.listObjects.side_effect = [self._page(['k%d' % i for i in range(1000)], True, 'k999'),
+                                          self._page(['x', 'y'], True, 'y')]
+        infos = ObsCmdUtil(client).iter_objects_info('bucket', 'p', 'key', limit=1002, threads=False)
+        self.assertEqual(len(list(infos)), 1002)
+        self.assertEqual([call[1]['max_keys'] for call in client.listObjects.call_args_list], [1000, 2])
+
+    def test_limit_counts_matching_keys(self):
+        client = mock.Mock()
+        client.listObjects.side_effect = [self._page(['a.log', 'b.txt'], True, 'b.txt'),
+                                          self._page(['c.log', 'd.log'], True, 'd.log')]
+        with mock.patch('obscmd.cmds.obs.obsutil.get_list_tasknum', return_value=1):
+            infos = ObsCmdUtil(client).iter_objects_info('bucket', None, 'key', limit=2, threads=False,
+                                                         match=lambda key: key.endswith('.log'))
+            self.assertEqual(list(infos), ['a.log', 'c.log'])
+        self.assertEqual(client.listObjects.call_count, 2)
+
+
+class TestBucketStorages(unittest.TestCase):
+
+    def setUp(self):
+        globl.init()
+        globl.set_value('lock', threading.Lock())
+        globl.set_value('value', [])
+
+    def test_storages_are_ordered_and_cached(self):
+        client = mock.Mock()
+        client.getBucketMetadata.side_effect = lambda bucket: DotDict(
+            {'status': 200, 'body': DotDict({'storageClass': 'GLACIER' if bucket.endswith('1') else 'STANDARD'})})
+        util = ObsCmdUtil(client)
+        with mock.patch.dict('obscmd.cmds.obs.obsutil._bucket_storage_cache', clear=True):
+            storages = list(util.iter_bucket_storages(['b0', 'b1', 'b2'], tasknum=3))
+            self.assertEqual(storages, ['STANDARD', 'COLD', 'STANDARD'])
+            self.assertEqual(util.get_bucket_storage('b1'), 'COLD')
+        self.assertEqual(client.getBucketMetadata.call_count, 3)
+
+
+class TestVersions(unittest.TestCase):
+
+    def setUp(self):
+        globl.init()
+        globl.set_value('lock', threading.Lock())
+        globl.set_value('value', [])
+
+    def _page(self, versions, markers, truncated, next_key=None, next_version=None):
+        head = DotDict({'isTruncated': truncated, 'nextKeyMarker': next_key, 'nextVersionIdMarker': next_version})
+        body = DotDict({'head': head, 'versions': [DotDict({'key': k, 'versionId': v}) for k, v in versions],
+                        'markers': [DotDict({'key': k, 'versionId': v}) for k, v in markers]})
+        return DotDict({'status': 200, 'body': body})
+
+    def test_delete_all_versions_of_a_key(self):
+        client = mock.Mock()
+        client.listVersions.side_effect = [self._page([('a', '2'), ('a', '1')], [('a', '3')], True, 'a', '1'),
+                                           self._page([('ab', '1')], [('a', '0')], True, 'ab', '1'),
+                                           self._page([('ac', '1')], [], False)]
+        client.deleteObjects.return_value = DotDict({'status': 200})
+        deleted = [item for batch, _ in ObsCmdUtil(client).delete_versions('bucket', key='a', tasknum=2)
+                   for item in batch]
+        self.assertEqual(sorted(deleted), [('a', '0'), ('a', '1'), ('a', '2'), ('a', '3')])
+        self.assertEqual(client.listVersions.call_count, 2)
+        second = client.listVersions.call_args_list[1][0][1]
+        self.assertEqual((second.prefix, second.key_marker, second.version_id_marker), ('a', 'a', '1'))
+        request = client.deleteObjects.call_args[1]['deleteObjectsRequest']
+        self.assertTrue(request.quiet)
+
+    def test_clear_bucket_deletes_versions_only(self):
+        client = mock.Mock()
+        client.listVersions.return_value = self._page([('a', 'null'), ('b', '1')], [('b', '2')], False)
+        client.deleteObjects.return_value = DotDict({'status': 200})
+        client.listMultipartUploads.return_value = DotDict({'status': 200, 'body': DotDict({'upload': []})})
+        deleted = [item for batch, _ in ObsCmdUtil(client).iter_clear_bucket('bucket') for item in batch]
+        self.assertEqual(sorted(deleted), [('a', 'null'), ('b', '1'), ('b', '2')])
+        self.assertFalse(client.listObjects.called)
+
+    def test_failed_keys_are_retried(self):
+        def errors(*keys):
+            error = [DotDict({'key': key, 'versionId': None, 'code': 'InternalError', 'message': 'busy'}) for key in keys]
+            return DotDict({'status': 200, 'body': DotDict({'error': error})})
+
+        client = mock.Mock()
+        client.deleteObjects.side_effect = [errors('b', 'c'), errors('c'), errors('c'), errors('c')]
+        policy = RetryPolicy(max_retry_count=3, base_delay=0)
+        deleted, failed = ObsCmdUtil(client).delete_batch('bucket', ['a', 'b', 'c'], policy)
+        self.assertEqual(deleted, ['a', 'b'])
+        self.assertEqual(failed, [('c', 'InternalError', 'busy')])
+        sent = [list(call[1]['deleteObjectsRequest'].objects) for call in client.deleteObjects.call_args_list]
+        self.assertEqual(sent, [['a', 'b', 'c'], ['b', 'c'], ['c'], ['c']])
+
+    def test_other_errors_are_not_retried(self):
+        error = DotDict({'key': 'b', 'versionId': None, 'code': 'AccessDenied', 'message': 'denied'})
+        client = mock.Mock()
+        client.deleteObjects.return_value = DotDict({'status': 200, 'body': DotDict({'error': [error]})})
+        deleted, failed = ObsCmdUtil(client).delete_batch('bucket', ['a', 'b'], RetryPolicy(base_delay=0))
+        self.assertEqual((deleted, failed), (['a'], [('b', 'AccessDenied', 'denied')]))
+        self.assertEqual(client.deleteObjects.call_count, 1)
+
+    def test_batches_use_the_client_retry_policy(self):
+        error = DotDict({'key': 'a', 'versionId': None, 'code': 'InternalError', 'message': 'busy'})
+        client = mock.Mock()
+        client.retry_policy = RetryPolicy(max_retry_count=1, base_delay=0)
+        client.deleteObjects.return_value = DotDict({'status': 200, 'body': DotDict({'error': [error]})})
+        results = list(ObsCmdUtil(client).delete_batches('bucket', ['a'], tasknum=1))
+        self.assertEqual(results, [([], [('a', 'InternalError', 'busy')])])
+        self.assertEqual(client.deleteObjects.call_count, 2)
+
+    def test_job_retry_policy_is_built_once(self):
+        self.assertIs(get_retry_policy(), get_retry_policy())
+
+
+class TestGlobLiteralPrefix(unittest.TestCase):
+    def test_glob_literal_prefix(self):
+        self.assertEqual(glob_literal_prefix('logs/2024-*'), 'logs/2024-')
+        self.assertEqual(glob_literal_prefix('logs/a?c/*.log'), 'logs/a')
+        self.assertEqual(glob_literal_prefix('[ab]*'), '')
+        self.assertEqual(glob_literal_prefix('plain.txt'), 'plain.txt')
+
+    def test_pattern_list_prefix(self):
+        self.assertEqual(pattern_list_prefix('logs/', '*', '2024-*'), 'logs/2024-')
+        self.assertEqual(pattern_list_prefix('logs', '*', '2024-*'), 'logs/2024-')
+        self.assertEqual(pattern_list_prefix('logs/', '*.tmp', '2024-*'), 'logs/')
+        self.assertEqual(pattern_list_prefix('logs/', '*', '*.log'), 'logs/')
+
+    def test_filter_patterns(self):
+        self.assertTrue(filter_patterns('logs/a.tmp', 'logs/', '*.tmp', None))
+        self.assertFalse(filter_patterns('logs/keep.tmp', 'logs/', '*.tmp', 'keep*'))
+        self.assertFalse(filter_patterns('logs/a.log', 'logs/', '*.tmp', None))
+
+    def test_object_keys_match_case_sensitively(self):
+        with mock.patch('os.path.normcase', lambda path: path.lower()):
+            self.assertFalse(filter_patterns('logs/A.TMP', 'logs/', '*.tmp', None, obs_key=True))
+            self.assertTrue(filter_patterns('logs/a.tmp', 'logs', '*.tmp', None, obs_key=True))
+            self.assertTrue(filter_patterns('logs/A.TMP', 'logs/', '*.tmp', None))
+
+
+class TestPeekIterator(unittest.TestCase):
+
+    def test_items_are_pulled_lazily(self):
+        pulled = []
+
+        def items():
+            for i in range(3):
+                pulled.append(i)
+                yield i
+
+        peek = PeekIterator(items())
+        self.assertEqual(pulled, [])
+        self.assertFalse(peek.empty())
+        self.assertEqual(pulled, [0])
+        self.assertEqual(peek.get(), 0)
+        self.assertEqual(list(peek), [1, 2])
+        self.assertTrue(peek.empty())
+        self.assertRaises(IndexError, peek.get)
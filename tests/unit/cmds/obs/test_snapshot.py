@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from obscmd.cmds.obs.obsutil import ObsCmdUtil
+from obscmd.cmds.obs.snapshot import SnapshotStore, prefix_upper, APPEND, FULL, REUSE
+from tests.unit.cmds.obs.fixtures import FakeBucketClient
+
+KEYS = ['logs/2024-06-01/a', 'logs/2024-06-01/b', 'logs/2024-06-02/a', 'logs/2024-06-02/b', 'other']
+
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.store = SnapshotStore(os.path.join(self.tmpdir, 'listing.db'))
+        self.client = FakeBucketClient(KEYS, page_size=2)
+        self.util = ObsCmdUtil(self.client)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_reuse_lists_once(self):
+        self.assertEqual(self.store.sync(self.util, 'b', 'logs/'), 4)
+        calls = len(self.client.calls)
+        self.assertEqual(self.store.sync(self.util, 'b', 'logs/', REUSE), 0)
+        self.assertEqual(len(self.client.calls), calls)
+        self.assertEqual(list(self.store.query('b', 'logs/2024-06-02/', ('key', 'size'))),
+                         [('logs/2024-06-02/a', 17), ('logs/2024-06-02/b', 17)])
+        self.assertEqual(list(self.store.query('b', 'logs/', 'key', start_after='logs/2024-06-01/b', limit=1)),
+                         ['logs/2024-06-02/a'])
+
+    def test_append_relists_only_the_last_partition(self):
+        self.store.sync(self.util, 'b', 'logs/')
+        self.client.keys = sorted(KEYS + ['logs/2024-06-02/c', 'logs/2024-06-03/a'])
+        del self.client.calls[:]
+        self.assertEqual(self.store.sync(self.util, 'b', 'logs/', APPEND), 4)
+        self.assertEqual(self.client.calls[0][1], 'logs/2024-06-01/b')
+        self.assertEqual(list(self.store.query('b', 'logs/')), sorted(self.client.keys)[:-1])
+
+    def test_interrupted_sync_resumes_from_checkpoint(self):
+        self.store.conn.execute("INSERT INTO snapshots VALUES ('b', 'logs/', 0, 0, 'logs/2024-06-01/b')")
+        self.store.sync(self.util, 'b', 'logs/')
+        self.assertEqual(self.client.calls[0][1], 'logs/2024-06-01/b')
+        self.assertEqual(list(self.store.query('b', 'logs/')), ['logs/2024-06-02/a', 'logs/2024-06-02/b'])
+
+    def test_full_drops_old_rows(self):
+        self.store.sync(self.util, 'b', 'logs/')
+        self.client.keys = ['logs/new']
+        self.store.sync(self.util, 'b', 'logs/', FULL)
+        self.assertEqual(list(self.store.query('b', 'logs/')), ['logs/new'])
+
+    def test_prefix_upper(self):
+        self.assertEqual(prefix_upper('logs/'), 'logs0')
+        self.assertEqual(prefix_upper(''), None)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""
+recorded response bodies used by the parser tests and benchmarks
+"""
+
+NAMESPACE = 'xmlns="http://obs.myhwclouds.com/doc/2015-06-30/"'
+
+LIST_OBJECTS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<ListBucketResult ' + NAMESPACE + '>'
+    '<Name>bucket</Name><Prefix>doc/</Prefix><Marker></Marker><NextMarker>doc/b.txt</NextMarker>'
+    '<MaxKeys>1000</MaxKeys><IsTruncated>true</IsTruncated>'
+    '<Contents><Key>doc/a&amp;b.txt</Key><LastModified>2018-08-02T09:45:55.000Z</LastModified>'
+    '<ETag>"d7deee6cced029b4ca652a59c768538e-2"</ETag><Size>15668606</Size>'
+    '<Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner><StorageClass>STANDARD</StorageClass></Contents>'
+    u'<Contents><Key>doc/中文.txt</Key><LastModified>2018-08-03T01:02:03.456Z</LastModified>'
+    '<ETag>"0f1e2d3c4b5a69788796a5b4c3d2e1f0"</ETag><Size>0</Size>'
+    '<Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner><StorageClass>WARM</StorageClass>'
+    '<Type>Appendable</Type></Contents>'
+    '<CommonPrefixes><Prefix>doc/sub/</Prefix></CommonPrefixes>'
+    '</ListBucketResult>')
+
+# a short page, the first owner also has a DisplayName
+LIST_OBJECTS_PAGE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<ListBucketResult xmlns="http://obs.myhwclouds.com/doc/2015-06-30/">'
+    '<Name>bucket</Name><Prefix>doc/</Prefix><Marker></Marker><NextMarker>doc/b.txt</NextMarker>'
+    '<MaxKeys>1000</MaxKeys><IsTruncated>true</IsTruncated>'
+    '<Contents><Key>doc/a.txt</Key><LastModified>2018-08-02T09:45:55.000Z</LastModified>'
+    '<ETag>"d7deee6c"</ETag><Size>15</Size><Owner><ID>8be8301b</ID><DisplayName>name</DisplayName></Owner>'
+    '<StorageClass>STANDARD</StorageClass></Contents>'
+    '<Contents><Key>doc/b.txt</Key><LastModified>2018-08-03T01:02:03.456Z</LastModified>'
+    '<ETag>"0f1e2d3c"</ETag><Size>0</Size><Owner><ID>8be8301b</ID></Owner>'
+    '<StorageClass>WARM</StorageClass><Type>Appendable</Type></Contents>'
+    '<CommonPrefixes><Prefix>doc/sub/</Prefix></CommonPrefixes>'
+    '</ListBucketResult>')
+
+LIST_VERSIONS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<ListVersionsResult ' + NAMESPACE + '>'
+    '<Name>bucket</Name><Prefix></Prefix><KeyMarker></KeyMarker><VersionIdMarker></VersionIdMarker>'
+    '<NextKeyMarker>b.txt</NextKeyMarker><NextVersionIdMarker>G001117FCE89978B0000401205D5DC9A</NextVersionIdMarker>'
+    '<MaxKeys>1000</MaxKeys><IsTruncated>true</IsTruncated>'
+    '<Version><Key>a.txt</Key><VersionId>G001117FCE89978B0000401205D5DC9A</VersionId><IsLatest>true</IsLatest>'
+    '<LastModified>2018-08-02T09:45:55.000Z</LastModified><ETag>"d7deee6cced029b4ca652a59c768538e"</ETag>'
+    '<Size>15</Size><Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner><StorageClass>STANDARD</StorageClass></Version>'
+    '<DeleteMarker><Key>b.txt</Key><VersionId>G001117FCE89978B0000401205D5DC9B</VersionId><IsLatest>true</IsLatest>'
+    '<LastModified>2018-08-03T01:02:03.456Z</LastModified><Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner>'
+    '</DeleteMarker>'
+    '</ListVersionsResult>')
+
+INITIATE_MULTIPART_UPLOAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<InitiateMultipartUploadResult ' + NAMESPACE + '>'
+    '<Bucket>bucket</Bucket><Key>big/file.iso</Key><UploadId>00000164D6DDFB3F4012DFBB1B5D0E07</UploadId>'
+    '</InitiateMultipartUploadResult>')
+
+LIST_MULTIPART_UPLOADS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<ListMultipartUploadsResult ' + NAMESPACE + '>'
+    '<Bucket>bucket</Bucket><KeyMarker></KeyMarker><UploadIdMarker></UploadIdMarker>'
+    '<NextKeyMarker>big/file.iso</NextKeyMarker><NextUploadIdMarker>00000164D6DDFB3F4012DFBB1B5D0E07</NextUploadIdMarker>'
+    '<MaxUploads>1000</MaxUploads><IsTruncated>false</IsTruncated>'
+    '<Upload><Key>big/file.iso</Key><UploadId>00000164D6DDFB3F4012DFBB1B5D0E07</UploadId>'
+    '<Initiator><ID>8be8301bdfc7469aaf721d0504826420</ID></Initiator>'
+    '<Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner>'
+    '<StorageClass>STANDARD</StorageClass><Initiated>2018-08-02T09:45:55.000Z</Initiated></Upload>'
+    '<CommonPrefixes><Prefix>big/sub/</Prefix></CommonPrefixes>'
+    '</ListMultipartUploadsResult>')
+
+LIST_PARTS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<ListPartsResult ' + NAMESPACE + '>'
+    '<Bucket>bucket</Bucket><Key>big/file.iso</Key><UploadId>00000164D6DDFB3F4012DFBB1B5D0E07</UploadId>'
+    '<Initiator><ID>8be8301bdfc7469aaf721d0504826420</ID></Initiator>'
+    '<Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner>'
+    '<StorageClass>STANDARD</StorageClass><PartNumberMarker>0</PartNumberMarker>'
+    '<NextPartNumberMarker>2</NextPartNumberMarker><MaxParts>1000</MaxParts><IsTruncated>false</IsTruncated>'
+    '<Part><PartNumber>1</PartNumber><LastModified>2018-08-02T09:45:55.000Z</LastModified>'
+    '<ETag>"d7deee6cced029b4ca652a59c768538e"</ETag><Size>5242880</Size></Part>'
+    '<Part><PartNumber>2</PartNumber><LastModified>2018-08-02T09:46:01.000Z</LastModified>'
+    '<ETag>"0f1e2d3c4b5a69788796a5b4c3d2e1f0"</ETag><Size>1024</Size></Part>'
+    '</ListPartsResult>')
+
+COMPLETE_MULTIPART_UPLOAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<CompleteMultipartUploadResult ' + NAMESPACE + '>'
+    '<Location>/bucket/big/file.iso</Location><Bucket>bucket</Bucket><Key>big/file.iso</Key>'
+    '<ETag>"03f814825e5a691489b947a2e120b2d3-2"</ETag>'
+    '</CompleteMultipartUploadResult>')
+
+DELETE_OBJECTS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<DeleteResult ' + NAMESPACE + '>'
+    '<Deleted><Key>a.txt</Key></Deleted>'
+    '<Deleted><Key>b.txt</Key><DeleteMarker>true</DeleteMarker>'
+    '<DeleteMarkerVersionId>G001117FCE89978B0000401205D5DC9C</DeleteMarkerVersionId></Deleted>'
+    '<Error><Key>c.txt</Key><Code>AccessDenied</Code><Message>Access Denied</Message></Error>'
+    '</DeleteResult>')
+
+PARSE_METHODS = (
+    ('listObjects', LIST_OBJECTS),
+    ('listVersions', LIST_VERSIONS),
+    ('initiateMultipartUpload', INITIATE_MULTIPART_UPLOAD),
+    ('listMultipartUploads', LIST_MULTIPART_UPLOADS),
+    ('listParts', LIST_PARTS),
+    ('completeMultipartUpload', COMPLETE_MULTIPART_UPLOAD),
+    ('deleteObjects', DELETE_OBJECTS),
+    ('deleteObjectsQuiet', DELETE_OBJECTS),
+)
+
+
+def list_objects_page(count):
+    contents = ''.join(
+        '<Contents><Key>dir/sub/object-%08d.dat</Key><LastModified>2018-08-02T09:45:55.000Z</LastModified>'
+        '<ETag>"d7deee6cced029b4ca652a59c768538e"</ETag><Size>%d</Size>'
+        '<Owner><ID>8be8301bdfc7469aaf721d0504826420</ID></Owner><StorageClass>STANDARD</StorageClass></Contents>'
+        % (i, i * 1024) for i in range(count))
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><ListBucketResult ' + NAMESPACE + '>'
+            '<Name>bucket</Name><MaxKeys>1000</MaxKeys><IsTruncated>false</IsTruncated>%s</ListBucketResult>' % contents)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import base64
+import hashlib
+import hmac
+
+from obscmd.testutils import unittest, mock
+from obs import auth, convertor, ObsClient
+
+
+AK = 'AKIDEXAMPLE'
+SK = 'wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY'
+
+
+class TestCanonicalString(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = auth.Authentication(AK, SK, False, convertor.Adapter('v2'))
+
+    def test_headers_key_and_resources(self):
+        headers = {'Content-Type': 'text/plain', 'Date': 'Mon, 19 Oct 2026 08:00:00 GMT', 'x-amz-meta-Name': ' v ',
+                   'X-Amz-Acl': 'private', 'Range': 'bytes=0-1'}
+        path_args = {'uploadId': 'u1', 'partNumber': '2', 'acl': None, 'prefix': 'p'}
+        for _ in range(2):
+            ret = self.auth.getSignature('PUT', 'bucket', 'dir/a b', path_args, headers)
+            self.assertEqual(ret['CanonicalString'], 'PUT\n\ntext/plain\nMon, 19 Oct 2026 08:00:00 GMT\n'
+                                                     'x-amz-acl:private\nx-amz-meta-name:v\n'
+                                                     '/bucket/dir/a%20b?acl&partNumber=2&uploadId=u1')
+
+    def test_date_header_and_expires(self):
+        headers = {'x-amz-date': 'Mon, 19 Oct 2026 08:00:00 GMT', 'Date': 'x'}
+        ret = self.auth.getSignature('GET', 'bucket', None, {'prefix': 'p'}, headers, '1700000000')
+        self.assertEqual(ret['CanonicalString'], 'GET\n\n\n1700000000\nx-amz-date:Mon, 19 Oct 2026 08:00:00 GMT\n/bucket/')
+
+
+class TestSigner(unittest.TestCase):
+
+    def setUp(self):
+        self.ha = convertor.Adapter('v2')
+        self.headers = {'Content-Type': 'text/plain', 'Date': 'Mon, 19 Oct 2026 08:00:00 GMT', 'x-amz-meta-a': ' b '}
+
+    def test_v2_signature(self):
+        signer = auth.Signer(AK, SK, False, self.ha)
+        for _ in range(2):
+            ret = signer.v2Auth.getSignature('PUT', 'bucket', 'key', {'acl': None}, self.headers)
+            expected = base64.b64encode(hmac.new(SK.encode('UTF-8'), ret['CanonicalString'].encode('UTF-8'),
+                                                 hashlib.sha1).digest()).decode('UTF-8')
+            self.assertEqual(ret['Signature'], expected)
+
+    def test_v4_signing_key_cached_per_date_and_region(self):
+        signer = auth.Signer(AK, SK, False, self.ha)
+        uncached = auth.V4Authentication(AK, SK, 'region', '20261019', '20261019T080000Z', False, self.ha)
+        expected = uncached.doAuth('GET', 'bucket', 'key', {}, dict(self.headers))
+        with mock.patch.object(auth.V4Authentication, 'deriveSigningKey',
+                               autospec=True, side_effect=auth.V4Authentication.deriveSigningKey) as derive:
+            for _ in range(3):
+                ret = signer.getV4Authentication('region', '20261019', '20261019T080000Z').doAuth(
+                    'GET', 'bucket', 'key', {}, dict(self.headers))
+                self.assertEqual(ret, expected)
+            self.assertEqual(derive.call_count, 1)
+            signer.getV4Authentication('region', '20261020', '20261020T080000Z').getSigningKey()
+            signer.getV4Authentication('other', '20261020', '20261020T080000Z').getSigningKey()
+            self.assertEqual(derive.call_count, 3)
+
+    def test_client_signer_follows_refresh(self):
+        client = ObsClient(AK, SK, server='obs.example.com')
+        signer = client._get_signer()
+        self.assertIs(client._get_signer(), signer)
+        client.refresh('ak2', 'sk2')
+        self.assertIsNot(client._get_signer(), signer)
+        self.assertEqual(client._get_signer().ak, 'ak2')
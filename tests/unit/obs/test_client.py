@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import socket
+import threading
+
+from obscmd.testutils import unittest, mock
+from obs import ObsClient, RetryPolicy
+from obs.client import _RedirectException
+from obs.model import GetResult, FastGetResult
+from tests.unit.obs.fixtures import LIST_OBJECTS_PAGE
+
+
+class TestConnectionTuning(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.address = self.server.getsockname()
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_default_chunk_size(self):
+        client = ObsClient('ak', 'sk', server='obs.example.com')
+        self.assertEqual(client.chunk_size, 65536)
+        self.assertIsNone(client._get_socket_buffer_size())
+
+    def test_configured_bdp(self):
+        client = ObsClient('ak', 'sk', server='obs.example.com', bandwidth=1250000000, rtt=0.08)
+        self.assertEqual(client.chunk_size, 4 * 1024 * 1024)
+        self.assertEqual(client._get_socket_buffer_size(), 64 * 1024 * 1024)
+
+    def test_explicit_chunk_size_is_kept(self):
+        client = ObsClient('ak', 'sk', server='obs.example.com', chunk_size=8192, bandwidth=1250000000, rtt=0.08)
+        client._update_rtt(0.2)
+        self.assertEqual(client.chunk_size, 8192)
+
+    def test_connect_measures_rtt_and_sets_buffers(self):
+        client = ObsClient('ak', 'sk', server='obs.example.com', socket_buffer_size=256 * 1024)
+        sock = client._create_connection(self.address, timeout=5)
+        try:
+            self.assertIsNotNone(client.rtt)
+            self.assertGreaterEqual(sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF), 256 * 1024)
+        finally:
+            sock.close()
+
+    def test_configured_rtt_is_not_measured(self):
+        client = ObsClient('ak', 'sk', server='obs.example.com', bandwidth=1250000000, rtt=0.08)
+        sock = client._create_connection(self.address, timeout=5)
+        sock.close()
+        self.assertEqual(client.rtt, 0.08)
+        self.assertEqual(client.chunk_size, 4 * 1024 * 1024)
+
+
+class FakeServer(threading.Thread):
+    """Accepts one connection, answers the Expect header with `interim` and
+    reads the body only when the interim response is 100 Continue."""
+
+    def __init__(self, interim):
+        super(FakeServer, self).__init__()
+        self.daemon = True
+        self.interim = interim
+        self.request = b''
+        self.body = b''
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(1)
+        self.port = self.sock.getsockname()[1]
+
+    def run(self):
+        conn, _ = self.sock.accept()
+        try:
+            while b'\r\n\r\n' not in self.request:
+                self.request += conn.recv(1024)
+            self.request, self.body = self.request.split(b'\r\n\r\n', 1)
+            conn.sendall(self.interim)
+            if self.interim.startswith(b'HTTP/1.1 100'):
+                while len(self.body) < 100:
+                    self.body += conn.recv(1024)
+                conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\nETag: "abc"\r\n\r\n')
+        finally:
+            conn.close()
+            self.sock.close()
+
+
+class TestExpectContinue(unittest.TestCase):
+
+    def _put(self, interim, threshold=1):
+        server = FakeServer(interim)
+        server.start()
+        client = ObsClient('ak', 'sk', server='127.0.0.1:%d' % server.port, is_secure=False,
+                           expect_continue_threshold=threshold, expect_continue_timeout=5,
+                           retry_policy=RetryPolicy(max_retry_count=0))
+        resp = client.putContent('bucket', 'key', 'x' * 100)
+        server.join(5)
+        return server, resp
+
+    def test_body_sent_after_continue(self):
+        server, resp = self._put(b'HTTP/1.1 100 Continue\r\n\r\n')
+        self.assertIn(b'Expect: 100-continue', server.request)
+        self.assertEqual(server.body, b'x' * 100)
+        self.assertEqual(resp.status, 200)
+
+    def test_body_not_sent_when_rejected(self):
+        error = b'<Error><Code>AccessDenied</Code><Message>denied</Message></Error>'
+        server, resp = self._put(b'HTTP/1.1 403 Forbidden\r\nContent-Length: %d\r\n\r\n' % len(error) + error)
+        self.assertEqual(server.body, b'')
+        self.assertEqual(resp.status, 403)
+        self.assertEqual(resp.errorCode, 'AccessDenied')
+
+    def test_buffered_ssl_response_skips_select(self):
+        data = iter([b'HTTP/1.1 100 Continue\r\n\r\n'[i:i + 1] for i in range(25)])
+        sock = mock.Mock(pending=mock.Mock(return_value=25), recv=lambda size: next(data))
+        client = ObsClient('ak', 'sk', server='obs.example.com', expect_continue_timeout=5)
+        with mock.patch('obs.client.select.select') as select:
+            self.assertIsNone(client._wait_for_continue(mock.Mock(sock=sock), 'PUT'))
+        self.assertFalse(select.called)
+
+    def test_small_body_has_no_expect(self):
+        server = FakeServer(b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n')
+        server.start()
+        client = ObsClient('ak', 'sk', server='127.0.0.1:%d' % server.port, is_secure=False,
+                           expect_continue_threshold=1000)
+        resp = client.putContent('bucket', 'key', 'x' * 100)
+        server.join(5)
+        self.assertNotIn(b'Expect', server.request)
+        self.assertEqual(resp.status, 200)
+
+
+class TestRedirectCache(unittest.TestCase):
+
+    def setUp(self):
+        self.client = ObsClient('ak', 'sk', server='obs.example.com', retry_policy=RetryPolicy(max_retry_count=0))
+        self.locations = []
+
+        def make_request_internal(method, bucketName, objectKey=None, pathArgs=None, headers=None, entity=None,
+                                  chunkedMode=False, redirectLocation=None):
+            self.locations.append(redirectLocation)
+            return mock.Mock()
+        self.client._make_request_internal = make_request_internal
+
+    def _redirect(self, status):
+        return _RedirectException('redirect', 'https://bucket.obs.other.com/key?acl', status)
+
+    def test_permanent_redirect_is_cached(self):
+        self.client._parse_xml = mock.Mock(side_effect=[self._redirect(301), GetResult(status=200), GetResult(status=200)])
+        self.client._make_request('GET', 'bucket', 'key')
+        self.client._make_request('GET', 'bucket', 'key')
+        self.assertEqual(self.locations, [None, 'https://bucket.obs.other.com/key?acl', 'https://bucket.obs.other.com'])
+
+    def test_temporary_redirect_is_not_cached(self):
+        self.client._parse_xml = mock.Mock(side_effect=[self._redirect(307), GetResult(status=200), GetResult(status=200)])
+        self.client._make_request('GET', 'bucket', 'key')
+        self.client._make_request('GET', 'bucket', 'key')
+        self.assertEqual(self.locations[-1], None)
+
+    def test_server_error_invalidates_cache(self):
+        self.client._parse_xml = mock.Mock(side_effect=[self._redirect(301), GetResult(status=200), GetResult(status=500),
+                                                        GetResult(status=200)])
+        self.client._make_request('GET', 'bucket', 'key')
+        self.client._make_request('GET', 'bucket', 'key')
+        self.client._make_request('GET', 'bucket', 'key')
+        self.assertEqual(self.locations[-1], None)
+
+    def test_connection_error_falls_back_to_endpoint(self):
+        self.client._parse_xml = mock.Mock(side_effect=[self._redirect(301), GetResult(status=200), socket.error(),
+                                                        GetResult(status=200)])
+        self.client._make_request('GET', 'bucket', 'key')
+        result = self.client._make_request('GET', 'bucket', 'key')
+        self.assertEqual(result.status, 200)
+        self.assertEqual(self.locations[-2:], ['https://bucket.obs.other.com', None])
+
+
+class FakeHTTPResponse(object):
+
+    def __init__(self, status, headers, body=b''):
+        self.status = status
+        self.reason = 'OK'
+        self._headers = headers
+        self._body = [body]
+
+    def getheaders(self):
+        return self._headers
+
+    def read(self, size=-1):
+        return self._body.pop() if self._body else b''
+
+
+class TestFastGetResult(unittest.TestCase):
+
+    def setUp(self):
+        self.client = ObsClient('ak', 'sk', server='obs.example.com')
+        self.headers = [('ETag', '"abc"'), ('x-amz-request-id', 'req'), ('x-amz-meta-name', 'value'), ('Server', 'OBS')]
+
+    def test_hot_path_returns_fast_result(self):
+        with mock.patch.object(self.client, '_rename_response_headers', wraps=self.client._rename_response_headers) as rename:
+            result = self.client._parse_xml_internal(FakeHTTPResponse(200, self.headers), 'uploadPart')
+            self.assertIsInstance(result, FastGetResult)
+            self.assertEqual(result.status, 200)
+            self.assertEqual(result.body.etag, '"abc"')
+            self.assertEqual(result['requestId'], 'req')
+            self.assertEqual(rename.call_count, 0)
+            self.assertIn(('name', 'value'), result.header)
+            self.assertIn(('etag', '"abc"'), result.header)
+            self.assertIs(result.header, result.header)
+            self.assertEqual(rename.call_count, 1)
+
+    def test_fast_result_behaves_like_get_result(self):
+        result = self.client._parse_xml_internal(FakeHTTPResponse(200, self.headers), 'uploadPart')
+        self.assertIsInstance(result, GetResult)
+        self.assertEqual(result.Status, 200)
+        self.assertIn('header', result)
+        self.assertIn('header', list(result.keys()))
+        self.assertEqual(dict(result)['requestId'], 'req')
+        self.assertIn(('name', 'value'), result['header'])
+
+    def test_other_methods_return_get_result(self):
+        result = self.client._parse_xml_internal(FakeHTTPResponse(200, self.headers), 'putContent')
+        self.assertIsInstance(result, GetResult)
+        self.assertIn(('name', 'value'), result.header)
+
+    def test_fast_result_carries_errors(self):
+        body = b'<Error><Code>NoSuchUpload</Code><Message>no upload</Message><RequestId>req</RequestId></Error>'
+        result = self.client._parse_xml_internal(FakeHTTPResponse(404, self.headers, body), 'uploadPart')
+        self.assertEqual(result.status, 404)
+        self.assertEqual(result.errorCode, 'NoSuchUpload')
+        self.assertEqual(result.get('errorMessage'), 'no upload')
+
+
+class TestCreateSignedUrls(unittest.TestCase):
+
+    def test_bulk_urls_match_single_urls(self):
+        for signature in ('v2', 'obs'):
+            client = ObsClient('ak', 'sk', server='obs.example.com', signature=signature)
+            keys = ['a.txt', 'dir/b c.txt', u'中文.txt']
+            with mock.patch('time.time', return_value=1700000000):
+                bulk = list(client.createSignedUrls('GET', 'bucket', keys, expires=600))
+                single = [(key, client.createSignedUrl('GET', 'bucket', key, expires=600).signedUrl) for key in keys]
+            self.assertEqual(bulk, single)
+
+    def test_signed_host_keeps_port_separator(self):
+        for signature in ('v2', 'obs'):
+            client = ObsClient('ak', 'sk', server='obs.example.com', port=8080, signature=signature)
+            with mock.patch('time.time', return_value=1700000000):
+                result = client.createSignedUrl('GET', 'bucket', 'a.txt')
+                bulk = list(client.createSignedUrls('GET', 'bucket', ['a.txt']))
+            self.assertEqual(result.actualSignedRequestHeaders['Host'], 'bucket.obs.example.com:8080')
+            self.assertEqual(bulk, [('a.txt', result.signedUrl)])
+        client = ObsClient('ak', 'sk', server='obs.example.com', port=8080, signature='v4')
+        result = client.createSignedUrl('GET', 'bucket', 'a.txt')
+        self.assertEqual(result.actualSignedRequestHeaders['Host'], 'bucket.obs.example.com:8080')
+
+    def test_bulk_urls_v4(self):
+        client = ObsClient('ak', 'sk', server='obs.example.com', signature='v4')
+        urls = list(client.createSignedUrls('GET', 'bucket', ['a.txt', 'b.txt']))
+        self.assertEqual([key for key, _ in urls], ['a.txt', 'b.txt'])
+        self.assertIn('X-Amz-Signature=', urls[0][1])
+
+
+class TestListObjectsStream(unittest.TestCase):
+
+    def test_list_objects_uses_stream_parser(self):
+        client = ObsClient('ak', 'sk', server='obs.example.com', signature='obs')
+        response = FakeHTTPResponse(200, [('x-obs-request-id', 'req')], LIST_OBJECTS_PAGE.encode('UTF-8'))
+
+        with mock.patch.object(client, '_make_request_internal', return_value=object()), \
+                mock.patch.object(client, '_get_response', return_value=response), \
+                mock.patch('obs.util.do_close'):
+            result = client.listObjects('bucket', prefix='doc/', skipOwner=True)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(result.requestId, 'req')
+        self.assertEqual(len(result.body.contents), 2)
+        self.assertIsNone(result.body.contents[0].get('owner'))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import re
+
+from obscmd.testutils import unittest, mock
+from obs import xmlbackend
+from obs.convertor import Adapter, Convertor, ListObjectsParser
+from obs.model import CompactContent, DeleteObjectsRequest, Object
+from tests.unit.obs.fixtures import LIST_OBJECTS_PAGE
+
+class TestListObjectsParser(unittest.TestCase):
+
+    def _parse(self, convertor, skipOwner=False, compact=False, chunk_size=17):
+        data = LIST_OBJECTS_PAGE.encode('UTF-8')
+        parser = ListObjectsParser(convertor, skipOwner, compact)
+        for i in range(0, len(data), chunk_size):
+            parser.feed(data[i:i + chunk_size])
+        return parser.close({})
+
+    def test_same_result_as_tree_parser(self):
+        for signature in ('obs', 'v2'):
+            convertor = Convertor(signature, Adapter(signature))
+            expected = convertor.parseListObjects(re.sub('xmlns="http.*?"', '', LIST_OBJECTS_PAGE), {})
+            self.assertEqual(repr(self._parse(convertor)), repr(expected))
+
+    def test_python2_pull_parser_gives_same_result(self):
+        convertor = Convertor('obs', Adapter('obs'))
+        expected = repr(self._parse(convertor))
+        with mock.patch.object(xmlbackend, 'pull_parser', xmlbackend._PullParser):
+            self.assertEqual(repr(self._parse(convertor)), expected)
+
+    def test_skip_owner(self):
+        body = self._parse(Convertor('obs', Adapter('obs')), skipOwner=True)
+        self.assertEqual([item['key'] for item in body.contents], ['doc/a.txt', 'doc/b.txt'])
+        self.assertIsNone(body.contents[0].get('owner'))
+        self.assertTrue(body.contents[1]['isAppendable'])
+        self.assertEqual(body.next_marker, 'doc/b.txt')
+        self.assertEqual(body.commonPrefixs[0]['prefix'], 'doc/sub/')
+
+    def test_compact_rows(self):
+        body = self._parse(Convertor('obs', Adapter('obs')), skipOwner=True, compact=True)
+        item = body.contents[1]
+        self.assertIsInstance(item, CompactContent)
+        self.assertEqual((item['key'], item['size'], item.get('storageClass')), ('doc/b.txt', 0, 'WARM'))
+        self.assertIsNone(item.get('owner'))
+        self.assertRaises(KeyError, item.__getitem__, 'missing')
+
+
+class TestDeleteObjects(unittest.TestCase):
+
+    def setUp(self):
+        self.convertor = Convertor('obs', Adapter('obs'))
+
+    def test_request_accepts_keys_tuples_and_objects(self):
+        request = DeleteObjectsRequest(quiet=True, objects=['a&b.txt', ('c<d>', 'v1'), Object(key=u'中文')])
+        entity = self.convertor.trans_delete_objects_request(request)
+        self.assertEqual(entity, u'<Delete><Quiet>true</Quiet><Object><Key>a&amp;b.txt</Key></Object>'
+                                 u'<Object><Key>c&lt;d&gt;</Key><VersionId>v1</VersionId></Object>'
+                                 u'<Object><Key>中文</Key></Object></Delete>'.encode('UTF-8'))
+        self.assertEqual(self.convertor.trans_delete_objects_request(DeleteObjectsRequest()), b'<Delete />')
+
+    def test_quiet_response_keeps_only_errors(self):
+        body = self.convertor.parseDeleteObjectsQuiet('<DeleteResult></DeleteResult>')
+        self.assertEqual((body.deleted, body.error), ([], []))
+        body = self.convertor.parseDeleteObjectsQuiet(
+            '<DeleteResult><Error><Key>a.txt</Key><Code>AccessDenied</Code><Message>denied</Message></Error></DeleteResult>')
+        self.assertEqual([(e.key, e.code) for e in body.error], [('a.txt', 'AccessDenied')])
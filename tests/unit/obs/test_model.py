@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import calendar
+import time
+
+from obscmd.testutils import unittest
+from obs.model import CompactContent, DateTime
+
+
+class TestDateTime(unittest.TestCase):
+
+    def test_utc_to_epoch(self):
+        for value in ('2018-08-02T09:45:55.000Z', '1999-12-31T23:59:59.999Z', '2024-02-29T00:00:00.123Z'):
+            expected = calendar.timegm(time.strptime(value, '%Y-%m-%dT%H:%M:%S.%fZ'))
+            self.assertEqual(DateTime.UTCToEpoch(value), expected)
+        self.assertIsNone(DateTime.UTCToEpoch(None))
+
+    def test_epoch_to_local(self):
+        epoch = DateTime.UTCToEpoch('2018-08-02T09:45:55.000Z')
+        self.assertEqual(DateTime.EpochToLocal(epoch), time.strftime('%Y/%m/%d %H:%M:%S', time.localtime(epoch)))
+        self.assertIsNone(DateTime.EpochToLocal(None))
+
+
+class TestCompactContent(unittest.TestCase):
+
+    def test_last_modified_is_formatted_on_access(self):
+        item = CompactContent(key='a.txt', mtime=1533203155, size=15)
+        self.assertEqual(item['mtime'], 1533203155)
+        self.assertEqual(item['lastModified'], DateTime.EpochToLocal(1533203155))
+        self.assertEqual(item.get('size'), 15)
+        self.assertIsNone(item.get('unknown'))
+        self.assertRaises(KeyError, item.__getitem__, 'unknown')
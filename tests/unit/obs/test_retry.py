@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import io
+import multiprocessing
+import os
+import socket
+
+from obscmd.testutils import unittest, mock
+from obs import ObsClient, util
+from obs.model import GetResult
+from obs.retry import RetryPolicy, RetryBudget
+
+
+class TestRetryBudget(unittest.TestCase):
+
+    def test_budget_runs_out(self):
+        budget = RetryBudget(max_tokens=2)
+        self.assertTrue(budget.acquire())
+        self.assertTrue(budget.acquire())
+        self.assertFalse(budget.acquire())
+
+    def test_success_refills(self):
+        budget = RetryBudget(max_tokens=1, refill_ratio=0.5)
+        self.assertTrue(budget.acquire())
+        budget.deposit()
+        self.assertFalse(budget.acquire())
+        budget.deposit()
+        self.assertTrue(budget.acquire())
+
+    @unittest.skipIf(os.name == 'nt', 'workers are threads on windows')
+    def test_shared_budget_spans_processes(self):
+        budget = RetryBudget(max_tokens=2, shared=True)
+        worker = multiprocessing.Process(target=budget.acquire)
+        worker.start()
+        worker.join()
+        self.assertEqual(budget.remaining, 1)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_full_jitter_delay(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5)
+        for attempt in range(10):
+            delay = policy.get_delay(attempt)
+            self.assertTrue(0 <= delay <= min(5, 2 ** attempt))
+
+    def test_retryable_results(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable_result(GetResult(status=503, code='SlowDown')))
+        self.assertTrue(policy.is_retryable_result(GetResult(status=500)))
+        self.assertFalse(policy.is_retryable_result(GetResult(status=403, code='AccessDenied')))
+        self.assertFalse(policy.is_retryable_result(GetResult(status=200)))
+
+    def test_retryable_errors(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable_error(socket.timeout()))
+        self.assertTrue(policy.is_retryable_error(socket.error()))
+        self.assertFalse(policy.is_retryable_error(ValueError()))
+
+    def test_should_retry_honours_count_and_budget(self):
+        policy = RetryPolicy(max_retry_count=5, budget=RetryBudget(max_tokens=1))
+        self.assertTrue(policy.should_retry(0))
+        self.assertFalse(policy.should_retry(1))
+        self.assertFalse(RetryPolicy(max_retry_count=1).should_retry(1))
+
+
+class TestClientRetry(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_retry_count=2, base_delay=0)
+        self.client = ObsClient('ak', 'sk', server='obs.example.com', retry_policy=self.policy)
+
+    def test_retry_on_slow_down(self):
+        results = [GetResult(status=503, code='SlowDown'), GetResult(status=200)]
+        with mock.patch.object(self.client, '_make_request_once', side_effect=results) as once:
+            result = self.client._make_request('GET', 'bucket')
+        self.assertEqual(result.status, 200)
+        self.assertEqual(once.call_count, 2)
+
+    def test_give_up_after_max_retry_count(self):
+        results = [GetResult(status=500)] * 5
+        with mock.patch.object(self.client, '_make_request_once', side_effect=results) as once:
+            result = self.client._make_request('GET', 'bucket')
+        self.assertEqual(result.status, 500)
+        self.assertEqual(once.call_count, 3)
+
+    def test_connection_reset_is_retried(self):
+        results = [socket.error(104, 'Connection reset by peer'), GetResult(status=200)]
+        with mock.patch.object(self.client, '_make_request_once', side_effect=results) as once:
+            result = self.client._make_request('PUT', 'bucket', 'key', entity=b'body')
+        self.assertEqual(result.status, 200)
+        self.assertEqual(once.call_count, 2)
+
+    def test_stream_entity_is_not_resent(self):
+        entity = util.get_readable_entity(io.BytesIO(b'body'))
+        with mock.patch.object(self.client, '_make_request_once', side_effect=socket.timeout()) as once:
+            self.assertRaises(socket.timeout, self.client._make_request, 'PUT', 'bucket', 'key', entity=entity)
+        self.assertEqual(once.call_count, 1)
+        with mock.patch.object(self.client, '_make_request_once', side_effect=ValueError()) as once:
+            self.assertRaises(ValueError, self.client._make_request, 'PUT', 'bucket', 'key', entity=b'body')
+        self.assertEqual(once.call_count, 1)
+
+    def test_readable_entity_is_not_retried(self):
+        results = [GetResult(status=503, code='SlowDown')]
+        with mock.patch.object(self.client, '_make_request_once', side_effect=results) as once:
+            result = self.client._make_request('PUT', 'bucket', 'key', readable=True)
+        self.assertEqual(result.status, 503)
+        self.assertEqual(once.call_count, 1)
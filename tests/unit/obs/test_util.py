@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import io
+
+from obscmd.testutils import unittest
+from obs import util
+
+
+class FakeResponse(io.BytesIO):
+    """Stands in for an HTTPResponse: only read()/readinto() are used."""
+
+
+class NoReadintoResponse(object):
+
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+
+class TestReadResponse(unittest.TestCase):
+
+    def test_read_joins_chunks(self):
+        data = b'x' * 1000 + b'y' * 1000
+        self.assertEqual(util.read_response(FakeResponse(data), 64), data)
+
+    def test_read_empty_body(self):
+        self.assertIsNone(util.read_response(FakeResponse(b''), 64))
+
+    def test_read_into_buffer_with_length(self):
+        data = b'0123456789' * 100
+        buf = util.read_response_into_buffer(FakeResponse(data), len(data), 64)
+        self.assertIsInstance(buf, memoryview)
+        self.assertEqual(buf.tobytes(), data)
+
+    def test_read_into_buffer_without_readinto(self):
+        data = b'0123456789' * 100
+        buf = util.read_response_into_buffer(NoReadintoResponse(data), len(data), 64)
+        self.assertEqual(buf.tobytes(), data)
+
+    def test_read_into_buffer_short_body(self):
+        data = b'abc'
+        buf = util.read_response_into_buffer(FakeResponse(data), 10, 64)
+        self.assertEqual(buf.tobytes(), data)
+
+    def test_read_into_buffer_unknown_length(self):
+        data = b'abc' * 50
+        buf = util.read_response_into_buffer(FakeResponse(data), None, 16)
+        self.assertEqual(buf.tobytes(), data)
+
+
+class TestBandwidthDelayProduct(unittest.TestCase):
+
+    def test_bdp(self):
+        self.assertEqual(util.get_bdp(1250000000, 0.08), 100000000)
+        self.assertIsNone(util.get_bdp(None, 0.08))
+        self.assertIsNone(util.get_bdp(1250000000, None))
+
+    def test_chunk_size_follows_bdp(self):
+        self.assertEqual(util.get_chunk_size_by_bdp(None), 65536)
+        self.assertEqual(util.get_chunk_size_by_bdp(100000), 65536)
+        self.assertEqual(util.get_chunk_size_by_bdp(8 * 1024 * 1024), 1024 * 1024)
+        self.assertEqual(util.get_chunk_size_by_bdp(100000000), 4 * 1024 * 1024)
+
+
+class TestRequestFormat(unittest.TestCase):
+
+    def test_convert_path_string(self):
+        convert = util.RequestFormat.convert_path_string
+        self.assertEqual(convert({}), '')
+        self.assertEqual(convert({'acl': None}), '?acl')
+        self.assertEqual(convert({'uploadId': 'a b'}), '?uploadId=a%20b')
+        self.assertEqual(convert({'uploadId': 'u', 'acl': None}), '?acl&uploadId=u')
+        self.assertEqual(convert({'uploadId': 'u', 'foo': 'x'}, ['acl']), '')
+
+    def test_object_key_quoting_shared_with_url(self):
+        self.assertEqual(util.encode_object_key('dir/a b+c'), 'dir/a%20b%2Bc')
+        self.assertIn('dir/a b+c', util._ENCODED_OBJECT_KEYS)
+        self.assertEqual(util.PathFormat().get_url('bucket', 'dir/a b+c', None), '/bucket/dir/a%20b%2Bc')
+        self.assertEqual(util.SubdomainFormat().get_url('bucket', 'dir/a b+c', {'acl': None}), '/dir/a%20b%2Bc?acl')
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+import re
+
+from obscmd.testutils import unittest
+from obs import xmlbackend
+from obs.convertor import Adapter, Convertor, ListObjectsParser
+from tests.unit.obs import fixtures
+
+HEADERS = {'x-obs-bucket-location': 'region', 'x-obs-version-id': 'v1'}
+
+
+def parse_all(backend, signature):
+    previous = xmlbackend.get_backend()
+    xmlbackend.use_backend(backend)
+    try:
+        convertor = Convertor(signature, Adapter(signature))
+        results = []
+        for methodName, xml in fixtures.PARSE_METHODS:
+            parseMethod = getattr(convertor, 'parse' + methodName[:1].upper() + methodName[1:])
+            results.append(repr(parseMethod(re.sub('xmlns="http.*?"', '', xml), HEADERS)))
+        data = fixtures.LIST_OBJECTS.encode('UTF-8')
+        for compact in (False, True):
+            parser = ListObjectsParser(convertor, compact, compact)
+            for i in range(0, len(data), 64):
+                parser.feed(data[i:i + 64])
+            results.append(repr(parser.close(HEADERS)))
+        return results
+    finally:
+        xmlbackend.use_backend(previous)
+
+
+class TestXmlBackend(unittest.TestCase):
+
+    def test_stdlib_is_always_available(self):
+        self.assertIn(xmlbackend.STDLIB, xmlbackend.available_backends())
+        self.assertRaises(ValueError, xmlbackend.use_backend, 'unknown')
+
+    def test_python2_pull_parser_is_incremental(self):
+        parser = xmlbackend._PullParser(('start', 'end'))
+        parser.feed(b'<r><k>a</k><k>')
+        self.assertEqual([(event, elem.tag) for event, elem in parser.read_events()],
+                         [('start', 'r'), ('start', 'k'), ('end', 'k'), ('start', 'k')])
+        parser.feed(b'b</k></r>')
+        parser.close()
+        self.assertEqual([(event, elem.tag) for event, elem in parser.read_events()], [('end', 'k'), ('end', 'r')])
+
+    @unittest.skipIf(xmlbackend.LXML not in xmlbackend.available_backends(), 'lxml is not installed')
+    def test_backends_give_identical_results(self):
+        for signature in ('obs', 'v2'):
+            self.assertEqual(parse_all(xmlbackend.LXML, signature), parse_all(xmlbackend.STDLIB, signature))
+
+    @unittest.skipIf(xmlbackend.LXML not in xmlbackend.available_backends(), 'lxml is not installed')
+    def test_lxml_does_not_expand_entities(self):
+        previous = xmlbackend.get_backend()
+        xmlbackend.use_backend(xmlbackend.LXML)
+        try:
+            root = xmlbackend.fromstring('<!DOCTYPE r [<!ENTITY e SYSTEM "file:///etc/passwd">]><r><k>&e;</k></r>')
+            self.assertFalse(root.find('k').text)
+        finally:
+            xmlbackend.use_backend(previous)
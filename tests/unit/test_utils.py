@@ -6,7 +6,7 @@ from obscmd.exceptions import ParamValidationError
 from obscmd.testutils import unittest, skip_if_windows, mock, FileCreator
 from obscmd.utils import (DotDict, get_full_path, bytes_to_unitstr, unitstr_to_bytes,
                           hour_time_to_int, get_flowwidth_from_flowpolicy, get_dir_file_num, check_value_threshold,
-                          file2md5, calculate_etag, move_file)
+                          file2md5, calculate_etag, move_file, durationstr_to_seconds)
 
 KB = 1024 ** 1
 MB = 1024 ** 2
@@ -102,6 +102,16 @@ class TestUnitstrBytes(unittest.TestCase):
     def test_no_unit(self):
         self.assertEqual(unitstr_to_bytes('123133.3'), 123133)
 
+class TestDurationstrSeconds(unittest.TestCase):
+    def test_units(self):
+        self.assertEqual(durationstr_to_seconds('30d'), 30 * 86400)
+        self.assertEqual(durationstr_to_seconds('1.5h'), 5400)
+        self.assertEqual(durationstr_to_seconds('90M'), 5400)
+        self.assertEqual(durationstr_to_seconds('45'), 45)
+
+    def test_wrong_unit(self):
+        self.assertRaises(ParamValidationError, durationstr_to_seconds, '3y')
+
 class TestHourTimeToInt(unittest.TestCase):
     def test_0(self):
         self.assertEqual(hour_time_to_int('00:00'), 0)